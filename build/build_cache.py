@@ -0,0 +1,150 @@
+"""Content-hashed build cache shared by the build scripts.
+
+Each script owns a manifest in build/.cache/ that records, per output, the
+sha256 of every input file used to produce it plus the hash of the output
+itself. On the next run an output is rebuilt only if an input hash changed,
+the set of inputs changed, or the output was edited/deleted. Scripts may also
+stash extracted intermediate results (e.g. parsed config entries) per input
+file, so a partial rebuild only re-parses the files that changed.
+
+Recorded input lists include the build scripts themselves, so editing a
+script invalidates everything it produced.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = Path(__file__).parent / ".cache"
+MANIFEST_VERSION = 1
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path unless the file already holds identical bytes.
+
+    Returns:
+        True if the file was written
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR.resolve()).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+class BuildCache:
+    """Manifest of input hashes and cached results for one build script."""
+
+    def __init__(self, name: str, force: bool = False):
+        """
+        Args:
+            name: Manifest name, stored as build/.cache/<name>.json
+            force: Ignore any existing manifest (everything is stale)
+        """
+        self.path = CACHE_DIR / f"{name}.json"
+        self.force = force
+        self._hashes: Dict[Path, Optional[str]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if not force:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION:
+            entries = manifest.get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+
+    def save(self) -> None:
+        """Write the manifest if anything was recorded this run."""
+        if not self._dirty:
+            return
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        manifest = {"version": MANIFEST_VERSION, "entries": self._entries}
+        write_if_changed(self.path, json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+        self._dirty = False
+
+    def file_hash(self, path: Path) -> Optional[str]:
+        """sha256 of a file's bytes (memoized for this run). None if missing."""
+        path = Path(path)
+        if path not in self._hashes:
+            try:
+                self._hashes[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except FileNotFoundError:
+                self._hashes[path] = None
+        return self._hashes[path]
+
+    def _digest(self, inputs: Iterable[Path]) -> Dict[str, Optional[str]]:
+        return {_rel(p): self.file_hash(p) for p in inputs}
+
+    def recorded_inputs(self, key: str) -> Optional[list]:
+        """Input paths recorded for key on the last build, or None."""
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        return [BASE_DIR / rel for rel in entry["inputs"]]
+
+    def is_fresh(self, key: str, inputs: Iterable[Path], output: Optional[Path] = None) -> bool:
+        """True if key was built from exactly these inputs and output is untouched.
+
+        Args:
+            key: Cache entry name
+            inputs: Every file the result depends on
+            output: Generated file to verify, or None for data-only entries
+        """
+        entry = self._entries.get(key)
+        if self.force or not entry:
+            return False
+        if entry.get("inputs") != self._digest(inputs):
+            return False
+        if output is not None:
+            if entry.get("output") != _rel(output):
+                return False
+            if entry.get("output_hash") != self.file_hash(output):
+                return False
+        return True
+
+    def record(
+        self,
+        key: str,
+        inputs: Iterable[Path],
+        output: Optional[Path] = None,
+        data: Any = None,
+    ) -> None:
+        """Record a successful build of key. data must be JSON-serializable."""
+        entry: Dict[str, Any] = {"inputs": self._digest(inputs)}
+        if output is not None:
+            self._hashes.pop(output, None)
+            entry["output"] = _rel(output)
+            entry["output_hash"] = self.file_hash(output)
+        if data is not None:
+            entry["data"] = data
+        self._entries[key] = entry
+        self._dirty = True
+
+    def get_data(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        return entry.get("data") if entry else None
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Drop entries for keys no longer produced (e.g. deleted features)."""
+        keep = set(keep)
+        for key in [k for k in self._entries if k not in keep]:
+            del self._entries[key]
+            self._dirty = True
@@ -0,0 +1,266 @@
+"""Generate lua/core/message-patterns.lua from the mute-messages and fm-messages pattern lists.
+
+crawl checks every message against each message_colour (mute), force_more_message and
+flash_screen_message regex separately. Those lists hold ~150 BRC patterns, so this script
+groups them by channel and literal prefix. BRC.opt.combine_patterns() then joins each group
+into one "prefix(rest1|rest2|...)" regex at init, so crawl runs a handful of regexes per
+message instead of one per pattern. A group only matches a message if one of its patterns does.
+
+A pattern is kept on its own (not grouped) if combining it could change what it matches, or
+could break the whole group if crawl's regex engine rejects it: lookaround and other "(?"
+syntax, backreferences, lazy quantifiers, escapes like \d or \b that only PCRE builds know, or a
+"word:" prefix that isn't a known message channel. Groups hold at most MAX_GROUP_SIZE patterns,
+so one bad pattern can only take down a few mutes.
+
+Patterns that code in lua/ adds or removes by their exact string (string literals passed to
+BRC.opt.force_more_message(), flash_screen_message(), message_mute() or single_turn_mute()) are
+also kept alone: crawl can only remove an option entry by the string it was added with.
+
+Patterns in a config profile that aren't in the feature defaults have no group, and stay as is.
+
+Usage: python3 build/compile_message_filters.py [--force]
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from build_cache import BuildCache, write_if_changed
+
+base_dir = Path(__file__).parent.parent
+lua_dir = base_dir / "lua"
+features_dir = lua_dir / "features"
+output_file = base_dir / "lua" / "core" / "message-patterns.lua"
+SOURCES = {
+    # feature file -> Config table holding the pattern lists
+    features_dir / "mute-messages.lua": "messages",
+    features_dir / "fm-messages.lua": "messages",
+}
+
+HEADER = """\
+--- Message pattern groups for BRC.opt.combine_patterns(); keys are patterns, values are
+--- { group prefix, rest of pattern, group number }. Each group is joined into one regex.
+--- Auto-generated by build/compile_message_filters.py — do not edit manually.
+--- To regenerate: python3 build/compile_message_filters.py
+"""
+
+# crawl message channel names (channel_to_str in crawl's message.cc) allowed as "channel:" prefixes
+CHANNELS = {
+    "plain", "friend_action", "prompt", "god", "duration", "danger", "warning", "recovery",
+    "sound", "talk", "talk_visual", "intrinsic_gain", "mutation", "monster_spell",
+    "monster_enchant", "friend_spell", "friend_enchant", "monster_damage", "monster_target",
+    "banishment", "equipment", "floor", "multiturn", "examine", "examine_filter", "diagnostic",
+    "error", "tutorial", "orb", "timed_portal", "hell_effect", "monster_warning", "dgl_message",
+    "decor",
+}
+REGEX_META = set(".^$*+?()[]{}|\\")
+QUANTIFIERS = set("*+?{")
+MAX_GROUP_SIZE = 8
+# Lookaround, non-capturing/inline-flag groups, backreferences, PCRE-only escapes (\d, \b, ...)
+# and lazy quantifiers: keep these patterns alone
+UNSAFE_RE = re.compile(r"\(\?|\\[0-9A-Za-z]|[*+?}]\?")
+# A "word:" prefix crawl may read as a channel name
+CHANNEL_PREFIX_RE = re.compile(r"^([A-Za-z_ ]+):")
+LUA_TOKEN_RE = re.compile(r'--\[(=*)\[.*?\]\1\]|--[^\n]*|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|[{}]',
+                          re.DOTALL)
+LUA_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"', "'": "'"}
+# Option calls that add or remove a single message pattern
+TOGGLE_CALL_RE = re.compile(
+    r'BRC\.opt\.(?:force_more_message|flash_screen_message|message_mute|single_turn_mute)\(\s*'
+    r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')')
+
+
+class Group(NamedTuple):
+    head: str  # channel prefix + shared literal text
+    tail: str  # rest of the pattern
+    number: int  # patterns with the same number are joined
+
+
+# =============================================================================
+# Reading the config pattern lists
+# =============================================================================
+
+def _lua_string_value(token: str) -> str:
+    body = token[1:-1]
+    return re.sub(r"\\(.)", lambda m: LUA_ESCAPES.get(m.group(1), "\\" + m.group(1)), body)
+
+
+def read_patterns(file_path: Path, table_name: str) -> List[str]:
+    """All string literals inside `<table_name> = { ... }` in the feature's Config."""
+    text = file_path.read_text(encoding="utf-8")
+    m = re.search(rf"^\s*{table_name}\s*=\s*\{{", text, re.MULTILINE)
+    if not m:
+        sys.exit(f"ERROR: {table_name} table not found in {file_path.relative_to(base_dir)}")
+
+    patterns: List[str] = []
+    depth = 1
+    for token in LUA_TOKEN_RE.finditer(text, m.end()):
+        t = token.group(0)
+        if t == "{":
+            depth += 1
+        elif t == "}":
+            depth -= 1
+            if depth == 0:
+                return patterns
+        elif t[0] in "\"'":
+            patterns.append(_lua_string_value(t))
+    sys.exit(f"ERROR: unterminated {table_name} table in {file_path.relative_to(base_dir)}")
+
+
+def get_toggle_sources() -> List[Path]:
+    return sorted(p for p in lua_dir.rglob("*.lua") if p != output_file)
+
+
+def read_toggled_patterns(files: List[Path]) -> Set[str]:
+    """Patterns passed as string literals to the BRC.opt message option setters."""
+    toggled: Set[str] = set()
+    for file_path in files:
+        text = file_path.read_text(encoding="utf-8")
+        toggled.update(_lua_string_value(m.group(1)) for m in TOGGLE_CALL_RE.finditer(text))
+    return toggled
+
+
+# =============================================================================
+# Grouping
+# =============================================================================
+
+def split_channel(pattern: str) -> Optional[Tuple[str, str]]:
+    """(channel prefix incl. ':', regex) or None if the prefix is ambiguous."""
+    m = CHANNEL_PREFIX_RE.match(pattern)
+    if not m:
+        return "", pattern
+    if m.group(1) in CHANNELS:
+        return m.group(0), pattern[m.end():]
+    return None
+
+
+def has_top_level_alternation(regex: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+            if regex[i + 1:i + 2] == "]":
+                i += 1  # "[]...]": leading ] is literal
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def literal_prefix(regex: str) -> str:
+    """Leading text of regex that only matches itself."""
+    if has_top_level_alternation(regex):
+        return ""
+    end = 0
+    while end < len(regex) and regex[end] not in REGEX_META:
+        end += 1
+    if end < len(regex) and regex[end] in QUANTIFIERS:
+        end -= 1  # the quantifier applies to the last literal character
+    return regex[:max(end, 0)]
+
+
+def _common_prefix(strings: List[str]) -> str:
+    first, last = min(strings), max(strings)
+    n = 0
+    while n < len(first) and first[n] == last[n]:
+        n += 1
+    return first[:n]
+
+
+def group_patterns(patterns: List[str], toggled: Set[str] = frozenset()) -> Dict[str, Group]:
+    """Map each combinable pattern to its group. Patterns are grouped by channel and first word,
+    in groups of at most MAX_GROUP_SIZE. Patterns in `toggled` are left out."""
+    members: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = {}
+    for pattern in dict.fromkeys(patterns):
+        if pattern in toggled:
+            continue
+        split = split_channel(pattern)
+        if split is None or UNSAFE_RE.search(pattern) or pattern != pattern.strip():
+            continue
+        channel, regex = split
+        prefix = literal_prefix(regex)
+        first_word = re.match(r"\w*", prefix).group(0)
+        members.setdefault((channel, first_word), []).append((pattern, regex, prefix))
+
+    groups: Dict[str, Group] = {}
+    number = 0
+    for (channel, _), entries in members.items():
+        entries.sort()  # Neighbours share longer prefixes
+        for start in range(0, len(entries), MAX_GROUP_SIZE):
+            chunk = entries[start:start + MAX_GROUP_SIZE]
+            if len(chunk) < 2:
+                continue  # Nothing to combine with
+            number += 1
+            shared = _common_prefix([prefix for _, _, prefix in chunk])
+            for pattern, regex, _ in chunk:
+                tail = regex[len(shared):]
+                if has_top_level_alternation(tail):
+                    tail = f"({tail})"
+                groups[pattern] = Group(channel + shared, tail, number)
+    return groups
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def lua_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def format_groups(groups: Dict[str, Group]) -> str:
+    lines = [HEADER, "BRC.MESSAGE_PATTERN_GROUPS = {"]
+    for pattern, group in sorted(groups.items(), key=lambda kv: (kv[1].number, kv[0])):
+        lines.append(f"  [{lua_string(pattern)}] = {{ {lua_string(group.head)}, "
+                     f"{lua_string(group.tail)}, {group.number} }},")
+    lines.append("} -- BRC.MESSAGE_PATTERN_GROUPS (do not remove this comment)")
+    return "\n".join(lines) + "\n"
+
+
+def get_input_files() -> List[Path]:
+    scripts = [Path(__file__), Path(__file__).parent / "build_cache.py"]
+    return [*dict.fromkeys([*SOURCES, *get_toggle_sources()]), *scripts]
+
+
+def main(force: bool = False) -> int:
+    cache = BuildCache("compile_message_filters", force=force)
+    input_files = get_input_files()
+    if cache.is_fresh("message-patterns.lua", input_files, output_file):
+        print(f"{output_file.relative_to(base_dir)} is up to date")
+        return 0
+
+    patterns: List[str] = []
+    for file_path, table_name in SOURCES.items():
+        patterns.extend(read_patterns(file_path, table_name))
+    groups = group_patterns(patterns, read_toggled_patterns(get_toggle_sources()))
+
+    if write_if_changed(output_file, format_groups(groups)):
+        print(f"Generated {output_file.relative_to(base_dir)}")
+    else:
+        print(f"{output_file.relative_to(base_dir)} unchanged")
+    numbers = {g.number for g in groups.values()}
+    print(f"  {len(groups)} of {len(set(patterns))} patterns in {len(numbers)} groups")
+
+    cache.record("message-patterns.lua", input_files, output_file)
+    cache.save()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate lua/core/message-patterns.lua")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and rebuild")
+    sys.exit(main(force=parser.parse_args().force))
@@ -2,11 +2,21 @@
 
 This script processes init.txt and recursively includes referenced files,
 wrapping Lua files in braces and adding header/footer comments.
+
+With --release it also writes a smaller RC for one config profile (--profile):
+comments and indentation are stripped, features the profile leaves disabled and
+the other profiles are left out, and a .map.json sidecar maps each output line
+back to its source file (see map_rc_lines.py).
 """
 
+import argparse
+import io
 import logging
 from pathlib import Path
-from typing import Set, TextIO, Optional
+from typing import List, Set, TextIO, Optional
+
+from build_cache import BuildCache, write_if_changed
+import release_rc
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -18,6 +28,8 @@ BASE_DIR = Path(__file__).parent.parent
 INIT_FILE = BASE_DIR / "rc" / "init.txt"
 OUTPUT_DIR = BASE_DIR / "bin"
 OUTPUT_FILE = OUTPUT_DIR / "buehler.rc"
+RELEASE_DIR = OUTPUT_DIR / "release"
+DEFAULT_PROFILE = "custom"
 GITHUB_PREFIX = "https://github.com/brianfaires/crawl-rc/blob/main/"
 
 # Include patterns
@@ -69,7 +81,8 @@ def parse_include(line: str) -> Optional[Path]:
 def process_file(
     file_path: Path,
     outfile: TextIO,
-    processed_files: Set[Path]
+    processed_files: Set[Path],
+    missing_files: Set[Path]
 ) -> None:
     """Process a file, handling includes and writing content.
     
@@ -77,6 +90,7 @@ def process_file(
         file_path: Path to the file to process
         outfile: Output file handle
         processed_files: Set of already processed files to avoid cycles
+        missing_files: Collects included paths that don't exist (still build inputs)
     """
     if file_path in processed_files:
         logger.warning(f"Skipping already processed file: {file_path}")
@@ -98,8 +112,10 @@ def process_file(
                 include_path = parse_include(line)
                 if (include_path and include_path.exists() and
                         include_path not in processed_files):
-                    process_file(include_path, outfile, processed_files)
+                    process_file(include_path, outfile, processed_files, missing_files)
                 else:
+                    if include_path and not include_path.exists():
+                        missing_files.add(include_path)
                     print(line, end="", file=outfile)
             else:
                 print(line, end="", file=outfile)
@@ -113,22 +129,36 @@ def process_file(
 def process_line(
     line: str,
     outfile: TextIO,
-    processed_files: Set[Path]
+    processed_files: Set[Path],
+    missing_files: Set[Path]
 ) -> bool:
     include_path = parse_include(line)
     
     if include_path and include_path.exists():
-        process_file(include_path, outfile, processed_files)
+        process_file(include_path, outfile, processed_files, missing_files)
         return True
     else:
+        if include_path:
+            missing_files.add(include_path)
         print(line, end="", file=outfile)
         return False
 
 
+def _is_init_skip_line(line: str) -> bool:
+    """True for lines of the init.txt warning block (crawl commands, blank, or only {/})."""
+    stripped = line.strip()
+    return (
+        any(pattern in line for pattern in INIT_SKIP_PATTERNS) or
+        not stripped or
+        stripped in ("{", "}")
+    )
+
+
 def process_init_file(
     infile: TextIO,
     outfile: TextIO,
-    processed_files: Set[Path]
+    processed_files: Set[Path],
+    missing_files: Set[Path]
 ) -> None:
     """Process the init.txt file with special handling.
     
@@ -138,6 +168,7 @@ def process_init_file(
         infile: Input file handle for init.txt
         outfile: Output file handle
         processed_files: Set of already processed files
+        missing_files: Collects included paths that don't exist
     """
     # Read first N lines
     skip_lines = []
@@ -145,40 +176,186 @@ def process_init_file(
         line = infile.readline()
         skip_lines.append(line)
     
-    # Check if each line should be skipped (contains pattern, is empty, or only has {/})
-    def should_skip_line(line: str) -> bool:
-        stripped = line.strip()
-        return (
-            any(pattern in line for pattern in INIT_SKIP_PATTERNS) or
-            not stripped or
-            stripped in ("{", "}")
-        )
-    
     # Skip the entire block only if EVERY line should be skipped
-    should_skip = all(should_skip_line(line) for line in skip_lines)
+    should_skip = all(_is_init_skip_line(line) for line in skip_lines)
     
     # Process the lines only if we're not skipping
     if not should_skip:
         for line in skip_lines:
-            process_line(line, outfile, processed_files)
+            process_line(line, outfile, processed_files, missing_files)
     
     # Process remaining lines
     for line in infile:
-        process_line(line, outfile, processed_files)
+        process_line(line, outfile, processed_files, missing_files)
+
+
+def build_inputs(processed_files: Set[Path], missing_files: Set[Path]) -> list:
+    """All files the bundle depends on: init.txt, every include (present or not), and the build code."""
+    scripts = [Path(__file__), Path(__file__).parent / "build_cache.py"]
+    return [INIT_FILE, *scripts, *sorted(processed_files | missing_files)]
+
 
+def build_bundle(cache: BuildCache) -> None:
+    """Build bin/buehler.rc, unless nothing it was built from has changed."""
+    # Recorded inputs already cover include order (init.txt) and every included file
+    recorded = cache.recorded_inputs(OUTPUT_FILE.name)
+    if recorded and cache.is_fresh(OUTPUT_FILE.name, recorded, OUTPUT_FILE):
+        logger.info(f"{OUTPUT_FILE.name} is up to date.")
+        return
 
-def main() -> None:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     processed_files: Set[Path] = set()
+    missing_files: Set[Path] = set()
     
     logger.info("Building buehler.rc...")
     
+    outfile = io.StringIO()
     with open(INIT_FILE, 'r', encoding='utf-8') as infile:
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as outfile:
-            process_init_file(infile, outfile, processed_files)
+        process_init_file(infile, outfile, processed_files, missing_files)
     
-    logger.info(f"Done! Processed {len(processed_files)} files.")
+    if write_if_changed(OUTPUT_FILE, outfile.getvalue()):
+        logger.info(f"Done! Processed {len(processed_files)} files.")
+    else:
+        logger.info(f"Done! Processed {len(processed_files)} files ({OUTPUT_FILE.name} unchanged).")
+
+    cache.record(OUTPUT_FILE.name, build_inputs(processed_files, missing_files), OUTPUT_FILE)
+
+
+# =============================================================================
+# Release build
+# =============================================================================
+
+def collect_includes(file_path: Path, included: List[Path], missing_files: Set[Path]) -> None:
+    """Append every file reachable from file_path through includes, in build order."""
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        for line in infile:
+            include_path = parse_include(line)
+            if not include_path:
+                continue
+            if not include_path.exists():
+                missing_files.add(include_path)
+            elif include_path not in included:
+                included.append(include_path)
+                collect_includes(include_path, included, missing_files)
+
+
+def emit_release_file(
+    file_path: Path,
+    lines: List[str],
+    first_line: int,
+    output: release_rc.ReleaseOutput,
+    plan: release_rc.ReleasePlan,
+    processed_files: Set[Path]
+) -> None:
+    """Add one file to the release output, following includes like process_file().
+
+    Args:
+        file_path: File the lines come from
+        lines: Lines to emit (all of file_path, or init.txt after its warning block)
+        first_line: Source line number of lines[0]
+        output: Release lines and their source origins
+        plan: What to drop or rewrite for the chosen profile
+        processed_files: Set of already processed files to avoid cycles
+    """
+    processed_files.add(file_path)
+    drop_lines = plan.drop_lines.get(file_path, set())
+    numbered = [
+        (lineno, plan.replace_lines.get((file_path, lineno), line))
+        for lineno, line in enumerate(lines, first_line)
+        if lineno not in drop_lines
+    ]
+
+    if file_path.suffix == ".lua":
+        output.add_lua(file_path, numbered)
+        return
+
+    lua_block: Optional[List] = None
+    for lineno, line in numbered:
+        stripped = line.strip()
+        if lua_block is not None:
+            if stripped in release_rc.RC_BLOCK_CLOSE:
+                output.add_lua(file_path, lua_block)
+                lua_block = None
+            else:
+                lua_block.append((lineno, line))
+            continue
+        if stripped in release_rc.RC_BLOCK_OPEN:
+            lua_block = []
+            continue
+
+        include_path = parse_include(line)
+        if include_path in plan.drop_files:
+            continue
+        if include_path and include_path.exists() and include_path not in processed_files:
+            include_lines = include_path.read_text(encoding='utf-8').splitlines()
+            emit_release_file(include_path, include_lines, 1, output, plan, processed_files)
+            continue
+
+        text = release_rc.minify_rc_line(line)
+        if text is not None:
+            output.add(text, (file_path, lineno))
+
+
+def build_release(cache: BuildCache, profile_name: str) -> None:
+    """Build bin/release/buehler-<profile>.rc and its source map."""
+    profile = release_rc.CONFIG_DIR / f"{profile_name}.lua"
+    rc_path = RELEASE_DIR / f"buehler-{profile_name}.rc"
+    map_path = rc_path.with_name(rc_path.name + ".map.json")
+    key = f"release:{profile_name}"
+
+    recorded = cache.recorded_inputs(key)
+    if recorded and cache.is_fresh(key, recorded, rc_path) and map_path.exists():
+        logger.info(f"{get_relative_path(rc_path)} is up to date.")
+        return
+
+    included: List[Path] = []
+    missing_files: Set[Path] = set()
+    collect_includes(INIT_FILE, included, missing_files)
+    try:
+        plan = release_rc.plan_release(included, profile)
+    except ValueError as e:
+        raise SystemExit(f"ERROR: {e}")
+
+    logger.info(f"Building release RC for profile {profile_name} ({plan.config_name})...")
+    init_lines = INIT_FILE.read_text(encoding='utf-8').splitlines()
+    skip = INIT_SKIP_LINES if all(_is_init_skip_line(l) for l in init_lines[:INIT_SKIP_LINES]) else 0
+    output = release_rc.ReleaseOutput()
+    emit_release_file(INIT_FILE, init_lines[skip:], skip + 1, output, plan, set())
+
+    RELEASE_DIR.mkdir(parents=True, exist_ok=True)
+    release_text = output.text()
+    write_if_changed(rc_path, release_text)
+    write_if_changed(map_path, release_rc.source_map_json(rc_path, profile_name, output))
+
+    full_text = OUTPUT_FILE.read_text(encoding='utf-8')
+    logger.info(f"Wrote {get_relative_path(rc_path)} and {map_path.name}")
+    if plan.dropped_features:
+        logger.info(f"  Left out disabled features: {', '.join(plan.dropped_features)}")
+    dropped_configs = sorted(p.name for p in plan.drop_files if p.parent == release_rc.CONFIG_DIR)
+    logger.info(f"  Left out config files: {', '.join(dropped_configs) or 'none'}")
+    logger.info("  " + release_rc.format_reduction(
+        "Size (bytes)", len(full_text.encode('utf-8')), len(release_text.encode('utf-8'))))
+    logger.info("  " + release_rc.format_reduction(
+        "Lines", len(full_text.splitlines()), len(output.lines)))
+
+    inputs = build_inputs(set(included), missing_files) + [Path(release_rc.__file__)]
+    cache.record(key, inputs, rc_path)
+
+
+def main(force: bool = False, release: bool = False, profile: str = DEFAULT_PROFILE) -> None:
+    cache = BuildCache("concat_rc", force=force)
+    build_bundle(cache)
+    if release:
+        build_release(cache, profile)
+    cache.save()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and rebuild")
+    parser.add_argument("--release", action="store_true",
+                        help="Also build a minified RC for one config profile, with a source map")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help=f"lua/config/<profile>.lua to build the release for (default: {DEFAULT_PROFILE})")
+    args = parser.parse_args()
+    main(force=args.force, release=args.release, profile=args.profile)
@@ -4,11 +4,20 @@ Standalone Feature Generator for BRC
 Generates standalone feature files that can be copy-pasted into RC files
 without requiring the full BRC core. Features are always active and called
 directly from crawl's hooks.
+
+Usage: python3 build/create_standalone_features.py [--force]
 """
 
+import argparse
+import heapq
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Set, Dict, List, Tuple, Optional
+from typing import Set, Dict, FrozenSet, List, NamedTuple, Tuple, Optional
+
+from build_cache import BuildCache, write_if_changed
 
 # ============================================================================
 # Configuration
@@ -56,8 +65,7 @@ def _get_cached_lines(file_path: Path) -> List[str]:
 # ============================================================================
 
 def get_constant_names() -> List[str]:
-    content = _get_cached_text(BRC_CONSTANTS)
-    return [m for m in re.findall(r'BRC\.(\w+)\s*=', content) if m not in ['Config', 'Configs']]
+    return get_symbol_index().constant_names
 
 def get_default_config_boolean(pattern: str) -> str:
     content = _get_cached_text(BRC_HEADER)
@@ -120,11 +128,7 @@ def _find_function_by_pattern(lines: List[str], pattern: re.Pattern, start_idx:
     return None
 
 def extract_lua_function(module_name: str, function_name: str) -> Optional[str]:
-    lines = _get_cached_lines(BRC_MODULES[module_name])
-    module_var = module_name.split('.')[1]
-    pattern = re.compile(rf'^function\s+BRC\.{re.escape(module_var)}\.{re.escape(function_name)}\s*\(')
-    result = _find_function_by_pattern(lines, pattern)
-    return '\n'.join(_extract_function_block(lines, result[0])) if result else None
+    return get_symbol_index().functions.get((module_name, function_name))
 
 def extract_local_functions(file_path: Path) -> Dict[str, str]:
     lines = _get_cached_lines(file_path)
@@ -183,27 +187,63 @@ def get_txt_contains_code() -> str:
         'getmetatable("").__index.contains = BRC_txt_str_contains',
     ])
 
-def get_minimal_persist_code() -> str:
-    return "\n".join([
-        'local function brc_tostr(value)',
-        '  if type(value) == "table" then',
-        '    if #value == 0 then',
-        '      local result = "{ "',
-        '      for k, v in pairs(value) do',
-        '        result = result .. k .. " = " .. brc_tostr(v) .. ", "',
-        '      end',
-        '      return result .. " }"',
-        '    else',
-        '      return "{ " .. table.concat(value, ", ") .. " }"',
-        '    end',
-        '  elseif type(value) == "string" then',
-        '    return "\\"" .. value:gsub("\\"", "") .. "\\""',
-        '  else',
-        '    return tostring(value)',
-        '  end',
-        'end',
-        '',
-        'function BRC.Data.persist(name, default_value)',
+BRC_DATA = core_dir / "data.lua"
+# Calls only, not the definitions in the persist code itself
+_PERSIST_CALL_RE = re.compile(r'(?<!function )\bBRC\.Data\.persist\s*\(')
+_TOUCH_CALL_RE = re.compile(r'(?<!function )\bBRC\.Data\.touch\s*\(')
+
+def _extract_data_lua_block(start_pattern: str) -> str:
+    """Lines of lua/core/data.lua from the one matching start_pattern to the next "end"."""
+    lines = _get_cached_lines(BRC_DATA)
+    match = _find_function_by_pattern(lines, re.compile(start_pattern))
+    if not match:
+        raise ValueError(f"{start_pattern!r} not found in {BRC_DATA}")
+    end = lines.index("end", match[0])
+    return '\n'.join(lines[match[0]:end + 1])
+
+def _count_call_args(code: str, open_paren: int) -> int:
+    """Number of top-level arguments of the call whose '(' is at code[open_paren]."""
+    depth = 0
+    args = 0
+    i = open_paren
+    while i < len(code):
+        c = code[i]
+        if c in "\"'":
+            end = code.find(c, i + 1)
+            while end != -1 and code[end - 1] == "\\":
+                end = code.find(c, end + 1)
+            i = len(code) if end == -1 else end
+        elif c in "([{":
+            depth += 1
+            if depth == 1 and args == 0:
+                args = 1 if code[i + 1:].lstrip()[:1] != ")" else 0
+        elif c in ")]}":
+            depth -= 1
+            if depth == 0:
+                return args
+        elif c == "," and depth == 1:
+            args += 1
+        i += 1
+    return args
+
+def uses_persist_limits(code: str) -> bool:
+    """True if code calls BRC.Data.touch() or passes max_entries to BRC.Data.persist()."""
+    if _TOUCH_CALL_RE.search(code):
+        return True
+    return any(_count_call_args(code, m.end() - 1) >= 3 for m in _PERSIST_CALL_RE.finditer(code))
+
+def get_minimal_persist_code(with_limits: bool = False) -> str:
+    """BRC.Data.persist() for standalone features: the encoder from lua/core/data.lua, without
+    backups. with_limits adds max_entries support and BRC.Data.touch()."""
+    local_funcs = extract_local_functions(BRC_DATA)
+    parts = [_extract_data_lua_block(r'^local LUA_KEYWORDS\b'), local_funcs["encode"]]
+    if with_limits:
+        parts.extend(["local _max_entries = {}", local_funcs["apply_limit"],
+                      local_funcs["apply_limits"]])
+
+    params = "name, default_value, max_entries" if with_limits else "name, default_value"
+    persist = [
+        f'function BRC.Data.persist({params})',
         '  if _G[name] == nil then',
         '    if type(default_value) == "table" then',
         '      _G[name] = util.copy_table(default_value)',
@@ -211,13 +251,171 @@ def get_minimal_persist_code() -> str:
         '      _G[name] = default_value',
         '    end',
         '  end',
+    ]
+    if with_limits:
+        persist.append('  if max_entries then _max_entries[name] = max_entries end')
+    persist.extend([
         '  table.insert(chk_lua_save, function()',
         '    if _G[name] == nil then return "" end',
-        '    return name .. " = " .. brc_tostr(_G[name]) .. "\\n"',
+        '    local buf = { name, " = " }',
+        '    encode(_G[name], buf)',
+        '    buf[#buf + 1] = "\\n"',
+        '    return table.concat(buf)',
         '  end)',
         '  return _G[name]',
         'end',
     ])
+    parts.append('\n'.join(persist))
+
+    if with_limits:
+        parts.extend([
+            _extract_data_lua_block(r'^function BRC\.Data\.touch\('),
+            '\n'.join([
+                '-- Trim variables before any of them are saved',
+                'table.insert(chk_lua_save, function()',
+                '  apply_limits()',
+                '  return ""',
+                'end)',
+                'brc_persist_ages = BRC.Data.persist("brc_persist_ages", {})',
+            ]),
+        ])
+    return '\n\n'.join(parts)
+
+# ============================================================================
+# Symbol Index
+# ============================================================================
+
+# One pass over a code fragment finds every BRC.<name>[.<attr>], hook definition and call site
+_BRC_REF_RE = re.compile(r'\bBRC\.(\w+)(?:\.(\w+))?')
+_HOOK_DEF_RE = re.compile(r'function\s+\w+\.(\w+)\s*\(')
+_CALL_RE = re.compile(r'\b(\w+)\s*\(')
+_CONFIG_RE = re.compile(r'\.Config\b')
+
+# Modules whose top-level code and local functions are never copied into standalone files
+NO_INLINE_MODULES = ("BRC.Data", "BRC.Hotkey", "BRC.Configs")
+
+class FragmentRefs(NamedTuple):
+    """Everything a single code fragment references."""
+    modules: FrozenSet[str]
+    functions: FrozenSet[Tuple[str, str]]
+    constants: FrozenSet[str]
+    hooks: FrozenSet[str]
+    defines_init: bool
+    uses_persist: bool
+    uses_config: bool
+    calls: FrozenSet[str]
+
+class LuaSymbolIndex:
+    """Definitions and call graph for lua/core and lua/util, built once and shared by every feature.
+
+    Module functions, local functions and top-level init code are extracted in a single pass
+    per file. Fragment references are memoized by code text, so a utility function shared by
+    many features is only scanned once.
+    """
+
+    def __init__(self):
+        constants_text = _get_cached_text(BRC_CONSTANTS)
+        self.constant_names = [m for m in re.findall(r'BRC\.(\w+)\s*=', constants_text)
+                               if m not in ['Config', 'Configs']]
+        self._constant_set = set(self.constant_names)
+        self._module_by_var = {module.split('.')[1]: module for module in BRC_MODULES}
+        self.functions: Dict[Tuple[str, str], str] = {}
+        self.local_functions: Dict[str, Dict[str, str]] = {}
+        self.local_calls: Dict[str, Dict[str, Set[str]]] = {}
+        self.top_level: Dict[str, str] = {}
+        self._refs: Dict[str, FragmentRefs] = {}
+        for module, file_path in BRC_MODULES.items():
+            self._index_module(module, file_path)
+
+    def _index_module(self, module: str, file_path: Path):
+        lines = _get_cached_lines(file_path)
+        pattern = re.compile(rf'^function\s+BRC\.{re.escape(module.split(".")[1])}\.(\w+)\s*\(')
+        for i, line in enumerate(lines):
+            match = pattern.match(line.strip())
+            if match and (module, match.group(1)) not in self.functions:
+                self.functions[(module, match.group(1))] = '\n'.join(_extract_function_block(lines, i))
+
+        local_funcs = extract_local_functions(file_path)
+        self.local_functions[module] = local_funcs
+        self.local_calls[module] = {
+            name: {callee for callee in self.references(code).calls if callee in local_funcs and callee != name}
+            for name, code in local_funcs.items()
+        }
+        self.top_level[module] = extract_top_level(file_path)
+
+    def references(self, code: str) -> FragmentRefs:
+        refs = self._refs.get(code)
+        if refs is not None:
+            return refs
+
+        modules: Set[str] = set()
+        functions: Set[Tuple[str, str]] = set()
+        constants: Set[str] = set()
+        uses_persist = False
+        for match in _BRC_REF_RE.finditer(code):
+            name, attr = match.groups()
+            module = self._module_by_var.get(name)
+            if module:
+                modules.add(module)
+                if attr:
+                    functions.add((module, attr))
+                    uses_persist = uses_persist or (module == "BRC.Data" and attr == "persist")
+            if name in self._constant_set:
+                constants.add(name)
+
+        hook_names = {m.group(1) for m in _HOOK_DEF_RE.finditer(code)}
+        refs = FragmentRefs(
+            modules=frozenset(modules),
+            functions=frozenset(functions),
+            constants=frozenset(constants),
+            hooks=frozenset(hook_names.intersection(CRAWL_HOOKS)),
+            defines_init="init" in hook_names,
+            uses_persist=uses_persist,
+            uses_config=_CONFIG_RE.search(code) is not None,
+            calls=frozenset(m.group(1) for m in _CALL_RE.finditer(code)),
+        )
+        self._refs[code] = refs
+        return refs
+
+    def order_local_functions(self, module: str, names: Set[str]) -> List[str]:
+        """Topologically sort local functions so each is defined before its callers."""
+        calls = self.local_calls[module]
+        dependents: Dict[str, Set[str]] = {name: set() for name in names}
+        in_degree: Dict[str, int] = {name: 0 for name in names}
+        for name in names:
+            for callee in calls[name]:
+                if callee in names:
+                    dependents[callee].add(name)
+                    in_degree[name] += 1
+
+        # Lowest name first among functions with no unmet dependencies, for deterministic output
+        queue = [name for name, degree in in_degree.items() if degree == 0]
+        heapq.heapify(queue)
+        result = []
+        while queue:
+            name = heapq.heappop(queue)
+            result.append(name)
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    heapq.heappush(queue, dependent)
+
+        # A cycle shouldn't happen in valid code, but include remaining functions anyway
+        result.extend(sorted(set(names) - set(result)))
+        return result
+
+_symbol_index: Optional[LuaSymbolIndex] = None
+
+def get_symbol_index() -> LuaSymbolIndex:
+    global _symbol_index
+    if _symbol_index is None:
+        _symbol_index = LuaSymbolIndex()
+    return _symbol_index
+
+def _init_worker(index: LuaSymbolIndex):
+    """Process pool initializer: reuse the parent's index instead of rebuilding it."""
+    global _symbol_index
+    _symbol_index = index
 
 # ============================================================================
 # Dependency Analysis
@@ -226,35 +424,35 @@ def get_minimal_persist_code() -> str:
 class DependencyAnalyzer:
     """Analyzes feature files to recursively find all BRC dependencies."""
     
-    def __init__(self, feature_file: Path, content: Optional[str] = None):
+    def __init__(self, feature_file: Path, content: Optional[str] = None,
+                 source_files: Optional[List[Path]] = None):
         self.feature_file = feature_file
+        self.source_files = source_files if source_files is not None else [feature_file]
         self.content = content if content is not None else feature_file.read_text(encoding='utf-8')
+        self.index = get_symbol_index()
         self.used_modules: Set[str] = set()
         self.used_functions: Dict[str, Set[str]] = {}
         self.used_constants: Set[str] = set()
         self.used_hooks: Set[str] = set()
         self.uses_persist = False
+        self.uses_persist_limits = False  # max_entries / BRC.Data.touch(); see uses_persist_limits()
         self.uses_config = False
         self.extracted_functions: Dict[Tuple[str, str], str] = {}
         self.init_code_blocks: Dict[str, List[str]] = {}
         self.local_functions: Dict[str, Dict[str, str]] = {}
     
     def analyze(self):
-        """Perform complete dependency analysis."""
-        self._find_brc_references(self.content)
-        
-        changed = True
-        while changed:
-            changed = self._extract_dependencies_recursively()
-            prev_modules = len(self.used_modules)
-            self._extract_top_level()
-            if len(self.used_modules) > prev_modules:
-                changed = True
-
-            prev_local_funcs = sum(len(funcs) for funcs in self.local_functions.values())
-            self._extract_local_functions()
-            if sum(len(funcs) for funcs in self.local_functions.values()) > prev_local_funcs:
-                changed = True
+        """Perform complete dependency analysis, as a traversal of the symbol index."""
+        if self.index.references(self.content).defines_init:
+            self.used_hooks.add("init")
+
+        pending = [self.content]
+        while pending:
+            self._add_references(pending.pop(), pending)
+
+        for module, funcs in self.local_functions.items():
+            ordered = self.index.order_local_functions(module, set(funcs))
+            self.local_functions[module] = {name: funcs[name] for name in ordered}
 
     def get_all_code(self) -> str:
         """Get all code from the feature file and its dependencies."""
@@ -264,160 +462,62 @@ class DependencyAnalyzer:
             [local_func_code for module_local_funcs in self.local_functions.values()
                 for local_func_code in module_local_funcs.values()])
 
-    def _extract_dependencies_recursively(self) -> bool:
-        """Extract dependencies from all current code. Returns True if new dependencies were found."""
-        changed = False
-        new_functions = {}
+    def _add_references(self, code: str, pending: List[str]):
+        """Record everything code references; queue newly reached code for scanning."""
+        refs = self.index.references(code)
+        for module in refs.modules:
+            self._use_module(module, pending)
 
-        sources = [code for code in self.extracted_functions.values() if code is not None]
-        sources.extend([block for blocks in self.init_code_blocks.values() for block in blocks])
-        sources.extend([func_code for module_funcs in self.local_functions.values() 
-                        for func_code in module_funcs.values()])
-        
-        if self.uses_persist:
-            sources.append(get_minimal_persist_code())
-        
-        for code in sources:
-            if code is None:
+        for module, func_name in refs.functions:
+            names = self.used_functions.setdefault(module, set())
+            if func_name in names:
                 continue
-            new_refs = self._find_brc_references(code)
-            for mod, funcs in new_refs.items():
-                for func in funcs:
-                    if (mod, func) not in self.extracted_functions:
-                        changed = True
-                        if func_code := extract_lua_function(mod, func):
-                            new_functions[(mod, func)] = func_code
-                            self._find_brc_references(func_code)
-        
-        self.extracted_functions.update(new_functions)
-        return changed
-    
-    def _find_brc_references(self, content: str) -> Dict[str, Set[str]]:
-        """Find all BRC references in content. Returns dict of module -> set of NEW function names."""
-        new_refs: Dict[str, Set[str]] = {}
-        
-        # Find module function references
-        for module in BRC_MODULES.keys():
-            if re.search(rf'\b{re.escape(module)}\b', content):
-                self.used_modules.add(module)
-                matches = re.findall(rf'\b{re.escape(module)}\.(\w+)', content)
-                if matches:
-                    self.used_functions.setdefault(module, set())
-                    for match in matches:
-                        if match not in self.used_functions[module]:
-                            self.used_functions[module].add(match)
-                            new_refs.setdefault(module, set()).add(match)
-                            if (module, match) not in self.extracted_functions:
-                                if module == "BRC.Data" and match == "persist":
-                                    func_code = get_minimal_persist_code()
-                                else:
-                                    func_code = extract_lua_function(module, match)
-                                if func_code:
-                                    self.extracted_functions[(module, match)] = func_code
-                                    self._find_brc_references(func_code)
-        
-        # Find constants
-        for const in get_constant_names():
-            if re.search(rf'\bBRC\.{const}\b', content):
-                self.used_constants.add(const)
-        
-        # Find special cases
-        if re.search(r'\bBRC\.Data\.persist\b', content):
+            names.add(func_name)
+            if module == "BRC.Data" and func_name == "persist":
+                func_code = get_minimal_persist_code()
+            else:
+                func_code = self.index.functions.get((module, func_name))
+            if func_code:
+                self.extracted_functions[(module, func_name)] = func_code
+                pending.append(func_code)
+                self._add_local_functions(module, func_code, pending)
+
+        self.used_constants.update(refs.constants)
+        self.used_hooks.update(refs.hooks)
+        if refs.uses_persist:
             self.uses_persist = True
-            self.used_modules.add("BRC.Data")
-        if re.search(r'\.Config\b', content):
+            self._use_module("BRC.Data", pending)
+        if "BRC.Data" in refs.modules and not self.uses_persist_limits and uses_persist_limits(code):
+            self.uses_persist_limits = True
+            pending.append(get_minimal_persist_code(with_limits=True))
+        if refs.uses_config:
             self.uses_config = True
-        
-        # Find hooks
-        for hook_name in CRAWL_HOOKS:
-            if re.search(rf'function\s+\w+\.{hook_name}\s*\(', content):
-                self.used_hooks.add(hook_name)
-        if content is self.content and re.search(r'function\s+\w+\.init\s*\(', content):
-            self.used_hooks.add("init")
-        
-        return new_refs
-    
-    def _extract_top_level(self):
-        for module in list(self.used_modules):
-            if module in ["BRC.Data", "BRC.Hotkey", "BRC.Configs"]:
-                continue
-            init_code = extract_top_level(BRC_MODULES[module])
-            if init_code:
-                self.init_code_blocks[module] = [init_code]
-                self._find_brc_references(init_code)
-    
-    def _extract_local_functions(self):
-        for module in list(self.used_modules):
-            if module in ["BRC.Data", "BRC.Hotkey", "BRC.Configs"]:
-                continue
-            
-            all_local_funcs = extract_local_functions(BRC_MODULES[module])
-            if not all_local_funcs:
+
+    def _use_module(self, module: str, pending: List[str]):
+        if module in self.used_modules:
+            return
+        self.used_modules.add(module)
+        if module in NO_INLINE_MODULES:
+            return
+        init_code = self.index.top_level[module]
+        if init_code:
+            self.init_code_blocks[module] = [init_code]
+            pending.append(init_code)
+
+    def _add_local_functions(self, module: str, func_code: str, pending: List[str]):
+        """Pull in the module's local functions reachable from func_code."""
+        if module in NO_INLINE_MODULES:
+            return
+        all_local_funcs = self.index.local_functions[module]
+        stack = [name for name in self.index.references(func_code).calls if name in all_local_funcs]
+        while stack:
+            name = stack.pop()
+            module_funcs = self.local_functions.setdefault(module, {})
+            if name in module_funcs:
                 continue
-            
-            # Start with local functions called by extracted module functions
-            called_local_funcs = set()
-            for (mod, func_name), func_code in self.extracted_functions.items():
-                if mod == module:
-                    for local_func_name in all_local_funcs.keys():
-                        if re.search(rf'\b{re.escape(local_func_name)}\s*\(', func_code):
-                            called_local_funcs.add(local_func_name)
-            
-            # Recursively find local functions called by other local functions
-            changed = True
-            while changed:
-                changed = False
-                for local_func_name in list(called_local_funcs):
-                    local_func_code = all_local_funcs[local_func_name]
-                    for other_local_func_name in all_local_funcs.keys():
-                        if other_local_func_name not in called_local_funcs:
-                            if re.search(rf'\b{re.escape(other_local_func_name)}\s*\(', local_func_code):
-                                called_local_funcs.add(other_local_func_name)
-                                changed = True
-            
-            if called_local_funcs:
-                local_funcs_dict = {name: all_local_funcs[name] for name in called_local_funcs}
-                ordered_funcs = self._topological_sort_local_functions(local_funcs_dict, all_local_funcs)
-                self.local_functions[module] = {name: local_funcs_dict[name] for name in ordered_funcs}
-                for local_func_code in local_funcs_dict.values():
-                    self._find_brc_references(local_func_code)
-    
-    def _topological_sort_local_functions(
-        self, local_funcs: Dict[str, str], all_local_funcs: Dict[str, str]
-    ) -> List[str]:
-        dependents: Dict[str, Set[str]] = {name: set() for name in local_funcs.keys()}
-        in_degree: Dict[str, int] = {name: 0 for name in local_funcs.keys()}
-        
-        for func_name, func_code in local_funcs.items():
-            for other_func_name in all_local_funcs.keys():
-                if other_func_name != func_name and other_func_name in local_funcs:
-                    if re.search(rf'\b{re.escape(other_func_name)}\s*\(', func_code):
-                        dependents[other_func_name].add(func_name)
-                        # Calculate in-degree: how many dependencies each function has
-                        in_degree[func_name] += 1
-        
-        # Start with functions that have no dependencies (in-degree 0)
-        queue = [name for name, degree in in_degree.items() if degree == 0]
-        result = []
-        while queue:
-            # Sort queue for deterministic output
-            queue.sort()
-            func_name = queue.pop(0)
-            result.append(func_name)
-            
-            # Decrease in-degree for functions that depend on this one
-            for dependent in dependents[func_name]:
-                in_degree[dependent] -= 1
-                if in_degree[dependent] == 0:
-                    queue.append(dependent)
-        
-        # If we didn't process all functions, there's a cycle (shouldn't happen in valid code)
-        # But include remaining functions anyway
-        remaining = set(local_funcs.keys()) - set(result)
-        if remaining:
-            result.extend(sorted(remaining))
-        
-        return result
+            module_funcs[name] = all_local_funcs[name]
+            pending.append(all_local_funcs[name])
+            stack.extend(self.index.local_calls[module][name])
     
 # ============================================================================
 # Code Generation
@@ -629,7 +729,8 @@ class StandaloneGenerator:
         return '\n'.join(result)
     
     def _generate_minimal_persist(self) -> str:
-        return "-- Minimal persistence system for standalone features\n" + get_minimal_persist_code()
+        return ("-- Minimal persistence system for standalone features\n"
+                + get_minimal_persist_code(self.analyzer.uses_persist_limits))
     
     def _generate_config_section(self) -> str:
         config_content = self._extract_config_section()
@@ -724,58 +825,140 @@ class StandaloneGenerator:
     def _generate_init_call(self) -> str:
         return f"-- Initialize feature\nif {self.feature_var}.init then {self.feature_var}.init() end"
 
-def process_feature(analyzer: DependencyAnalyzer, output_name: str, display_name: Optional[str] = None, f_var_name: Optional[str] = None):
-    """Process a feature analyzer and generate the standalone output file."""
-    if display_name is None:
-        display_name = output_name
-    
-    print(f"Analyzing feature: {display_name}")
+    def input_files(self) -> List[Path]:
+        """Every file the generated output depends on, for the build cache."""
+        scripts = [Path(__file__), Path(__file__).parent / "build_cache.py"]
+        modules = [BRC_MODULES[m] for m in sorted(self.analyzer.used_modules) if m in BRC_MODULES]
+        if self.feature_var == "f_pickup_alert":
+            modules.append(BRC_MODULES["BRC.Configs"])
+        return [*self.analyzer.source_files, BRC_CONSTANTS, BRC_HEADER, *scripts, *modules]
+
+class FeatureJob(NamedTuple):
+    output_name: str
+    feature_file: Path
+    content: Optional[str] = None
+    source_files: Optional[List[Path]] = None
+    display_name: Optional[str] = None
+    f_var_name: Optional[str] = None
+
+class FeatureResult(NamedTuple):
+    output_name: str
+    content: str
+    input_files: List[Path]
+    log: List[str]
+    seconds: float
+
+def build_feature(job: FeatureJob) -> FeatureResult:
+    """Analyze a feature and render its standalone file. Runs in a worker process."""
+    start = time.perf_counter()
+    analyzer = DependencyAnalyzer(job.feature_file, job.content, job.source_files)
     analyzer.analyze()
-    
-    print(f"  Dependencies found:")
-    print(f"    Modules: {sorted(analyzer.used_modules)}")
-    print(f"    Hooks: {sorted(analyzer.used_hooks)}")
-    print(f"    Constants: {sorted(analyzer.used_constants)}")
-    
-    generator = StandaloneGenerator(analyzer, f_var_name)
+    generator = StandaloneGenerator(analyzer, job.f_var_name)
     standalone_content = generator.generate() + "\n}\n"
 
-    output_file = output_dir / f"{output_name}.rc"
-    output_file.write_text(standalone_content, encoding='utf-8')
-    
-    print(f"\nGenerated: {output_file}")
-    print(f"  Size: {len(standalone_content)} characters, {len(standalone_content.splitlines())} lines")
+    log = [
+        f"Analyzing feature: {job.display_name or job.output_name}",
+        f"  Dependencies found:",
+        f"    Modules: {sorted(analyzer.used_modules)}",
+        f"    Hooks: {sorted(analyzer.used_hooks)}",
+        f"    Constants: {sorted(analyzer.used_constants)}",
+    ]
+    return FeatureResult(job.output_name, standalone_content, generator.input_files(), log,
+                         time.perf_counter() - start)
+
+def build_features(jobs: List[FeatureJob], num_jobs: int) -> List[FeatureResult]:
+    """Build all jobs, in a process pool when there's more than one. Results keep job order."""
+    index = get_symbol_index()
+    num_jobs = min(num_jobs, len(jobs))
+    if num_jobs <= 1:
+        return [build_feature(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=num_jobs, initializer=_init_worker, initargs=(index,)) as pool:
+        return list(pool.map(build_feature, jobs))
+
+def write_feature(result: FeatureResult, cache: BuildCache):
+    """Write a built feature (if its bytes changed) and record it in the build cache."""
+    output_file = output_dir / f"{result.output_name}.rc"
+    written = write_if_changed(output_file, result.content)
+    cache.record(result.output_name, result.input_files, output_file)
+
+    print("\n".join(result.log))
+    print(f"\n{'Generated' if written else 'Unchanged'}: {output_file}")
+    print(f"  Size: {len(result.content)} characters, {len(result.content.splitlines())} lines")
     print()
 
-def main():
+def print_timing_report(timings: Dict[str, float], results: List[FeatureResult], num_jobs: int):
+    feature_total = sum(r.seconds for r in results)
+    print("Timing report:")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<24} {seconds * 1000:8.1f} ms")
+    if results:
+        print(f"  {'sum of feature builds':<24} {feature_total * 1000:8.1f} ms "
+              f"({len(results)} features, {num_jobs} jobs, {feature_total / timings['generate']:.1f}x parallel)")
+        for r in sorted(results, key=lambda r: r.seconds, reverse=True)[:5]:
+            print(f"    {r.output_name:<22} {r.seconds * 1000:8.1f} ms")
+
+def is_up_to_date(cache: BuildCache, output_name: str, source_files: List[Path]) -> bool:
+    """True if output_name was last built from these sources and no recorded input changed."""
+    recorded = cache.recorded_inputs(output_name)
+    if not recorded or any(f not in recorded for f in source_files):
+        return False
+    if not cache.is_fresh(output_name, recorded, output_dir / f"{output_name}.rc"):
+        return False
+    print(f"Up to date: {output_name}")
+    return True
+
+def main(force: bool = False, num_jobs: int = 1, timing: bool = False):
+    start = time.perf_counter()
+    timings: Dict[str, float] = {}
     output_dir.mkdir(parents=True, exist_ok=True)
+    cache = BuildCache("create_standalone_features", force=force)
     generated_names: set = set()
+    jobs: List[FeatureJob] = []
 
-    for feature_path in features_dir.glob("*.lua"):
+    for feature_path in sorted(features_dir.glob("*.lua")):
         if "_template" in feature_path.name:
             continue
-        analyzer = DependencyAnalyzer(feature_path)
         name = feature_path.stem.replace('_', '-')
-        process_feature(analyzer, name)
         generated_names.add(name)
+        if not is_up_to_date(cache, name, [feature_path]):
+            jobs.append(FeatureJob(name, feature_path))
     
     pickup_alert_dir = features_dir / "pickup-alert"
     pickup_alert_files = ["pa-config.lua", "pa-main.lua", "pa-data.lua", "pa-armour.lua", "pa-misc.lua", "pa-weapons.lua"]
+    pickup_alert_paths = [pickup_alert_dir / filename for filename in pickup_alert_files]
     
-    concatenated_content = []
-    for filename in pickup_alert_files:
-        file_path = pickup_alert_dir / filename
-        if file_path.exists():
-            concatenated_content.append(file_path.read_text(encoding='utf-8'))
-        else:
-            print(f"  Warning: {file_path} not found, skipping")
-    
-    if concatenated_content:
-        concatenated_text = '\n'.join(concatenated_content)
-        dummy_path = features_dir / "pickup-alert" / "pa-main.lua"
-        analyzer = DependencyAnalyzer(dummy_path, content=concatenated_text)
-        process_feature(analyzer, "pickup-alert", "pickup-alert (concatenated)", "f_pickup_alert")
+    if is_up_to_date(cache, "pickup-alert", pickup_alert_paths):
         generated_names.add("pickup-alert")
+    else:
+        concatenated_content = []
+        for file_path in pickup_alert_paths:
+            if file_path.exists():
+                concatenated_content.append(file_path.read_text(encoding='utf-8'))
+            else:
+                print(f"  Warning: {file_path} not found, skipping")
+        
+        if concatenated_content:
+            concatenated_text = '\n'.join(concatenated_content)
+            dummy_path = features_dir / "pickup-alert" / "pa-main.lua"
+            jobs.append(FeatureJob("pickup-alert", dummy_path, concatenated_text, pickup_alert_paths,
+                                   "pickup-alert (concatenated)", "f_pickup_alert"))
+            generated_names.add("pickup-alert")
+    timings["scan"] = time.perf_counter() - start
+
+    results: List[FeatureResult] = []
+    if jobs:
+        phase_start = time.perf_counter()
+        get_symbol_index()
+        timings["symbol index"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        results = build_features(jobs, num_jobs)
+        timings["generate"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        for result in results:
+            write_feature(result, cache)
+        timings["write"] = time.perf_counter() - phase_start
 
     # Remove stale files that no longer correspond to any feature
     for stale in output_dir.glob("*.rc"):
@@ -783,5 +966,18 @@ def main():
             print(f"Removing stale: {stale.name}")
             stale.unlink()
 
+    cache.prune(generated_names)
+    cache.save()
+
+    if timing:
+        timings["total"] = time.perf_counter() - start
+        print_timing_report(timings, results, min(num_jobs, len(jobs)))
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate bin/standalone_features/*.rc")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and rebuild")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for feature generation (default: all cores, 1 = serial)")
+    parser.add_argument("--timing", action="store_true", help="Print a timing report")
+    args = parser.parse_args()
+    main(force=args.force, num_jobs=args.jobs, timing=args.timing)
@@ -4,14 +4,17 @@
 Reads each feature's .Config block(s) as the source of truth and assembles
 them into explicit.lua with all BRC references resolved to literal values.
 
-Usage: python3 build/generate_explicit_config.py
+Usage: python3 build/generate_explicit_config.py [--force]
 """
 
+import argparse
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from build_cache import BuildCache, write_if_changed
+
 base_dir = Path(__file__).parent.parent
 features_dir = base_dir / "lua" / "features"
 constants_file = base_dir / "lua" / "core" / "constants.lua"
@@ -593,11 +596,50 @@ def format_feature_section(
         return f'  ["{feature_name}"] = {{\n{body}\n  }},'
 
 
+# =============================================================================
+# Build cache
+# =============================================================================
+
+def get_input_files() -> List[Path]:
+    """Every file explicit.lua depends on, including this script."""
+    scripts = [Path(__file__), Path(__file__).parent / "build_cache.py"]
+    features = sorted(features_dir.glob("*.lua")) + [features_dir / "pickup-alert" / "pa-config.lua"]
+    return [init_file, constants_file, config_file, hotkey_file, *scripts, *features]
+
+
+def entries_key(file_path: Path) -> str:
+    return f"entries:{file_path.relative_to(base_dir).as_posix()}"
+
+
+def cached_config_entries(
+    cache: BuildCache, file_path: Path, var_name: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str], List[ConfigEntry]]:
+    """extract_config_entries[_by_var], reusing the cached parse when file_path is unchanged."""
+    key = entries_key(file_path)
+    inputs = [file_path, Path(__file__)]
+    if cache.is_fresh(key, inputs):
+        feature_name, cached_var, entries = cache.get_data(key)
+        return feature_name, cached_var, [tuple(e) for e in entries]
+
+    if var_name is None:
+        feature_name, var_name, entries = extract_config_entries(file_path)
+    else:
+        feature_name, entries = None, extract_config_entries_by_var(file_path, var_name)
+    cache.record(key, inputs, data=[feature_name, var_name, entries])
+    return feature_name, var_name, entries
+
+
 # =============================================================================
 # Main
 # =============================================================================
 
-def main() -> int:
+def main(force: bool = False) -> int:
+    cache = BuildCache("generate_explicit_config", force=force)
+    input_files = get_input_files()
+    if cache.is_fresh("explicit.lua", input_files, output_file):
+        print(f"{output_file.relative_to(base_dir)} is up to date")
+        return 0
+
     brc_keys = parse_brc_keys()
     brc_tables = parse_brc_constants()
 
@@ -625,13 +667,13 @@ def main() -> int:
             if not pa_config.exists():
                 continue
             feature_name = "pickup-alert"
-            entries = extract_config_entries_by_var(pa_config, "f_pickup_alert")
+            _, _, entries = cached_config_entries(cache, pa_config, "f_pickup_alert")
             processed.add("pickup-alert")
         else:
             file_path = feature_file_map.get(lua_file)
             if not file_path:
                 continue
-            feature_name, var_name, entries = extract_config_entries(file_path)
+            feature_name, var_name, entries = cached_config_entries(cache, file_path)
             if not feature_name:
                 continue
 
@@ -684,10 +726,18 @@ def main() -> int:
     ]
 
     output = '\n'.join(parts) + '\n'
-    output_file.write_text(output, encoding="utf-8")
-    print(f"Generated {output_file.relative_to(base_dir)}")
+    if write_if_changed(output_file, output):
+        print(f"Generated {output_file.relative_to(base_dir)}")
+    else:
+        print(f"{output_file.relative_to(base_dir)} unchanged")
+
+    cache.record("explicit.lua", input_files, output_file)
+    cache.prune(["explicit.lua"] + [entries_key(p) for p in input_files if features_dir in p.parents])
+    cache.save()
     return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    parser = argparse.ArgumentParser(description="Generate lua/config/explicit.lua")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache and rebuild")
+    sys.exit(main(force=parser.parse_args().force))
@@ -0,0 +1,92 @@
+"""Map line numbers in a release RC back to the lua/ and rc/ source lines.
+
+Release builds (concat_rc.py --release) strip comments and blank lines, so line numbers in
+crawl's Lua errors no longer match the sources. Each release RC has a .map.json sidecar;
+this tool reads it.
+
+Usage:
+  python3 build/map_rc_lines.py 1234 1240                      # lines of buehler-custom.rc
+  python3 build/map_rc_lines.py --profile realtime 1234        # lines of buehler-realtime.rc
+  python3 build/map_rc_lines.py < error.txt                    # rewrite "<file>.rc:<line>" in text
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).parent.parent
+RELEASE_DIR = BASE_DIR / "bin" / "release"
+SOURCE_MAP_VERSION = 1
+DEFAULT_PROFILE = "custom"
+
+RC_LINE_RE = re.compile(r"([\w.-]+\.rc):(\d+)")
+
+
+class SourceMap:
+    def __init__(self, path: Path):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != SOURCE_MAP_VERSION:
+            raise ValueError(f"{path}: unsupported source map version {data.get('version')}")
+        self.file: str = data["file"]
+        self.sources: List[str] = data["sources"]
+        self.mappings: List[Optional[List[int]]] = data["mappings"]
+
+    def lookup(self, rc_line: int) -> Optional[Tuple[str, int]]:
+        """(source file, source line) for a 1-based RC line, or None if it was generated."""
+        if not 1 <= rc_line <= len(self.mappings):
+            return None
+        entry = self.mappings[rc_line - 1]
+        if entry is None:
+            return None
+        return self.sources[entry[0]], entry[1]
+
+
+def load_source_map(path: Path) -> SourceMap:
+    if not path.is_file():
+        sys.exit(f"ERROR: {path} not found. Run 'python3 build/concat_rc.py --release' first.")
+    return SourceMap(path)
+
+
+def rewrite(text: str, source_maps: Dict[str, SourceMap]) -> str:
+    """Replace "<file>.rc:<line>" references to mapped RCs with their source locations."""
+    def replace(m: re.Match) -> str:
+        source_map = source_maps.get(m.group(1))
+        location = source_map.lookup(int(m.group(2))) if source_map else None
+        return f"{location[0]}:{location[1]}" if location else m.group(0)
+
+    return RC_LINE_RE.sub(replace, text)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("lines", nargs="*", type=int, help="RC line numbers (default: filter stdin)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help=f"Release RC the line numbers refer to (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--map", type=Path, help="Source map file (overrides --profile)")
+    args = parser.parse_args()
+
+    if not args.lines:
+        # Filter mode: every release RC's map, picked by the file name in each reference
+        paths = [args.map] if args.map else sorted(RELEASE_DIR.glob("*.map.json"))
+        source_maps = {m.file: m for m in map(load_source_map, paths)}
+        for line in sys.stdin:
+            sys.stdout.write(rewrite(line, source_maps))
+        return 0
+
+    source_map = load_source_map(args.map or RELEASE_DIR / f"buehler-{args.profile}.rc.map.json")
+    status = 0
+    for rc_line in args.lines:
+        location = source_map.lookup(rc_line)
+        if location:
+            print(f"{source_map.file}:{rc_line} -> {location[0]}:{location[1]}")
+        else:
+            print(f"{source_map.file}:{rc_line} -> (generated line, no source)")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
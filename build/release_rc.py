@@ -0,0 +1,450 @@
+"""Helpers for the release build of buehler.rc (concat_rc.py --release).
+
+- LuaMinifier strips comments and redundant whitespace from Lua chunks, one line at a
+  time, so every output line still maps back to exactly one source line.
+- plan_release() decides what a config profile doesn't need: the other profiles, features
+  it leaves disabled, and its own config sections for those features.
+- Source maps are JSON sidecars used by map_rc_lines.py to translate error line numbers.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+BASE_DIR = Path(__file__).parent.parent
+CONFIG_DIR = BASE_DIR / "lua" / "config"
+FEATURES_DIR = BASE_DIR / "lua" / "features"
+HEADER_FILE = BASE_DIR / "lua" / "core" / "_header.lua"
+SOURCE_MAP_VERSION = 1
+
+LONG_BRACKET_RE = re.compile(r"\[(=*)\[")
+# A space next to one of these is never needed to separate tokens.
+# Excludes "-" (would form "--" or extend a numeral like 0xe-5), "." ("..." / "1 ..") and "[" ("[[").
+TIGHT_CHARS = frozenset(",;(){}]=<>*/%^#")
+# Lines crawl's RC parser treats as the start/end of a Lua block (after trimming)
+RC_BLOCK_OPEN = ("{", "Lua{")
+RC_BLOCK_CLOSE = ("}", "}Lua")
+
+CONFIG_NAME_RE = re.compile(r'\bBRC_CONFIG_NAME\s*=\s*"([^"]+)"')
+CONFIG_TABLE_RE = re.compile(r"^(brc_config_\w+)\s*=\s*\{", re.MULTILINE)
+FEATURE_NAME_RE = re.compile(r'^(\w+)\.BRC_FEATURE_NAME\s*=\s*"([^"]+)"', re.MULTILINE)
+SECTION_KEY_RE = re.compile(r'\[\s*"([\w-]+)"\s*\]\s*=\s*$')
+GLOBAL_DEF_RE = re.compile(r"^([A-Za-z_]\w*)\s*=[^=]", re.MULTILINE)
+DISABLED_RE = re.compile(r"\bdisabled\s*=\s*(true|false)\b")
+TO_USE_RE = re.compile(r"^BRC\.Config\.to_use\s*=")
+
+
+# =============================================================================
+# Minification
+# =============================================================================
+
+class LuaMinifier:
+    """Minifies one Lua chunk line by line: comments are dropped, runs of whitespace become a
+    single space (or nothing, next to punctuation), and strings are copied verbatim.
+    """
+
+    def __init__(self):
+        self._close: Optional[str] = None  # Closing bracket of an open long string/comment
+        self._in_comment = False
+        self._quote: Optional[str] = None  # Open short string continued with a trailing "\"
+
+    def _in_string(self) -> bool:
+        return (self._close is not None and not self._in_comment) or self._quote is not None
+
+    def in_code(self) -> bool:
+        return self._close is None and self._quote is None
+
+    def minify_line(self, line: str) -> Optional[str]:
+        """Minified text of one source line, or None if nothing is left of it."""
+        line = line.rstrip("\n")
+        keep_empty = self._in_string()
+        out: List[str] = []
+        space = False
+        i, n = 0, len(line)
+
+        while i < n:
+            if self._close is not None:
+                end = line.find(self._close, i)
+                stop = n if end < 0 else end + len(self._close)
+                if not self._in_comment:
+                    out.append(line[i:stop])
+                if end >= 0:
+                    space = space or self._in_comment  # A comment separates tokens
+                    self._close = None
+                    self._in_comment = False
+                i = stop
+                continue
+            if self._quote is not None:
+                stop = self._short_string_end(line, i)
+                out.append(line[i:stop])
+                i = stop
+                continue
+
+            c = line[i]
+            if c.isspace():
+                space = True
+                i += 1
+                continue
+            if line.startswith("--", i):
+                match = LONG_BRACKET_RE.match(line, i + 2)
+                if not match:
+                    break
+                self._close = "]" + match.group(1) + "]"
+                self._in_comment = True
+                i = match.end()
+                continue
+
+            if space and out and out[-1][-1] not in TIGHT_CHARS and c not in TIGHT_CHARS:
+                out.append(" ")
+            space = False
+
+            match = LONG_BRACKET_RE.match(line, i) if c == "[" else None
+            if match:
+                self._close = "]" + match.group(1) + "]"
+                out.append(match.group(0))
+                i = match.end()
+            elif c in ("'", '"'):
+                self._quote = c
+                stop = self._short_string_end(line, i + 1)
+                out.append(line[i:stop])
+                i = stop
+            else:
+                out.append(c)
+                i += 1
+
+        text = "".join(out)
+        if not text and not keep_empty and not self._in_string():
+            return None
+        return text
+
+    def _short_string_end(self, line: str, i: int) -> int:
+        """Index after the closing quote. At end of line the string stays open only if escaped."""
+        n = len(line)
+        while i < n:
+            if line[i] == "\\":
+                if i + 1 == n:
+                    return n
+                i += 2
+            elif line[i] == self._quote:
+                self._quote = None
+                return i + 1
+            else:
+                i += 1
+        self._quote = None  # Unterminated: invalid Lua, leave the rest of the line as is
+        return n
+
+
+def minify_lua(lines: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    """Minify a Lua chunk given as (line number, text) pairs.
+
+    A line that would be just "}" is appended to the previous line, since crawl reads a lone
+    "}" as the end of the Lua block (the issue ensure_brace_comments() handles for explicit.lua).
+    """
+    minifier = LuaMinifier()
+    result: List[Tuple[int, str]] = []
+    for lineno, line in lines:
+        in_code = minifier.in_code()
+        text = minifier.minify_line(line)
+        if text is None:
+            continue
+        if in_code and text in RC_BLOCK_CLOSE and result:
+            result[-1] = (result[-1][0], result[-1][1] + text)
+        else:
+            result.append((lineno, text))
+    return result
+
+
+def minify_rc_line(line: str) -> Optional[str]:
+    """An RC option line without surrounding whitespace, or None for blank and # comment lines."""
+    text = line.strip()
+    if not text or text.startswith("#"):
+        return None
+    return text
+
+
+def mask_lua(text: str) -> str:
+    """text with comments and string contents blanked out (same length, newlines kept).
+
+    Lets the release planner match braces and keys with plain regexes.
+    """
+    out = list(text)
+    n = len(text)
+
+    def blank(start: int, end: int) -> None:
+        for k in range(start, end):
+            if out[k] != "\n":
+                out[k] = " "
+
+    i = 0
+    while i < n:
+        c = text[i]
+        if text.startswith("--", i):
+            match = LONG_BRACKET_RE.match(text, i + 2)
+            if match:
+                close = "]" + match.group(1) + "]"
+                end = text.find(close, match.end())
+                end = n if end < 0 else end + len(close)
+            else:
+                end = text.find("\n", i)
+                end = n if end < 0 else end
+            blank(i, end)
+            i = end
+        elif c == "[" and LONG_BRACKET_RE.match(text, i):
+            match = LONG_BRACKET_RE.match(text, i)
+            close = "]" + match.group(1) + "]"
+            end = text.find(close, match.end())
+            end = n if end < 0 else end
+            blank(match.end(), end)
+            i = end + len(close)
+        elif c in ("'", '"'):
+            j = i + 1
+            while j < n and text[j] != c and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            blank(i + 1, min(j, n))
+            i = j + 1
+        else:
+            i += 1
+    return "".join(out)
+
+
+def _matching_brace(masked: str, start: int) -> int:
+    """Index of the "}" closing the "{" at start, in masked text."""
+    depth = 0
+    for i in range(start, len(masked)):
+        if masked[i] == "{":
+            depth += 1
+        elif masked[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(masked)
+
+
+def _top_level_tables(masked: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """(open, close) brace indexes of tables directly inside masked[start:end]."""
+    tables = []
+    i = start
+    while i < end:
+        if masked[i] == "{":
+            close = _matching_brace(masked, i)
+            tables.append((i, close))
+            i = close
+        i += 1
+    return tables
+
+
+def _top_level_disabled(masked: str, start: int, end: int) -> Optional[bool]:
+    """Literal value of disabled = true/false directly inside masked[start:end], if any."""
+    text, last = [], start
+    for open_i, close_i in _top_level_tables(masked, start, end):
+        text.append(masked[last:open_i])
+        last = close_i + 1
+    text.append(masked[last:end])
+    match = DISABLED_RE.search("".join(text))
+    return None if match is None else match.group(1) == "true"
+
+
+def _line_of(text: str, index: int) -> int:
+    return text.count("\n", 0, index) + 1
+
+
+# =============================================================================
+# Release plan (tree shaking)
+# =============================================================================
+
+class ConfigSection(NamedTuple):
+    disabled: Optional[bool]  # Literal disabled value in the section, if any
+    lines: Optional[range]  # Source lines of the section, if it can be dropped as whole lines
+
+
+class Feature(NamedTuple):
+    name: str
+    files: List[Path]
+    global_names: Set[str]  # Globals its files define (module table, persisted vars)
+    default_disabled: bool
+
+
+class ReleasePlan(NamedTuple):
+    profile: Path
+    config_name: str
+    drop_files: Set[Path]
+    drop_lines: Dict[Path, Set[int]]
+    replace_lines: Dict[Tuple[Path, int], str]
+    dropped_features: List[str]
+
+
+def is_config_profile(path: Path) -> bool:
+    return path.parent == CONFIG_DIR and bool(CONFIG_NAME_RE.search(path.read_text(encoding="utf-8")))
+
+
+def profile_sections(profile: Path) -> Dict[str, ConfigSection]:
+    """Feature sections (["feature-name"] = { ... }) at the top level of a config profile."""
+    text = profile.read_text(encoding="utf-8")
+    masked = mask_lua(text)
+    table = CONFIG_TABLE_RE.search(masked)
+    if not table:
+        return {}
+
+    sections = {}
+    body_start = table.end() - 1
+    for open_i, close_i in _top_level_tables(masked, body_start + 1, _matching_brace(masked, body_start)):
+        line_start = text.rfind("\n", 0, open_i) + 1
+        key = SECTION_KEY_RE.search(text, line_start, open_i)
+        if not key:
+            continue
+        line_end = text.find("\n", close_i)
+        line_end = len(text) if line_end < 0 else line_end
+        whole_lines = (
+            not text[line_start:key.start()].strip()
+            and re.fullmatch(r"\s*,?\s*", masked[close_i + 1:line_end]) is not None
+        )
+        lines = range(_line_of(text, open_i), _line_of(text, close_i) + 1) if whole_lines else None
+        sections[key.group(1)] = ConfigSection(_top_level_disabled(masked, open_i + 1, close_i), lines)
+    return sections
+
+
+def find_features(lua_files: List[Path]) -> List[Feature]:
+    """Group included feature files into features: one per file, or one per subdirectory."""
+    groups: Dict[Path, List[Path]] = {}
+    for path in lua_files:
+        if FEATURES_DIR not in path.parents:
+            continue
+        key = path if path.parent == FEATURES_DIR else path.parent
+        groups.setdefault(key, []).append(path)
+
+    features = []
+    for files in groups.values():
+        texts = {path: mask_lua(path.read_text(encoding="utf-8")) for path in files}
+        name_match = next((m for m in map(FEATURE_NAME_RE.search, (
+            path.read_text(encoding="utf-8") for path in files)) if m), None)
+        if not name_match:
+            continue
+        var_name, feature_name = name_match.groups()
+
+        default_disabled = False
+        for masked in texts.values():
+            config = re.search(rf"^{var_name}\.Config\s*=\s*\{{", masked, re.MULTILINE)
+            if config:
+                open_i = config.end() - 1
+                default_disabled = _top_level_disabled(masked, open_i + 1, _matching_brace(masked, open_i)) is True
+                break
+
+        global_names = {var_name}
+        for masked in texts.values():
+            global_names.update(GLOBAL_DEF_RE.findall(masked))
+        features.append(Feature(feature_name, files, global_names, default_disabled))
+    return features
+
+
+def plan_release(included: List[Path], profile: Path) -> ReleasePlan:
+    """Decide what to leave out of a release build for one config profile.
+
+    Dropped: every other config profile, and features that are disabled once the profile is
+    applied (profile disabled = true, or disabled by default and not re-enabled by it).
+    A disabled feature is kept if any remaining code refers to one of its globals.
+    """
+    lua_files = [path for path in included if path.suffix == ".lua"]
+    profiles = [path for path in lua_files if is_config_profile(path)]
+    if profile not in profiles:
+        names = ", ".join(path.stem for path in profiles)
+        raise ValueError(f"{profile.name} is not an included config profile (choose from: {names})")
+    config_name = CONFIG_NAME_RE.search(profile.read_text(encoding="utf-8")).group(1)
+    drop_files = {path for path in profiles if path != profile}
+
+    sections = profile_sections(profile)
+    dropped: Dict[str, Feature] = {}
+    for feature in find_features(lua_files):
+        section = sections.get(feature.name)
+        profile_disabled = section.disabled if section else None
+        disabled = feature.default_disabled if profile_disabled is None else profile_disabled
+        if disabled:
+            dropped[feature.name] = feature
+
+    # Keep disabled features that remaining code still refers to (until nothing changes)
+    masked = {path: mask_lua(path.read_text(encoding="utf-8")) for path in lua_files}
+    changed = True
+    while changed:
+        changed = False
+        dropped_files = {path for feature in dropped.values() for path in feature.files}
+        kept_code = "\n".join(
+            text for path, text in masked.items() if path not in drop_files and path not in dropped_files
+        )
+        for name, feature in list(dropped.items()):
+            if any(re.search(rf"\b{re.escape(g)}\b", kept_code) for g in feature.global_names):
+                del dropped[name]
+                changed = True
+
+    drop_lines: Dict[Path, Set[int]] = {}
+    for name in dropped:
+        section = sections.get(name)
+        if section and section.lines:
+            drop_lines.setdefault(profile, set()).update(section.lines)
+    for feature in dropped.values():
+        drop_files.update(feature.files)
+
+    # Select the profile up front, instead of asking at the start of each game
+    replace_lines = {}
+    for lineno, line in enumerate(HEADER_FILE.read_text(encoding="utf-8").splitlines(), 1):
+        if TO_USE_RE.match(line):
+            replace_lines[(HEADER_FILE, lineno)] = f'BRC.Config.to_use = "{config_name}"'
+
+    return ReleasePlan(profile, config_name, drop_files, drop_lines, replace_lines, sorted(dropped))
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+Origin = Optional[Tuple[Path, int]]
+
+
+class ReleaseOutput:
+    """Release RC lines, each with the source file and line it came from (None if generated)."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.origins: List[Origin] = []
+
+    def add(self, text: str, origin: Origin = None) -> None:
+        self.lines.append(text)
+        self.origins.append(origin)
+
+    def add_lua(self, path: Path, lines: List[Tuple[int, str]]) -> None:
+        """Add a Lua block: "{", the minified chunk, "}"."""
+        self.add("{")
+        for lineno, text in minify_lua(lines):
+            self.add(text, (path, lineno))
+        self.add("}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _rel(path: Path) -> str:
+    return path.relative_to(BASE_DIR).as_posix()
+
+
+def source_map_json(rc_path: Path, profile: str, output: ReleaseOutput) -> str:
+    """Source map JSON: mappings[i] is [source index, source line] for RC line i+1, or null."""
+    sources: Dict[Path, int] = {}
+    mappings = []
+    for origin in output.origins:
+        if origin is None:
+            mappings.append(None)
+        else:
+            index = sources.setdefault(origin[0], len(sources))
+            mappings.append([index, origin[1]])
+    source_map = {
+        "version": SOURCE_MAP_VERSION,
+        "file": rc_path.name,
+        "profile": profile,
+        "sources": [_rel(p) for p in sources],
+        "mappings": mappings,
+    }
+    return json.dumps(source_map, separators=(",", ":")) + "\n"
+
+
+def format_reduction(label: str, before: int, after: int) -> str:
+    percent = 100 * (before - after) / before if before else 0
+    return f"{label}: {before:,} -> {after:,} ({percent:.0f}% smaller)"
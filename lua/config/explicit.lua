@@ -19,6 +19,8 @@ brc_config_explicit = {
     take_note_on_error = true, -- Note BRC errors in the character file for debugging with char dump
   }, -- BRC.Configs.Default.mpr (do not remove this comment)
 
+  profile_hooks = false,
+
   dump = {
     max_lines_per_table = 200, -- Avoid huge tables (alert_monsters.Config.Alerts) in debug dumps
     omit_pointers = true, -- Don't dump functions and userdata (they only show a hex address)
@@ -26,6 +26,7 @@ local HOOK_FUNCTIONS = {
 local _features
 local _hooks
 local turn_count = -1 -- Do not reset this in init()
+local _hook_profile = {} -- [hook][feature] = { calls, total_ms, max_ms }. Not reset in init()
 
 ---- Local functions ----
 local function char_dump(add_debug_info)
@@ -75,6 +76,58 @@ local function handle_core_error(hook_name, result, ...)
   end
 end
 
+-- Hook profiling (BRC.Config.profile_hooks)
+-- Hook functions are wrapped with a timer when they are registered, so the dispatcher itself is
+-- unchanged and there is no cost at all with profiling off.
+-- Times come from os.clock(): process CPU time (not wall time), with sub-millisecond resolution.
+-- crawl.millis() only counts whole milliseconds, so nearly every hook would record 0; without
+-- os.clock(), profiling stays off.
+local PROFILE_CLOCK = os and os.clock and "os.clock() process CPU time" or nil
+
+local function profile_clock()
+  return os.clock() * 1000
+end
+
+local function profiled_hook(feature_name, hook_name, func)
+  if not _hook_profile[hook_name] then _hook_profile[hook_name] = {} end
+  return function(...)
+    local stats = _hook_profile[hook_name][feature_name]
+    if not stats then
+      stats = { calls = 0, total_ms = 0, max_ms = 0 }
+      _hook_profile[hook_name][feature_name] = stats
+    end
+    local start = profile_clock()
+    local result = func(...)
+    local elapsed = profile_clock() - start
+    stats.calls = stats.calls + 1
+    stats.total_ms = stats.total_ms + elapsed
+    if elapsed > stats.max_ms then stats.max_ms = elapsed end
+    return result
+  end
+end
+
+--- Profile entries sorted by total time, slowest first
+local function sorted_hook_profile()
+  local rows = {}
+  for hook_name, by_feature in pairs(_hook_profile) do
+    for feature_name, stats in pairs(by_feature) do
+      rows[#rows + 1] = {
+        hook = hook_name,
+        feature = feature_name,
+        calls = stats.calls,
+        total_ms = stats.total_ms,
+        max_ms = stats.max_ms,
+      }
+    end
+  end
+  table.sort(rows, function(a, b)
+    if a.total_ms ~= b.total_ms then return a.total_ms > b.total_ms end
+    if a.hook ~= b.hook then return a.hook < b.hook end
+    return a.feature < b.feature
+  end)
+  return rows
+end
+
 -- Hook management
 local function call_all_hooks(hook_name, ...)
   local last_return_value = nil
@@ -228,10 +281,14 @@ function BRC.register(f)
   for _, hook_name in pairs(HOOK_FUNCTIONS) do
     if f[hook_name] then
       if not _hooks[hook_name] then _hooks[hook_name] = {} end
+      local func = f[hook_name]
+      if BRC.Config.profile_hooks and PROFILE_CLOCK then
+        func = profiled_hook(f.BRC_FEATURE_NAME, hook_name, func)
+      end
       table.insert(_hooks[hook_name], {
         feature_name = f.BRC_FEATURE_NAME,
         hook_name = hook_name,
-        func = f[hook_name],
+        func = func,
       })
     end
   end
@@ -264,9 +321,10 @@ function BRC.unregister(name)
 end
 
 -- @param config_name (optional string) name of a config
-function BRC.reset(config_name)
+-- @param data_snapshot (optional table) From BRC.Data.snapshot(); persistent data resets to this
+function BRC.reset(config_name, data_snapshot)
   BRC.active = false
-  BRC.Data.reset()
+  BRC.Data.reset(data_snapshot)
   BRC.opt.clear_macros()
   BRC.init(config_name)
 end
@@ -298,6 +356,9 @@ function BRC.init(config_name)
   BRC.register(BRC.Hotkey)
 
   BRC.mpr.debug("Register features...")
+  if BRC.Config.profile_hooks and not PROFILE_CLOCK then
+    BRC.mpr.warning("Hook profiling is off: it needs os.clock(), and crawl.millis() is too coarse.")
+  end
   register_all_features()
 
   BRC._validate_config_keys()
@@ -341,6 +402,9 @@ function BRC.dump(verbose, skip_mpr)
     tokens[#tokens + 1] = BRC.txt.serialize_inventory()
     util.append(tokens, BRC.serialize_config())
   end
+  if BRC.Config.profile_hooks then
+    tokens[#tokens + 1] = BRC.format_hook_profile()
+  end
 
   if not skip_mpr then
     for _, token in ipairs(tokens) do
@@ -351,6 +415,43 @@ function BRC.dump(verbose, skip_mpr)
   return table.concat(tokens, "\n")
 end
 
+--- Hook profile as a table, slowest first. Empty unless BRC.Config.profile_hooks is on.
+function BRC.format_hook_profile()
+  local lines = {
+    string.format("%-20s %-20s %8s %12s %10s", "hook", "feature", "calls", "total_ms", "max_ms"),
+  }
+  for _, row in ipairs(sorted_hook_profile()) do
+    lines[#lines + 1] = string.format(
+      "%-20s %-20s %8d %12.3f %10.3f", row.hook, row.feature, row.calls, row.total_ms, row.max_ms
+    )
+  end
+  local clock = PROFILE_CLOCK and ("ms of " .. PROFILE_CLOCK) or "off (no os.clock())"
+  return "Hook profile: " .. clock .. "\n" .. table.concat(lines, "\n")
+end
+
+--- Write the hook profile to stderr: a "[PROFILE] clock=..." line naming the clock, then one
+-- "[PROFILE] key=value ..." line per (hook, feature). Read by tests/hook_profile.py.
+-- @param label (optional string) Included in each line, e.g. the test or benchmark name
+function BRC.dump_hook_profile(label)
+  local rows = sorted_hook_profile()
+  if #rows > 0 then crawl.stderr("[PROFILE] clock=" .. PROFILE_CLOCK) end
+  for _, row in ipairs(rows) do
+    crawl.stderr(string.format(
+      "[PROFILE] %shook=%s feature=%s calls=%d total_ms=%.4f max_ms=%.4f",
+      label and ("label=" .. label .. " ") or "",
+      row.hook, row.feature, row.calls, row.total_ms, row.max_ms
+    ))
+  end
+end
+
+function BRC.reset_hook_profile()
+  for _, by_feature in pairs(_hook_profile) do
+    for feature_name, _ in pairs(by_feature) do
+      by_feature[feature_name] = nil
+    end
+  end
+end
+
 ---- Macros ----
 function macro_brc_dump_character()
   if not BRC.active then BRC.util.do_cmd("CMD_CHARACTER_DUMP") end
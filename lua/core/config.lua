@@ -36,6 +36,12 @@ BRC.Configs.Default.mpr = {
   take_note_on_error = true, -- Note BRC errors in the character file for debugging with char dump
 } -- BRC.Configs.Default.mpr (do not remove this comment)
 
+-- Time every feature hook call; see BRC.format_hook_profile() and BRC.dump_hook_profile()
+-- Times are os.clock() process CPU time in ms, not wall time. Without os.clock() this stays off,
+-- since crawl.millis() has only 1 ms resolution.
+-- Only read when features register, so BRC.reset() is needed after changing it mid-game
+BRC.Configs.Default.profile_hooks = false
+
 BRC.Configs.Default.dump = {
     max_lines_per_table = 200, -- Avoid huge tables (alert_monsters.Config.Alerts) in debug dumps
     omit_pointers = true, -- Don't dump functions and userdata (they only show a hex address)
@@ -3,6 +3,8 @@
 -- @module BRC.Data
 -- Provides functions and maintenance for persistent variables that survive game restarts.
 -- Handles backup/restore functionality and error handling.
+-- Variables are saved in a compact Lua encoding. A variable can have a max size: lists keep their
+-- newest entries, maps keep their most recently touched keys (see BRC.Data.touch()).
 ---------------------------------------------------------------------------------------------------
 
 BRC.Data = {}
@@ -11,12 +13,21 @@ BRC.Data.BRC_FEATURE_NAME = "data-manager" -- Included as a feature for Config o
 ---- Local constants ----
 local RESTORE_TABLE = "_brc_persist_restore_table"
 local MAX_RESTORE_RETRIES = 5  -- Maximum number of retry prompts for data restoration
+local AGES_NAME = "brc_persist_ages" -- Persistent table of: var name -> key -> turn last touched
+local LUA_KEYWORDS = {} -- Can't be written as bare keys
+for _, k in ipairs({
+  "and", "break", "do", "else", "elseif", "end", "false", "for", "function", "goto", "if", "in",
+  "local", "nil", "not", "or", "repeat", "return", "then", "true", "until", "while",
+  }) do
+  LUA_KEYWORDS[k] = true
+end
 
 ---- Local variables ----
 -- Init tables in declaration, so persist() can be called before init()
 local _failures = {}
 local _persist_names = {}
 local _default_values = {}
+local _max_entries = {}
 local pushed_restore_table_creation = false -- Set this on file load, not on init()
 local cur_location
 
@@ -62,13 +73,111 @@ local function try_restore(failed_vars)
   return true
 end
 
+--- Append the compact encoding of value to buf. Strings are quoted with %q, so they're lossless.
+local function encode(value, buf)
+  local t = type(value)
+  if t == "string" then
+    buf[#buf + 1] = string.format("%q", value)
+  elseif t == "number" then
+    if value ~= value then
+      buf[#buf + 1] = "0/0"
+    elseif value == math.huge or value == -math.huge then
+      buf[#buf + 1] = value > 0 and "1/0" or "-1/0"
+    else
+      buf[#buf + 1] = tostring(value)
+    end
+  elseif t == "boolean" then
+    buf[#buf + 1] = tostring(value)
+  elseif t == "table" then
+    buf[#buf + 1] = "{"
+    local n = #value
+    for i = 1, n do
+      encode(value[i], buf)
+      buf[#buf + 1] = ","
+    end
+    for k, v in pairs(value) do
+      local kt = type(k)
+      local vt = type(v)
+      local in_list = kt == "number" and k >= 1 and k <= n and k % 1 == 0
+      local encodable = (kt == "string" or kt == "number" or kt == "boolean")
+        and (vt == "table" or vt == "string" or vt == "number" or vt == "boolean")
+      if not in_list and encodable then
+        if kt == "string" and k:match("^[%a_][%w_]*$") and not LUA_KEYWORDS[k] then
+          buf[#buf + 1] = k
+          buf[#buf + 1] = "="
+        else
+          buf[#buf + 1] = "["
+          encode(k, buf)
+          buf[#buf + 1] = "]="
+        end
+        encode(v, buf)
+        buf[#buf + 1] = ","
+      end
+    end
+    buf[#buf + 1] = "}"
+  else
+    buf[#buf + 1] = "nil" -- functions/userdata don't persist
+  end
+end
+
+--- Drop the oldest entries of a list, or the least recently touched keys of a map
+local function apply_limit(name, max_entries)
+  local var = _G[name]
+  if type(var) ~= "table" then return end
+  local ages = brc_persist_ages and brc_persist_ages[name]
+
+  if BRC.util.is_list(var) then
+    local extra = #var - max_entries
+    if extra <= 0 then return end
+    for i = 1, max_entries do
+      var[i] = var[i + extra]
+    end
+    for i = max_entries + 1, max_entries + extra do
+      var[i] = nil
+    end
+    return
+  end
+
+  if ages then
+    for k, _ in pairs(ages) do
+      if var[k] == nil then ages[k] = nil end
+    end
+  end
+  local keys = {}
+  for k, _ in pairs(var) do
+    keys[#keys + 1] = k
+  end
+  if #keys <= max_entries then return end
+
+  -- Keys never touched (e.g. from a save made before the limit was added) go first, in key order
+  ages = ages or {}
+  table.sort(keys, function(a, b)
+    local age_a, age_b = ages[a] or -1, ages[b] or -1
+    if age_a ~= age_b then return age_a < age_b end
+    return tostring(a) < tostring(b)
+  end)
+  for i = 1, #keys - max_entries do
+    var[keys[i]] = nil
+    ages[keys[i]] = nil
+  end
+end
+
+local function apply_limits()
+  for name, max_entries in pairs(_max_entries) do
+    apply_limit(name, max_entries)
+  end
+end
+
 ---- Public API ----
 
 --- Creates a persistent global variable or table, that retains its value through restarts.
 -- @usage `var = BRC.Data.persist("var", value)`
+-- @param max_entries (optional int) For tables: size to trim to at each save and backup.
+--   Lists keep their last entries, maps keep the keys most recently passed to BRC.Data.touch().
+--   Keys that were never touched are dropped before any that were.
 -- @warning After restarting, the variable/table will not exist until this is called.
 -- @return any The current value (whether default or persisted)
-function BRC.Data.persist(name, default_value)
+function BRC.Data.persist(name, default_value, max_entries)
   local t = type(default_value)
   if not util.contains({ "table", "string", "number", "boolean", "nil" }, t) then
     BRC.mpr.error(string.format("Cannot persist %s. Default value is of type %s", name, t))
@@ -99,9 +208,12 @@ function BRC.Data.persist(name, default_value)
     BRC.mpr.debug(BRC.txt.red(name .. " failed to restore from chk_lua_save."))
   end
 
-  -- Create persistent restore table on next startup
+  if max_entries then _max_entries[name] = max_entries end
+
+  -- Create persistent restore table on next startup. Runs first, so trim variables here.
   if not pushed_restore_table_creation then
     table.insert(chk_lua_save, function()
+      apply_limits()
       return RESTORE_TABLE .. " = {}\n"
     end)
     pushed_restore_table_creation = true
@@ -112,13 +224,34 @@ function BRC.Data.persist(name, default_value)
     _persist_names[#_persist_names + 1] = name
     table.insert(chk_lua_save, function()
       if _G[name] == nil then return "" end
-      return RESTORE_TABLE .. "." .. name .. " = " .. BRC.txt.tostr(_G[name]) .. "\n"
+      local buf = { RESTORE_TABLE, ".", name, " = " }
+      encode(_G[name], buf)
+      buf[#buf + 1] = "\n"
+      return table.concat(buf)
     end)
   end
 
   return _G[name]
 end
 
+--- Mark a key of a size-limited persistent map as used now; the least recently used are dropped.
+function BRC.Data.touch(name, key)
+  if not _max_entries[name] then return end
+  local ages = brc_persist_ages[name]
+  if not ages then
+    ages = {}
+    brc_persist_ages[name] = ages
+  end
+  ages[key] = you.turns()
+end
+
+--- @return string The compact encoding that chk_lua_save uses for value
+function BRC.Data.encode(value)
+  local buf = {}
+  encode(value, buf)
+  return table.concat(buf)
+end
+
 function BRC.Data.serialize()
   local tokens = { BRC.txt.lightmagenta("\n---PERSISTENT VARIABLES---\n") }
   local sorted_keys = BRC.util.get_sorted_keys(_persist_names)
@@ -128,18 +261,35 @@ function BRC.Data.serialize()
   return table.concat(tokens)
 end
 
-function BRC.Data.reset()
+--- @return table Copy of every persistent variable, for BRC.Data.reset(snapshot)
+function BRC.Data.snapshot()
+  local snapshot = {}
+  for _, name in ipairs(_persist_names) do
+    local value = _G[name]
+    snapshot[name] = type(value) == "table" and util.copy_table(value) or value
+  end
+  return snapshot
+end
+
+--- Reset persistent variables to their defaults.
+-- @param snapshot (optional table) From BRC.Data.snapshot(); restore these values instead
+function BRC.Data.reset(snapshot)
+  local values = snapshot or _default_values
   if _persist_names then
     for _, name in ipairs(_persist_names) do
-      if type(_default_values[name]) == "table" then
-        _G[name] = util.copy_table(_default_values[name])
+      if type(values[name]) == "table" then
+        _G[name] = util.copy_table(values[name])
       else
-        _G[name] = _default_values[name]
+        _G[name] = values[name]
       end
     end
   end
 
-  BRC.mpr.warning("Reset all persistent data to default values.")
+  if snapshot then
+    BRC.mpr.debug("Restored persistent data from snapshot.")
+  else
+    BRC.mpr.warning("Reset all persistent data to default values.")
+  end
 end
 
 --- @return boolean|nil true if no persist errors, false if failed restore, nil if handled errors
@@ -168,11 +318,15 @@ function BRC.Data.backup()
   c_persist.BRC.Backup.backup_race = you.race()
   c_persist.BRC.Backup.backup_class = you.class()
   c_persist.BRC.Backup.backup_turn = you.turns()
+  apply_limits()
   for _, name in ipairs(_persist_names) do
     c_persist.BRC.Backup[name] = _G[name]
   end
 end
 
+---- Persistent variables ----
+brc_persist_ages = BRC.Data.persist(AGES_NAME, {})
+
 ---- Crawl hook functions ----
 function BRC.Data.ready()
   if you.where() ~= cur_location and not you.have_orb() then
@@ -0,0 +1,103 @@
+--- Message pattern groups for BRC.opt.combine_patterns(); keys are patterns, values are
+--- { group prefix, rest of pattern, group number }. Each group is joined into one regex.
+--- Auto-generated by build/compile_message_filters.py — do not edit manually.
+--- To regenerate: python3 build/compile_message_filters.py
+
+BRC.MESSAGE_PATTERN_GROUPS = {
+  ["There is a.*(door|web).*here"] = { "There is a", ".*(door|web).*here", 1 },
+  ["There is a.*(staircase|door|gate|hatch).*here"] = { "There is a", ".*(staircase|door|gate|hatch).*here", 1 },
+  ["You (bite|headbutt|kick)"] = { "You ", "(bite|headbutt|kick)", 2 },
+  ["You (burn|freeze|drain)"] = { "You ", "(burn|freeze|drain)", 2 },
+  ["You (hear the crackle of electricity|see sparks fly)"] = { "You ", "(hear the crackle of electricity|see sparks fly)", 2 },
+  ["You .* (blown|knocked back|mesmerised|trampled|stumble backwards|encased)"] = { "You ", ".* (blown|knocked back|mesmerised|trampled|stumble backwards|encased)", 2 },
+  ["You .*(slow.*down|lose consciousness)"] = { "You ", ".*(slow.*down|lose consciousness)", 2 },
+  ["You blink"] = { "You ", "blink", 2 },
+  ["You block"] = { "You ", "block", 2 },
+  ["You can access your shopping list by pressing '\\$'"] = { "You ", "can access your shopping list by pressing '\\$'", 2 },
+  ["You disentangle yourself"] = { "You ", "disentangle yourself", 3 },
+  ["You don't have enough magic to cast this spell"] = { "You ", "don't have enough magic to cast this spell", 3 },
+  ["You enter the shallow water"] = { "You ", "enter the shallow water", 3 },
+  ["You feel (a sense of dread|a bond with|a baleful cunning)"] = { "You ", "feel (a sense of dread|a bond with|a baleful cunning)", 3 },
+  ["You feel (very meek|guileless)"] = { "You ", "feel (very meek|guileless)", 3 },
+  ["You feel magic returning to you"] = { "You ", "feel magic returning to you", 3 },
+  ["You feel stable"] = { "You ", "feel stable", 3 },
+  ["You feel the dreadful sensation subside"] = { "You ", "feel the dreadful sensation subside", 3 },
+  ["You have a vision of.*gates?"] = { "You ", "have a vision of.*gates?", 4 },
+  ["You have finished your manual"] = { "You ", "have finished your manual", 4 },
+  ["You now have .* runes"] = { "You ", "now have .* runes", 4 },
+  ["You reach to attack"] = { "You ", "reach to attack", 4 },
+  ["You really shouldn't be using"] = { "You ", "really shouldn't be using", 4 },
+  ["You see here .*"] = { "You ", "see here .*", 4 },
+  ["You see here .*(corpse|skeleton)"] = { "You ", "see here .*(corpse|skeleton)", 4 },
+  ["You sense an unholy aura"] = { "You ", "sense an unholy aura", 4 },
+  ["You sense the presence of something unfriendly"] = { "You", " sense the presence of something unfriendly", 5 },
+  ["You stop (a|de)scending the stairs"] = { "You", " stop (a|de)scending the stairs", 5 },
+  ["You swap places"] = { "You", " swap places", 5 },
+  ["You.*open the door"] = { "You", ".*open the door", 5 },
+  ["You.*re engulfed in.*miasma"] = { "You", ".*re engulfed in.*miasma", 5 },
+  ["You.*re lethally poisoned"] = { "You", ".*re lethally poisoned", 5 },
+  ["You.*re starting to lose your buoyancy"] = { "You", ".*re starting to lose your buoyancy", 5 },
+  ["You.*re suddenly pulled into a different region"] = { "You", ".*re suddenly pulled into a different region", 5 },
+  ["A chill wind blows around you"] = { "A ", "chill wind blows around you", 6 },
+  ["A sentinel's mark forms upon you"] = { "A ", "sentinel's mark forms upon you", 6 },
+  ["(Pain shudders through|A searing pain shoots up) your"] = { "", "(Pain shudders through|A searing pain shoots up) your", 7 },
+  ["(Reduced|Removed|Placed new) exclusion"] = { "", "(Reduced|Removed|Placed new) exclusion", 7 },
+  [".*resides here"] = { "", ".*resides here", 7 },
+  ["Your .* before you manage to get a firm grip on it"] = { "Your ", ".* before you manage to get a firm grip on it", 8 },
+  ["Your .* begins to (drip with poison|ooze corrosive slime)"] = { "Your ", ".* begins to (drip with poison|ooze corrosive slime)", 8 },
+  ["Your .* bursts into flame"] = { "Your ", ".* bursts into flame", 8 },
+  ["Your .* exudes an aura of protection"] = { "Your ", ".* exudes an aura of protection", 8 },
+  ["Your .* gleams with (eagerness|a vicious edge)"] = { "Your ", ".* gleams with (eagerness|a vicious edge)", 8 },
+  ["Your .* glows (with a cold blue light|with a divine radiance|horrifically)"] = { "Your ", ".* glows (with a cold blue light|with a divine radiance|horrifically)", 8 },
+  ["Your .* goes (still|dull)"] = { "Your ", ".* goes (still|dull)", 8 },
+  ["Your .* hums with potential"] = { "Your ", ".* hums with potential", 8 },
+  ["Your .* is briefly surrounded by (a scintillating aura|shifting shadows)"] = { "Your ", ".* is briefly surrounded by (a scintillating aura|shifting shadows)", 9 },
+  ["Your .* is covered in frost"] = { "Your ", ".* is covered in frost", 9 },
+  ["Your .* quivers in your"] = { "Your ", ".* quivers in your", 9 },
+  ["Your .* radiates an overwhelming force"] = { "Your ", ".* radiates an overwhelming force", 9 },
+  ["Your .* stops (dripping with poison|oozing corrosive slime|radiating force)"] = { "Your ", ".* stops (dripping with poison|oozing corrosive slime|radiating force)", 9 },
+  ["Your .* stops (flaming|glowing|crackling|quivering)"] = { "Your ", ".* stops (flaming|glowing|crackling|quivering)", 9 },
+  ["Your .* tingle"] = { "Your ", ".* tingle", 9 },
+  ["Your body shudders with the violent release"] = { "Your ", "body shudders with the violent release", 9 },
+  ["Your damage is reflected back at you"] = { "Your", " damage is reflected back at you", 10 },
+  ["Your foxfire dissipates"] = { "Your", " foxfire dissipates", 10 },
+  ["Your limbs are stiffening"] = { "Your", " limbs are stiffening", 10 },
+  ["Your magical (effects|defenses) are (unraveling|stripped away)"] = { "Your", " magical (effects|defenses) are (unraveling|stripped away)", 10 },
+  ["Your shadow attacks"] = { "Your", " shadow attacks", 10 },
+  ["Your spectral weapon disappears"] = { "Your", " spectral weapon disappears", 10 },
+  ["Your surroundings.*(different|flicker)"] = { "Your", " surroundings.*(different|flicker)", 10 },
+  ["Your.*the (bush|fungus|plant)"] = { "Your", ".*the (bush|fungus|plant)", 10 },
+  ["Space .* around you"] = { "Space ", ".* around you", 11 },
+  ["Space warps around you for a moment"] = { "Space ", "warps around you for a moment", 11 },
+  ["The (bush|fungus|plant) (looks sick|begins to die|is engulfed|is struck)"] = { "The", " (bush|fungus|plant) (looks sick|begins to die|is engulfed|is struck)", 12 },
+  ["The air around.*erupts in flames"] = { "The", " air around.*erupts in flames", 12 },
+  ["The air twists around and violently strikes you in flight"] = { "The", " air twists around and violently strikes you in flight", 12 },
+  ["The forest starts to sway and rumble"] = { "The", " forest starts to sway and rumble", 12 },
+  ["The pull of.*song draws you forward"] = { "The", " pull of.*song draws you forward", 12 },
+  ["The vines retreat back into"] = { "The", " vines retreat back into", 12 },
+  ["The walls disappear"] = { "The", " walls disappear", 12 },
+  ["The.*offers itself to Yredelemnul"] = { "The", ".*offers itself to Yredelemnul", 12 },
+  ["is (lightly|moderately|heavily|severely) (damaged|wounded)"] = { "is ", "(lightly|moderately|heavily|severely) (damaged|wounded)", 13 },
+  ["is almost (dead|destroyed)"] = { "is ", "almost (dead|destroyed)", 13 },
+  ["is honoured by your kill"] = { "is ", "honoured by your kill", 13 },
+  ["is no longer charmed"] = { "is ", "no longer charmed", 13 },
+  ["is no longer ready"] = { "is ", "no longer ready", 13 },
+  ["you stand beside yourself"] = { "you ", "stand beside yourself", 14 },
+  ["you terribly"] = { "you ", "terribly", 14 },
+  ["danger:You convulse"] = { "danger:You ", "convulse", 15 },
+  ["danger:You feel strangely .*stable"] = { "danger:You ", "feel strangely .*stable", 15 },
+  ["appears in a (shower|flash)"] = { "appears ", "in a (shower|flash)", 16 },
+  ["appears out of thin air"] = { "appears ", "out of thin air", 16 },
+  ["god:You are shrouded in an aura of darkness"] = { "god:You", " are shrouded in an aura of darkness", 17 },
+  ["god:You are surrounded by a storm which can block enemy attacks"] = { "god:You", " are surrounded by a storm which can block enemy attacks", 17 },
+  ["god:You feel less resistant to hostile enchantments"] = { "god:You", " feel less resistant to hostile enchantments", 17 },
+  ["god:You feel the effects of Trog's Hand fading"] = { "god:You", " feel the effects of Trog's Hand fading", 17 },
+  ["god:You.*bleed smoke"] = { "god:You", ".*bleed smoke", 17 },
+  ["god:Your divine shield fades away"] = { "god:Your ", "divine shield fades away", 18 },
+  ["god:Your divine shield starts to fade"] = { "god:Your ", "divine shield starts to fade", 18 },
+  ["god:Your shadow.*tangibly mimics your actions"] = { "god:Your ", "shadow.*tangibly mimics your actions", 18 },
+  ["god:will now cure all your mutations"] = { "god:will now ", "cure all your mutations", 19 },
+  ["god:will now unseal the treasures of the Slime Pits"] = { "god:will now ", "unseal the treasures of the Slime Pits", 19 },
+  ["god:Lugonu sends minions to punish you"] = { "god:Lugonu ", "sends minions to punish you", 20 },
+  ["god:Lugonu will now corrupt your weapon"] = { "god:Lugonu ", "will now corrupt your weapon", 20 },
+} -- BRC.MESSAGE_PATTERN_GROUPS (do not remove this comment)
@@ -165,12 +165,21 @@ function f_fm_messages.init()
     BRC.opt.force_more_message(pattern, false)
   end
 
+  local force_more = {}
+  local flash_screen = {}
   for _, entry in ipairs(f_fm_messages.Config.messages) do
     local msg_type, pattern = entry[1], entry[2]
     if msg_type >= f_fm_messages.Config.force_more_threshold then
-      BRC.opt.force_more_message(pattern, true)
+      force_more[#force_more + 1] = pattern
     elseif msg_type >= f_fm_messages.Config.flash_screen_threshold then
-      BRC.opt.flash_screen_message(pattern, true)
+      flash_screen[#flash_screen + 1] = pattern
     end
   end
+
+  for _, pattern in ipairs(BRC.opt.combine_patterns(force_more)) do
+    BRC.opt.force_more_message(pattern, true)
+  end
+  for _, pattern in ipairs(BRC.opt.combine_patterns(flash_screen)) do
+    BRC.opt.flash_screen_message(pattern, true)
+  end
 end
@@ -121,13 +121,16 @@ f_mute_messages.Config = {
   },
 } -- f_mute_messages.Config (do not remove this comment)
 
+---- Local variables ----
+local explore_mutes -- Config.messages.explore_only, combined into fewer patterns at init
+
 ---- Macro functions ----
 function macro_brc_muted_explore()
   if BRC.active and
     not f_mute_messages.Config.disabled and
     f_mute_messages.Config.do_exploration_mutes
   then
-    for _, message in ipairs(f_mute_messages.Config.messages.explore_only) do
+    for _, message in ipairs(explore_mutes) do
       BRC.opt.single_turn_mute(message)
     end
   end
@@ -138,15 +141,18 @@ end
 ---- Initialization ----
 function f_mute_messages.init()
   if f_mute_messages.Config.do_exploration_mutes then
+    explore_mutes = BRC.opt.combine_patterns(f_mute_messages.Config.messages.explore_only)
     BRC.opt.macro(BRC.util.get_cmd_key("CMD_EXPLORE") or "o", "macro_brc_muted_explore")
   end
 
   if f_mute_messages.Config.mute_level and f_mute_messages.Config.mute_level > 0 then
+    local mutes = {}
     for i = 1, f_mute_messages.Config.mute_level do
       if not f_mute_messages.Config.messages[i] then break end
-      for _, message in ipairs(f_mute_messages.Config.messages[i]) do
-        BRC.opt.message_mute(message, true)
-      end
+      util.append(mutes, f_mute_messages.Config.messages[i])
+    end
+    for _, message in ipairs(BRC.opt.combine_patterns(mutes)) do
+      BRC.opt.message_mute(message, true)
     end
   end
 end
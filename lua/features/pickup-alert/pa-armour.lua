@@ -94,7 +94,7 @@ local function get_ego_change_type(cur_ego, it_ego)
     return LOST
   elseif not cur_ego then
     return GAIN
-  elseif not util.contains(pa_egos_alerted, it_ego) then
+  elseif not f_pa_data.ego_alerted(it_ego) then
     return NEW
   else
     return DIFF
@@ -6,17 +6,41 @@
 
 f_pa_data = {}
 
+---- Local constants ----
+-- Least recently seen names are dropped, and may alert again. Saves from before this limit have
+-- no ages, so their names are dropped first, in key order.
+local MAX_ITEMS_ALERTED = 500
+local MAX_RECENT_ALERTS = 50
+local MAX_OTA_CACHE = 200 -- find_OTA results kept per item name before the cache is cleared
+
 ---- Persistent variables ----
-pa_items_alerted = BRC.Data.persist("pa_items_alerted", {})
-pa_recent_alerts = BRC.Data.persist("pa_recent_alerts", {})
+-- name (no plus) -> highest plus
+pa_items_alerted = BRC.Data.persist("pa_items_alerted", {}, MAX_ITEMS_ALERTED)
+pa_recent_alerts = BRC.Data.persist("pa_recent_alerts", {}, MAX_RECENT_ALERTS)
 pa_OTA_items = BRC.Data.persist("pa_OTA_items", nil)
 pa_high_score = BRC.Data.persist("pa_high_score", { ac = 0, weapon = 0, plain_dmg = 0 })
-pa_egos_alerted = BRC.Data.persist("pa_egos_alerted", {})
+pa_egos_alerted = BRC.Data.persist("pa_egos_alerted", {}) -- ego -> true
+
+---- Local variables ----
+-- Compiled form of pa_OTA_items. Rebuilt when the list is replaced or edited via remove_OTA().
+local ota_matcher = { list = nil, lower = {}, by_qualname = {}, cached = 0 }
 
 ---- Initialization ----
 function f_pa_data.init()
   -- Set initial value of pa_OTA_items here, after config overrides are applied
   pa_OTA_items = pa_OTA_items or f_pickup_alert.Config.Alert.one_time
+
+  -- Migrate saves from before indexed alert data
+  if pa_egos_alerted[1] ~= nil then
+    local egos = {}
+    for _, ego in ipairs(pa_egos_alerted) do egos[ego] = true end
+    pa_egos_alerted = egos
+  end
+  for name, value in pairs(pa_items_alerted) do
+    if type(value) ~= "number" then pa_items_alerted[name] = tonumber(value) or 0 end
+  end
+
+  ota_matcher.list = nil
 end
 
 ---- Local functions ----
@@ -35,6 +59,45 @@ local function get_pa_keys(it, use_plain_name)
   end
 end
 
+local function remember_key(name, value)
+  local cur_val = pa_items_alerted[name]
+  if not cur_val or value > cur_val then pa_items_alerted[name] = value end
+  BRC.Data.touch("pa_items_alerted", name)
+end
+
+--- Recompile the OTA matcher if pa_OTA_items was replaced or edited via remove_OTA()
+local function get_ota_matcher()
+  local list = pa_OTA_items
+  if ota_matcher.list == list then return ota_matcher end
+
+  local lower = {}
+  for i, v in ipairs(list) do
+    lower[i] = v:lower()
+  end
+  ota_matcher = { list = list, lower = lower, by_qualname = {}, cached = 0 }
+  return ota_matcher
+end
+
+--- Scan pa_OTA_items for the item name, then (for spellbooks) its spells. Returns false if none.
+local function match_OTA(matcher, it, qualname)
+  for _, v in ipairs(matcher.list) do
+    if v and qualname:find(v) then return v end
+  end
+
+  if it.class(true) == "book" and it.spells then
+    local lower_spells = {}
+    for _, s in ipairs(it.spells) do
+      lower_spells[#lower_spells + 1] = s:lower()
+    end
+    for i, v_lower in ipairs(matcher.lower) do
+      for _, s in ipairs(lower_spells) do
+        if s:find(v_lower) then return matcher.list[i] end
+      end
+    end
+  end
+  return false
+end
+
 local function validate_high_scores()
   pa_high_score = pa_high_score or {}
   pa_high_score.ac = pa_high_score.ac or 0
@@ -45,7 +108,9 @@ end
 ---- Public API ----
 function f_pa_data.already_alerted(it)
   local name, value = get_pa_keys(it)
-  if pa_items_alerted[name] ~= nil and tonumber(pa_items_alerted[name]) >= value then
+  local alerted = pa_items_alerted[name]
+  if alerted ~= nil and alerted >= value then
+    BRC.Data.touch("pa_items_alerted", name)
     return name
   end
 end
@@ -53,8 +118,7 @@ end
 function f_pa_data.remember_alert(it)
   if not (it.is_weapon or BRC.it.is_armour(it, true) or BRC.it.is_talisman(it)) then return end
   local name, value = get_pa_keys(it)
-  local cur_val = tonumber(pa_items_alerted[name])
-  if not cur_val or value > cur_val then pa_items_alerted[name] = value end
+  remember_key(name, value)
 
   -- Add lesser versions of same item, to avoid alerting an inferior item.
   -- Use name comparison instead of get_ego(it) because ego() returns nil for floor items
@@ -62,29 +126,23 @@ function f_pa_data.remember_alert(it)
   if name ~= it.name("db") and not BRC.eq.is_risky(it) and not BRC.it.is_talisman(it) then
     -- Add plain unbranded version
     name = it.name("db")
-    cur_val = tonumber(pa_items_alerted[name])
-    if not cur_val or value > cur_val then pa_items_alerted[name] = value end
+    remember_key(name, value)
 
     -- For branded artefact, add the plain branded version
     local verbose_ego = it.ego(false)
     if it.artefact and verbose_ego then
-      local branded_name
       if BRC.ADJECTIVE_EGOS[verbose_ego] then
-        branded_name = BRC.ADJECTIVE_EGOS[verbose_ego] .. " " .. name
+        remember_key(BRC.ADJECTIVE_EGOS[verbose_ego] .. " " .. name, value)
       else
-        branded_name = name .. " of " .. verbose_ego
+        remember_key(name .. " of " .. verbose_ego, value)
       end
-      cur_val = tonumber(pa_items_alerted[name])
-      if not cur_val or value > cur_val then pa_items_alerted[branded_name] = value end
     end
 
     -- Armour may hit multiple egos based on artefact properties. Add each plain branded version.
     if it.artefact and BRC.it.is_armour(it) then
       for k, v in pairs(it.artprops) do
         if v > 0 and BRC.ARTPROPS_EGO[k] then
-          local branded_name = name .. " of " .. BRC.ARTPROPS_EGO[k]
-          cur_val = tonumber(pa_items_alerted[branded_name])
-          if not cur_val or value > cur_val then pa_items_alerted[branded_name] = value end
+          remember_key(name .. " of " .. BRC.ARTPROPS_EGO[k], value)
         end
       end
     end
@@ -96,6 +154,15 @@ function f_pa_data.forget_alert(it)
   pa_items_alerted[name] = nil
 end
 
+--- @return boolean true if an armour ego has been alerted before
+function f_pa_data.ego_alerted(ego)
+  return pa_egos_alerted[ego] == true
+end
+
+function f_pa_data.remember_ego(ego)
+  pa_egos_alerted[ego] = true
+end
+
 function f_pa_data.add_recent_alert(it)
   if it.is_weapon or BRC.it.is_armour(it, true) or BRC.it.is_talisman(it) then
     pa_recent_alerts[#pa_recent_alerts + 1] = it.name()
@@ -106,24 +173,23 @@ function f_pa_data.remove_recent_alert(it)
   util.remove(pa_recent_alerts, it.name())
 end
 
+--- Return the first pa_OTA_items entry matching the item (or one of its spells), else nil.
+-- Results are cached per item name until the list changes, so repeat checks of an item are O(1).
+-- Edit pa_OTA_items in place only through remove_OTA(); other edits must replace the table.
 function f_pa_data.find_OTA(it)
+  local matcher = get_ota_matcher()
   local qualname = it.name("qual")
-  for _, v in ipairs(pa_OTA_items) do
-    if v and qualname:find(v) then return v end
-  end
-
-  if it.class(true) == "book" and it.spells then
-    local lower_spells = {}
-    for _, s in ipairs(it.spells) do
-      lower_spells[#lower_spells + 1] = s:lower()
-    end
-    for _, v in ipairs(pa_OTA_items) do
-      local v_lower = v:lower()
-      for _, s in ipairs(lower_spells) do
-        if s:find(v_lower) then return v end
-      end
+  local found = matcher.by_qualname[qualname]
+  if found == nil then
+    if matcher.cached >= MAX_OTA_CACHE then
+      matcher.by_qualname = {}
+      matcher.cached = 0
     end
+    found = match_OTA(matcher, it, qualname)
+    matcher.by_qualname[qualname] = found
+    matcher.cached = matcher.cached + 1
   end
+  return found or nil
 end
 
 function f_pa_data.remove_OTA(it)
@@ -131,6 +197,7 @@ function f_pa_data.remove_OTA(it)
     local item_name = f_pa_data.find_OTA(it)
     if item_name == nil then return end
     util.remove(pa_OTA_items, item_name)
+    ota_matcher.list = nil
   until item_name == nil
 end
 
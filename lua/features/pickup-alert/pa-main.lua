@@ -75,10 +75,10 @@ local function track_unique_egos(it)
   local ego = BRC.eq.get_ego(it)
   if
     ego
-    and not util.contains(pa_egos_alerted, ego)
+    and not f_pa_data.ego_alerted(ego)
     and not (it.artefact and BRC.eq.is_risky(it))
   then
-    pa_egos_alerted[#pa_egos_alerted+1] = ego
+    f_pa_data.remember_ego(ego)
   end
 end
 
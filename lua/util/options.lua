@@ -126,3 +126,37 @@ function BRC.opt.runrest_stop_message(pattern, create)
   local op = create and "+=" or "-="
   crawl.setopt(string.format("runrest_stop_message %s %s", op, pattern))
 end
+
+---- Message pattern lists ----
+--- Combine a list of message patterns into as few crawl regexes as possible.
+-- Patterns grouped by build/compile_message_filters.py (BRC.MESSAGE_PATTERN_GROUPS) become one
+-- "prefix(rest1|rest2|...)" regex per group; other patterns are returned unchanged.
+-- @return table List of patterns that match exactly the messages the input list matches
+function BRC.opt.combine_patterns(patterns)
+  local groups = BRC.MESSAGE_PATTERN_GROUPS or {}
+  local combined = {}
+  local numbers = {}
+  local members = {}
+  for _, pattern in ipairs(patterns) do
+    local group = groups[pattern]
+    if not group then
+      combined[#combined + 1] = pattern
+    elseif members[group[3]] then
+      local m = members[group[3]]
+      m[#m + 1] = group[2]
+    else
+      numbers[#numbers + 1] = group[3]
+      members[group[3]] = { group[2], head = group[1], source = pattern }
+    end
+  end
+
+  for _, number in ipairs(numbers) do
+    local m = members[number]
+    if #m == 1 then
+      combined[#combined + 1] = m.source
+    else
+      combined[#combined + 1] = m.head .. "(" .. table.concat(m, "|") .. ")"
+    end
+  end
+  return combined
+end
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""BRC benchmark runner with a baseline regression gate.
+
+Runs each tests/bench/bench_*.lua scenario in its own crawl session, with the test config's
+fixed seed and hook profiling on, and reports ms per turn overall and for each
+(hook, feature). Results are compared against tests/bench/baseline.json. The run fails if a
+gated metric is more than --threshold slower than the baseline.
+
+Scenarios are built like tests (see tests/run.py): buehler.rc up to BRC.init(), then
+harness.lua, tests/bench/bench_harness.lua, the scenario, and the rest of buehler.rc.
+Each scenario reports "[BENCH] scenario=<name> turns=N wall_ms=N ..." and its hook profile.
+A scenario can add its own metrics to the end of that line (see B.metric() in bench_harness.lua).
+
+What is gated:
+  - hook ms/turn: total time in BRC hooks per turn. This is the main metric. It only counts
+    Lua in lua/features and lua/core, so crawl's own speed doesn't move it much.
+  - each (hook, feature) ms/turn, when the baseline or the new value is at least --min-ms.
+  - wall ms/turn (the whole session, crawl included), only with --gate-wall.
+  - each scenario metric (e.g. save_ms, save_bytes), where larger is worse.
+A different turn count means the scenario took a different path (e.g. a behaviour change),
+so per-turn numbers may not be comparable; that's reported as a warning.
+
+Baselines are machine specific. Update them on the machine that runs the gate, from a clean
+tree, and commit the result:
+  python3 tests/bench.py --repeat 5 --update-baseline
+
+Usage:
+  python3 tests/bench.py                       # all scenarios, compare to the baseline
+  python3 tests/bench.py explore messages      # some scenarios
+  python3 tests/bench.py --repeat 3            # median of 3 runs per scenario
+  python3 tests/bench.py --json out.json --profile-dir /tmp/prof
+  python3 tests/bench.py --only-baselined      # only scenarios with a baseline; fails if none
+"""
+
+import argparse
+import json
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from run import (BUEHLER_RC, Config, _ensure_newline, apply_header_overrides, build_rc,
+                 check_prerequisites, load_config, load_harness, run_session, save_profile,
+                 split_at_init)
+from hook_profile import PROFILE_RE
+
+BENCH_DIR = Path(__file__).resolve().parent / "bench"
+BENCH_HARNESS_FILE = BENCH_DIR / "bench_harness.lua"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_MS = 0.05
+DEFAULT_TIMEOUT_SEC = 300
+
+BENCH_RE = re.compile(
+    r"^\[BENCH\] scenario=(?P<name>\w+) turns=(?P<turns>\d+) wall_ms=(?P<wall>\d+) "
+    r"depth=(?P<depth>\d+) status=(?P<status>\w+)"
+)
+METRIC_RE = re.compile(r" (\w+)=(\d+(?:\.\d+)?)")
+
+
+class Scenario(NamedTuple):
+    name: str
+    rc_text: str
+    flags: List[str]
+
+
+class BenchResult(NamedTuple):
+    name: str
+    status: str  # "ok", "stalled" or "error"
+    turns: int
+    depth: int
+    ms_per_turn: float  # Wall time, whole session
+    hook_ms_per_turn: float  # Time in BRC hooks
+    hooks: Dict[str, float]  # "hook/feature" -> ms per turn
+    metrics: Dict[str, float]  # Scenario metrics from B.metric()
+    error: str = ""
+
+    def to_json(self) -> dict:
+        return {
+            "turns": self.turns,
+            "depth": self.depth,
+            "ms_per_turn": round(self.ms_per_turn, 4),
+            "hook_ms_per_turn": round(self.hook_ms_per_turn, 4),
+            "hooks": {k: round(v, 4) for k, v in sorted(self.hooks.items())},
+            "metrics": {k: round(v, 4) for k, v in sorted(self.metrics.items())},
+        }
+
+
+# =============================================================================
+# Running scenarios
+# =============================================================================
+
+def discover_scenarios(names: List[str], config: Config) -> List[Scenario]:
+    files = sorted(p for p in BENCH_DIR.glob("bench_*.lua") if p != BENCH_HARNESS_FILE)
+    by_name = {p.stem[len("bench_"):]: p for p in files}
+    for name in names:
+        if name not in by_name:
+            sys.exit(f"ERROR: Unknown scenario '{name}' (have: {', '.join(sorted(by_name))})")
+
+    head, tail = split_at_init(BUEHLER_RC.read_text(encoding="utf-8"))
+    harness = _ensure_newline(load_harness(profile_hooks=True))
+    bench_harness = _ensure_newline(BENCH_HARNESS_FILE.read_text(encoding="utf-8"))
+    scenarios = []
+    for name, path in by_name.items():
+        if names and name not in names:
+            continue
+        text = path.read_text(encoding="utf-8")
+        rc_text = head + harness + bench_harness + _ensure_newline(text) + tail
+        flags = apply_header_overrides(config.crawl_flags, text)
+        scenarios.append(Scenario(name, rc_text, flags.split()))
+    return scenarios
+
+
+def parse_result(name: str, stderr_lines: List[str], timed_out: bool) -> BenchResult:
+    bench = next((m for m in map(BENCH_RE.match, stderr_lines) if m and m["name"] == name), None)
+    if not bench:
+        error = "timed out" if timed_out else "no [BENCH] line"
+        errors = [line for line in stderr_lines if line.startswith(("[ERROR]", "[FAIL]"))]
+        return BenchResult(name, "error", 0, 0, 0.0, 0.0, {}, {}, "; ".join(errors) or error)
+
+    turns = max(1, int(bench["turns"]))
+    hooks: Dict[str, float] = {}
+    for m in map(PROFILE_RE.match, stderr_lines):
+        if m and m["label"] == name:
+            key = f"{m['hook']}/{m['feature']}"
+            hooks[key] = hooks.get(key, 0.0) + float(m["total"]) / turns
+    return BenchResult(
+        name=name,
+        status=bench["status"],
+        turns=int(bench["turns"]),
+        depth=int(bench["depth"]),
+        ms_per_turn=int(bench["wall"]) / turns,
+        hook_ms_per_turn=sum(hooks.values()),
+        hooks=hooks,
+        metrics={k: float(v) for k, v in METRIC_RE.findall(bench.string[bench.end():])},
+    )
+
+
+def run_scenario(scenario: Scenario, config: Config, work_root: Path, run_index: int,
+                 profile_dir: Optional[Path]) -> BenchResult:
+    work_dir = work_root / f"{scenario.name}-{run_index}"
+    work_dir.mkdir(parents=True)
+    rc_path = work_dir / f"bench_{scenario.name}.rc"
+    rc_path.write_text(scenario.rc_text, encoding="utf-8")
+
+    stderr_lines, _, timed_out, _ = run_session(scenario.flags, rc_path, config)
+    if profile_dir:
+        save_profile(stderr_lines, profile_dir / f"bench_{scenario.name}-{run_index}.prof")
+    return parse_result(scenario.name, stderr_lines, timed_out)
+
+
+def median_result(runs: List[BenchResult]) -> BenchResult:
+    """Per-metric median over repeated runs; any failed run fails the scenario."""
+    bad = [r for r in runs if r.status != "ok"]
+    if bad or len(runs) == 1:
+        return bad[0] if bad else runs[0]
+    keys = sorted({k for r in runs for k in r.hooks})
+    metric_keys = sorted({k for r in runs for k in r.metrics})
+    return runs[0]._replace(
+        ms_per_turn=statistics.median(r.ms_per_turn for r in runs),
+        hook_ms_per_turn=statistics.median(r.hook_ms_per_turn for r in runs),
+        hooks={k: statistics.median(r.hooks.get(k, 0.0) for r in runs) for k in keys},
+        metrics={k: statistics.median(r.metrics.get(k, 0.0) for r in runs) for k in metric_keys},
+    )
+
+
+# =============================================================================
+# Baseline comparison
+# =============================================================================
+
+def load_baseline(path: Path) -> dict:
+    try:
+        baseline = json.loads(path.read_text(encoding="utf-8"))
+    except OSError:
+        return {"version": BASELINE_VERSION, "scenarios": {}}
+    if baseline.get("version") != BASELINE_VERSION:
+        sys.exit(f"ERROR: {path}: unsupported baseline version {baseline.get('version')}")
+    return baseline
+
+
+def _slower(current: float, base: float, threshold: float) -> bool:
+    return current > base * (1 + threshold)
+
+
+def _change(current: float, base: float) -> str:
+    return f"{100 * (current - base) / base:+.0f}%" if base else "new"
+
+
+def compare(result: BenchResult, base: Optional[dict], threshold: float, min_ms: float,
+            gate_wall: bool) -> List[str]:
+    """Return the regressions of result against its baseline entry (and print warnings)."""
+    if base is None:
+        print(f"  (no baseline for '{result.name}'; run with --update-baseline to record one)")
+        return []
+    if base["turns"] != result.turns:
+        print(f"  WARNING: {base['turns']} turns in baseline, {result.turns} now; "
+              "per-turn numbers may not be comparable")
+
+    regressions = []
+    metrics = [("hook ms/turn", result.hook_ms_per_turn, base["hook_ms_per_turn"])]
+    if gate_wall:
+        metrics.append(("wall ms/turn", result.ms_per_turn, base["ms_per_turn"]))
+    for key in sorted(set(result.hooks) | set(base.get("hooks", {}))):
+        current, before = result.hooks.get(key, 0.0), base.get("hooks", {}).get(key, 0.0)
+        if max(current, before) >= min_ms:
+            metrics.append((key, current, before))
+    for key, current in sorted(result.metrics.items()):
+        if key in base.get("metrics", {}):
+            metrics.append((key, current, base["metrics"][key]))
+    for label, current, before in metrics:
+        if _slower(current, before, threshold):
+            regressions.append(f"{label}: {before:.3f} -> {current:.3f} "
+                               f"({_change(current, before)}, limit +{100 * threshold:.0f}%)")
+    return regressions
+
+
+def format_result(result: BenchResult, base: Optional[dict]) -> str:
+    if result.status == "error":
+        return f"[ERROR] {result.name}: {result.error}"
+    lines = [f"[{result.status.upper()}] {result.name}: {result.turns} turns (depth {result.depth})"]
+    rows = [("wall ms/turn", result.ms_per_turn, base and base["ms_per_turn"]),
+            ("hook ms/turn", result.hook_ms_per_turn, base and base["hook_ms_per_turn"])]
+    top = sorted(result.hooks.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    rows.extend((k, v, base and base.get("hooks", {}).get(k)) for k, v in top)
+    rows.extend((k, v, base and base.get("metrics", {}).get(k))
+                for k, v in sorted(result.metrics.items()))
+    for label, value, before in rows:
+        vs = f"  (baseline {before:.3f}, {_change(value, before)})" if before is not None else ""
+        lines.append(f"  {label:<36} {value:9.3f}{vs}")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help="Scenario names (default: all)")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N",
+                        help="Runs per scenario; the median is used (default: 1)")
+    parser.add_argument("--threshold", type=float, metavar="FRACTION",
+                        help="Allowed slowdown, e.g. 0.25 for +25%% (default: from baseline, "
+                             f"else {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-ms", type=float, default=DEFAULT_MIN_MS, metavar="MS",
+                        help="Ignore (hook, feature) pairs under MS per turn "
+                             f"(default: {DEFAULT_MIN_MS})")
+    parser.add_argument("--gate-wall", action="store_true",
+                        help="Also fail on wall ms/turn (includes crawl itself; noisier)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, metavar="PATH",
+                        help="Baseline JSON (default: tests/bench/baseline.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the results to the baseline instead of comparing")
+    parser.add_argument("--only-baselined", action="store_true",
+                        help="Only run scenarios that have a baseline; fail if none do")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_SEC, metavar="SEC",
+                        help=f"Per-session timeout (default: {DEFAULT_TIMEOUT_SEC})")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--profile-dir", type=Path, metavar="DIR",
+                        help="Save each session's [PROFILE] lines (see tests/hook_profile.py)")
+    parser.add_argument("--no-build", action="store_true", help="Don't rebuild buehler.rc first")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    baseline = load_baseline(args.baseline)
+    if args.only_baselined and not args.update_baseline:
+        baselined = sorted(baseline["scenarios"])
+        if args.scenarios:
+            baselined = [name for name in args.scenarios if name in baseline["scenarios"]]
+        if not baselined:
+            # Passing here would make a regression gate that can never fail
+            print(f"ERROR: no scenario has a baseline in {args.baseline}, nothing to compare",
+                  file=sys.stderr)
+            print("Record one with: python3 tests/bench.py --repeat 5 --update-baseline",
+                  file=sys.stderr)
+            return 1
+        args.scenarios = baselined
+
+    if not args.no_build:
+        build_rc()
+    config = load_config()._replace(timeout_sec=args.timeout)
+    check_prerequisites(config)
+
+    scenarios = discover_scenarios(args.scenarios, config)
+    if not scenarios:
+        print("No scenarios selected", file=sys.stderr)
+        return 1
+    if args.profile_dir:
+        args.profile_dir.mkdir(parents=True, exist_ok=True)
+
+    threshold = args.threshold if args.threshold is not None else baseline.get(
+        "threshold", DEFAULT_THRESHOLD)
+
+    results: List[BenchResult] = []
+    regressions: Dict[str, List[str]] = {}
+    work_root = Path(tempfile.mkdtemp(prefix="brc-bench-"))
+    try:
+        for scenario in scenarios:
+            runs = [run_scenario(scenario, config, work_root, i, args.profile_dir)
+                    for i in range(max(1, args.repeat))]
+            result = median_result(runs)
+            results.append(result)
+            base = baseline["scenarios"].get(result.name)
+            print(format_result(result, None if args.update_baseline else base), flush=True)
+            if result.status == "ok" and not args.update_baseline:
+                found = compare(result, base, threshold, args.min_ms, args.gate_wall)
+                if found:
+                    regressions[result.name] = found
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    if args.json:
+        report = {r.name: dict(r.to_json(), status=r.status, error=r.error) for r in results}
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    failed = [r.name for r in results if r.status != "ok"]
+    print("")
+    print("────────────────────────────────────────")
+    if args.update_baseline:
+        if failed:
+            print(f"Not updating baseline: {', '.join(failed)} did not finish")
+            return 1
+        baseline.setdefault("threshold", DEFAULT_THRESHOLD)
+        baseline["scenarios"].update({r.name: r.to_json() for r in results})
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        print(f"Updated {args.baseline} ({len(results)} scenarios)")
+        return 0
+
+    for name, found in regressions.items():
+        print(f"REGRESSION in {name}:")
+        for line in found:
+            print(f"  {line}")
+    if failed:
+        print(f"Scenarios that did not finish: {', '.join(failed)}")
+    if regressions or failed:
+        print("FAILED")
+        return 1
+    print(f"Benchmarks: {len(results)} scenarios within +{100 * threshold:.0f}% of baseline")
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+---------------------------------------------------------------------------------------------------
+-- BRC benchmark: autopickup checks over a large floor pile
+-- Piles up weapons and armour of many types, egos and enchantments, then runs the autopickup
+-- hook on every item several times per turn, like crawl does while the player stands on or
+-- walks over a big stash. Most of the cost is in pickup-alert (pa-main, pa-data, pa-weapons,
+-- pa-armour).
+--
+-- IMPORTANT: ASCII only, and no "}" at column 0 (it ends the RC's Lua block).
+---------------------------------------------------------------------------------------------------
+
+bench_autopickup = {}
+bench_autopickup.BRC_FEATURE_NAME = "bench-autopickup"
+
+local TURNS = 200
+local PASSES_PER_TURN = 5
+local ITEMS_PER_TURN = 6 -- wizard_give calls per setup turn
+T.timeout_turns = TURNS + 100
+
+local ITEMS = {
+  "dagger", "short sword", "long sword plus:2", "scimitar ego:flaming", "great sword",
+  "hand axe", "war axe ego:freezing plus:3", "broad axe", "battleaxe plus:4", "executioner's axe",
+  "mace ego:chaos plus:5", "flail", "morningstar ego:flaming plus:3", "eveningstar",
+  "great mace", "giant club", "spear ego:venom", "trident plus:2", "halberd", "glaive",
+  "quarterstaff ego:speed", "lajatang", "shortbow", "longbow plus:3", "arbalest",
+  "robe ego:fire_resistance", "leather armour plus:2", "ring mail ego:fire_resistance",
+  "scale mail", "chain mail plus:1", "plate armour", "crystal plate armour",
+  "animal skin plus:5", "cloak ego:fire_resistance", "cloak", "helmet", "hat ego:see_invisible",
+  "pair of gloves", "pair of boots plus:2", "buckler", "kite shield", "tower shield",
+  } -- indented: a "}" at column 0 ends the RC's Lua block
+
+local _phase = "setup"
+local _given = 0
+
+function bench_autopickup.ready()
+  if T._done then return end
+
+  T.run("bench-autopickup", function()
+    if _phase == "setup" then
+      local M = f_pickup_alert.Config.Alert.More
+      for k in pairs(M) do M[k] = false end
+      crawl.setopt("default_autopickup = false")
+
+      for _ = 1, ITEMS_PER_TURN do
+        _given = _given + 1
+        if ITEMS[_given] then T.wizard_give(ITEMS[_given]) end
+      end
+      if _given >= #ITEMS then
+        T.wizard_identify_all()
+        _phase = "run"
+        B.start("autopickup")
+      end
+      crawl.do_commands({"CMD_WAIT"})
+      return
+    end
+
+    if B.turns() >= TURNS then
+      B.finish("ok")
+      return
+    end
+
+    local floor = you.floor_items()
+    for _ = 1, PASSES_PER_TURN do
+      for _, it in ipairs(floor) do
+        BRC.autopickup(it)
+      end
+    end
+    crawl.do_commands({"CMD_WAIT"})
+  end)
+end
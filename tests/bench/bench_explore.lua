@@ -0,0 +1,63 @@
+---------------------------------------------------------------------------------------------------
+-- BRC benchmark: auto-explore across several dungeon levels
+-- Explores each level, fights whatever autoexplore runs into, then travels to the next level down.
+-- Exercises the per-turn hooks of every feature (ready, c_message, autopickup, ch_start_running)
+-- the way a normal game does. The seed is fixed, so every run takes the same path.
+--
+-- IMPORTANT: ASCII only, and no "}" at column 0 (it ends the RC's Lua block).
+---------------------------------------------------------------------------------------------------
+
+bench_explore = {}
+bench_explore.BRC_FEATURE_NAME = "bench-explore"
+
+local TARGET_DEPTH = 4
+local MAX_TURNS = 5000
+T.timeout_turns = MAX_TURNS + 100
+
+local _phase = "setup"
+local _explore_turn = -1
+
+local function descend()
+  if view.feature_at(0, 0):contains("stairs_down") then
+    crawl.do_commands({"CMD_GO_DOWNSTAIRS"})
+  else
+    -- Interlevel travel: ">" picks the next level down, then travel takes the stairs
+    crawl.sendkeys(">")
+    crawl.do_commands({"CMD_INTERLEVEL_TRAVEL"})
+  end
+end
+
+function bench_explore.ready()
+  if T._done then return end
+
+  T.run("bench-explore", function()
+    if _phase == "setup" then
+      -- A --more-- prompt would block headless crawl
+      local M = f_pickup_alert.Config.Alert.More
+      for k in pairs(M) do M[k] = false end
+      crawl.setopt("show_more = false")
+      T.wizard_set_xl(27)
+      _phase = "run"
+      B.start("explore")
+      crawl.do_commands({"CMD_WAIT"})
+      return
+    end
+
+    if you.depth() >= TARGET_DEPTH or B.turns() >= MAX_TURNS then
+      B.finish("ok")
+    elseif B.stalled() then
+      B.finish("stalled")
+    elseif B.idle_readies >= 3 then
+      -- Nothing moved for a few inputs (unreachable monster, interrupted travel): let time pass
+      crawl.do_commands({"CMD_WAIT"})
+    elseif not you.feel_safe() then
+      crawl.do_commands({"CMD_AUTOFIGHT"})
+    elseif you.turns() == _explore_turn then
+      -- The last explore took no time: the level is done
+      descend()
+    else
+      _explore_turn = you.turns()
+      crawl.do_commands({"CMD_EXPLORE"})
+    end
+  end)
+end
@@ -0,0 +1,80 @@
+---------------------------------------------------------------------------------------------------
+-- BRC Benchmark Harness
+-- Injected after harness.lua (and with hook profiling on) by tests/bench.py.
+-- A scenario calls B.start() once setup is done, drives the game from its ready() hook, and
+-- calls B.finish() to report its timings and quit. The runner parses the [BENCH] line and the
+-- scenario's [PROFILE] lines.
+---------------------------------------------------------------------------------------------------
+
+B = {}
+B._name = nil
+B._start_turn = 0
+B._start_ms = 0
+B._last_turn = -1
+B.idle_readies = 0 -- ready() calls since a turn last passed
+B._metrics = {} -- { name, value } reported after status= on the [BENCH] line
+
+-- Max consecutive ready() calls without a turn passing before a scenario counts as stalled
+B.max_idle_readies = 20
+
+local function stderr(line)
+  crawl.stderr(line)
+end
+
+--- Start timing. Resets the hook profile so scenario setup (wizard commands etc) isn't counted.
+function B.start(name)
+  B._name = name
+  B._start_turn = you.turns()
+  B._start_ms = crawl.millis()
+  B._last_turn = you.turns()
+  B.idle_readies = 0
+  B._metrics = {}
+  BRC.reset_hook_profile()
+end
+
+function B.started()
+  return B._name ~= nil
+end
+
+function B.turns()
+  return you.turns() - B._start_turn
+end
+
+--- Call once per ready(). Returns true if no turn has passed in B.max_idle_readies calls.
+function B.stalled()
+  if you.turns() == B._last_turn then
+    B.idle_readies = B.idle_readies + 1
+  else
+    B._last_turn = you.turns()
+    B.idle_readies = 0
+  end
+  return B.idle_readies >= B.max_idle_readies
+end
+
+--- Record a scenario-specific number (larger is worse) for the baseline gate. Call before finish.
+function B.metric(name, value)
+  B._metrics[#B._metrics + 1] = { name, value }
+end
+
+--- Report timings and end the session. status is "ok" or "stalled".
+function B.finish(status)
+  local turns = B.turns()
+  local wall_ms = crawl.millis() - B._start_ms
+  local tokens = { string.format(
+    "[BENCH] scenario=%s turns=%d wall_ms=%d depth=%d status=%s",
+    B._name, turns, wall_ms, you.depth(), status or "ok"
+  ) }
+  for _, m in ipairs(B._metrics) do
+    tokens[#tokens + 1] = string.format("%s=%.3f", m[1], m[2])
+  end
+  stderr(table.concat(tokens, " "))
+  BRC.dump_hook_profile(B._name)
+  BRC.reset_hook_profile() -- Already reported; keep T.done() from dumping it again unlabeled
+  if status and status ~= "ok" then
+    T.fail(B._name, status)
+  else
+    T.pass(B._name)
+  end
+  B._name = nil
+  T.done()
+end
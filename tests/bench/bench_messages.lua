@@ -0,0 +1,77 @@
+---------------------------------------------------------------------------------------------------
+-- BRC benchmark: message floods
+-- Every turn, prints a burst of common game messages (many of them matched by mute-messages)
+-- and feeds a larger set, including fm-messages patterns, through the c_message hooks.
+-- Force-more messages are only sent through the hooks: printing them would block headless crawl
+-- on a --more-- prompt.
+--
+-- IMPORTANT: ASCII only, and no "}" at column 0 (it ends the RC's Lua block).
+---------------------------------------------------------------------------------------------------
+
+bench_messages = {}
+bench_messages.BRC_FEATURE_NAME = "bench-messages"
+
+local TURNS = 200
+local REPEATS = 10
+T.timeout_turns = TURNS + 100
+
+-- Printed with crawl.mpr(): these reach crawl's message_mute matching and the c_message hooks
+local PRINTED = {
+  "You see here a +0 dagger.",
+  "There is a stone staircase leading down here.",
+  "There is an open door here.",
+  "You now have 12 gold pieces.",
+  "You enter the shallow water.",
+  "Unfortunately, you learn nothing new.",
+  "The kobold misses you.",
+  "You hit the kobold.",
+  "You block the goblin's attack.",
+  "Marking area around (12, 34) as unsafe.",
+  }
+
+-- Sent straight to the c_message hooks, with the channel crawl would use
+local HOOK_ONLY = {
+  { "You have reached level 5!", "intrinsic_gain" },
+  { "Found a stone staircase leading down.", "plain" },
+  { "Done exploring.", "plain" },
+  { "You start putting on your armour.", "multiturn" },
+  { "You finish putting on your armour.", "plain" },
+  { "You feel a bit more experienced.", "plain" },
+  { "The orc priest appears in a shower of sparks!", "monster_warning" },
+  { "You sense the presence of something unfriendly.", "warning" },
+  { "Some monsters swap places.", "plain" },
+  { "Trog grants you a weapon!", "god" },
+  { "The walls disappear!", "plain" },
+  { "You feel the effects of Trog's Hand fading.", "god" },
+  }
+
+local _phase = "setup"
+
+function bench_messages.ready()
+  if T._done then return end
+
+  T.run("bench-messages", function()
+    if _phase == "setup" then
+      crawl.setopt("show_more = false") -- Only force_more messages may prompt
+      _phase = "run"
+      B.start("messages")
+      crawl.do_commands({"CMD_WAIT"})
+      return
+    end
+
+    if B.turns() >= TURNS then
+      B.finish("ok")
+      return
+    end
+
+    for _ = 1, REPEATS do
+      for _, msg in ipairs(PRINTED) do
+        crawl.mpr(msg)
+      end
+      for _, entry in ipairs(HOOK_ONLY) do
+        BRC.c_message(entry[1], entry[2])
+      end
+    end
+    crawl.do_commands({"CMD_WAIT"})
+  end)
+end
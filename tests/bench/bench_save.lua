@@ -0,0 +1,83 @@
+---------------------------------------------------------------------------------------------------
+-- BRC benchmark: saving persistent data from a late-game state
+-- Fills the persistent tables the way a long game does (hundreds of alerted item names, a long
+-- recent-alerts list, dropped items), keeps adding to them each turn, and runs every chk_lua_save
+-- function like crawl does when it saves. Reports ms per save and the size of the last save.
+--
+-- IMPORTANT: ASCII only, and no "}" at column 0 (it ends the RC's Lua block).
+---------------------------------------------------------------------------------------------------
+
+bench_save = {}
+bench_save.BRC_FEATURE_NAME = "bench-save"
+
+local TURNS = 100
+local SAVES_PER_TURN = 2
+local NEW_ALERTS_PER_TURN = 5
+T.timeout_turns = TURNS + 50
+
+local BASES = {
+  "dagger", "short sword", "long sword", "scimitar", "great sword", "hand axe", "war axe",
+  "broad axe", "battleaxe", "mace", "flail", "morningstar", "spear", "trident", "halberd",
+  "glaive", "quarterstaff", "shortbow", "longbow", "arbalest", "robe", "leather armour",
+  "ring mail", "scale mail", "chain mail", "plate armour", "cloak", "helmet", "pair of boots",
+  "kite shield",
+  } -- indented: a "}" at column 0 ends the RC's Lua block
+local EGOS = {
+  "flaming", "freezing", "venom", "draining", "electrocution", "speed", "vampirism", "holy wrath",
+  "chaos", "pain", "distortion", "protection", "fire resistance", "cold resistance",
+  "poison resistance", "see invisible", "willpower", "reflection", "stealth", "running",
+  "spirit shield", "archery", "rampaging", "harm", "the Archmagi", "resistance", "ponderousness",
+  }
+
+local _saves = 0
+local _save_ms = 0
+local _save_bytes = 0
+local _next_alert = 0
+
+local function add_alert()
+  _next_alert = _next_alert + 1
+  local base = BASES[_next_alert % #BASES + 1]
+  local ego = EGOS[math.floor(_next_alert / #BASES) % #EGOS + 1]
+  local name = string.format("%s of %s #%d", base, ego, _next_alert)
+  pa_items_alerted[name] = _next_alert % 10
+  BRC.Data.touch("pa_items_alerted", name)
+  pa_recent_alerts[#pa_recent_alerts + 1] = "+" .. (_next_alert % 10) .. " " .. name
+end
+
+local function save()
+  local start = crawl.millis()
+  local bytes = 0
+  for _, func in ipairs(chk_lua_save) do
+    local result = func()
+    if result then bytes = bytes + #result end
+  end
+  _save_ms = _save_ms + crawl.millis() - start
+  _save_bytes = bytes
+  _saves = _saves + 1
+end
+
+function bench_save.ready()
+  if T._done then return end
+
+  T.run("bench-save", function()
+    if not B.started() then
+      for _ = 1, 800 do add_alert() end
+      for _, ego in ipairs(EGOS) do pa_egos_alerted[ego] = true end
+      for i = 1, 60 do
+        ed_dropped_items[#ed_dropped_items + 1] = BASES[i % #BASES + 1] .. " " .. i
+      end
+      B.start("save")
+    end
+
+    if B.turns() >= TURNS then
+      B.metric("save_ms", _save_ms / math.max(1, _saves))
+      B.metric("save_bytes", _save_bytes)
+      B.finish("ok")
+      return
+    end
+
+    for _ = 1, NEW_ALERTS_PER_TURN do add_alert() end
+    for _ = 1, SAVES_PER_TURN do save() end
+    crawl.do_commands({"CMD_WAIT"})
+  end)
+end
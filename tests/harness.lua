@@ -12,7 +12,8 @@ BRC.Configs.Default.to_use = "Testing"
 -- T is the harness feature module. BRC picks it up via T.BRC_FEATURE_NAME.
 T = {}
 T.BRC_FEATURE_NAME = "test-harness"
-T.timeout_turns = 20
+T.default_timeout_turns = 20
+T.timeout_turns = T.default_timeout_turns
 T._done = false
 
 -- Message capture buffer (populated by T.c_message hook)
@@ -93,15 +94,23 @@ end
 
 -- T.done(): signal test completion and quit crawl.
 -- Uses CMD_SAVE_GAME_NOW directly to bypass macro_brc_save() which would block with yesno().
+-- In batch mode, the next test is started from the ready() wrapper instead (see Batch mode).
 function T.done()
   T._done = true
+  if BRC.Config.profile_hooks and not T._batch then BRC.dump_hook_profile() end
+  if T._batch then
+    T._batch_advance = true
+    return
+  end
   crawl.do_commands({"CMD_SAVE_GAME_NOW"})
 end
 
 -- Timeout guard: if T.done() not called within T.timeout_turns, fail and quit.
+-- Turns are counted from the start of the current test (always 0, except in batch mode).
+T._start_turn = 0
 function T.ready()
   if T._done then return end
-  if you.turns() >= T.timeout_turns then
+  if you.turns() - T._start_turn >= T.timeout_turns then
     T.fail("timeout", string.format("test did not complete within %d turns", T.timeout_turns))
     T.done()
   end
@@ -132,6 +141,121 @@ function T.messages_contain(pattern)
   return false
 end
 
+---------------------------------------------------------------------------------------------------
+-- Batch mode: several tests in one crawl session (run.py --batch)
+-- The runner appends T.batch_add("<module>") after each test and T.batch_start() after the last.
+-- Only one test module is visible to BRC at a time: the others have BRC_FEATURE_NAME stashed, so
+-- register_all_features() skips them. Between tests, BRC.reset() re-registers from scratch and
+-- c_persist.BRC is restored to its value at session start.
+-- Each test's output is bracketed by "[BATCH] begin <module>" / "[BATCH] end <module>" lines.
+---------------------------------------------------------------------------------------------------
+
+local function hide_module(entry)
+  local module = _G[entry.module]
+  if module then module.BRC_FEATURE_NAME = nil end
+end
+
+local function show_module(entry)
+  local module = _G[entry.module]
+  if module then module.BRC_FEATURE_NAME = entry.feature_name end
+end
+
+-- BRC.init() re-adds BRC.autopickup on every reset; keep only the first registration
+local function dedupe_autopickup()
+  if type(chk_force_autopickup) ~= "table" then return end
+  local seen = {}
+  for i = 1, #chk_force_autopickup do
+    local func = chk_force_autopickup[i]
+    if func ~= nil and seen[func] then
+      chk_force_autopickup[i] = false
+    elseif func ~= nil then
+      seen[func] = true
+    end
+  end
+  for i = #chk_force_autopickup, 1, -1 do
+    if chk_force_autopickup[i] == false then table.remove(chk_force_autopickup, i) end
+  end
+end
+
+local function begin_test(entry)
+  T._done = false
+  T._batch_advance = false
+  T._start_turn = you.turns()
+  T.timeout_turns = entry.timeout_turns
+  T.last_messages = {}
+  show_module(entry)
+  stderr("[BATCH] begin " .. entry.module)
+end
+
+--- Called after each test's code. Captures the test's T.timeout_turns and hides its module.
+function T.batch_add(module_name)
+  local module = _G[module_name]
+  if not BRC.is_feature_module(module) then
+    stderr("[ERROR] " .. module_name .. ": not a feature module (batch)")
+    return
+  end
+  T._batch = T._batch or {}
+  T._batch[#T._batch + 1] = {
+    module = module_name,
+    feature_name = module.BRC_FEATURE_NAME,
+    timeout_turns = T.timeout_turns,
+  }
+  T.timeout_turns = T.default_timeout_turns
+  hide_module(T._batch[#T._batch])
+end
+
+--- Called after the last T.batch_add(), before BRC.init(). Makes the first test visible.
+function T.batch_start()
+  if not T._batch or #T._batch == 0 then return end
+  -- Persistent data as a fresh session starts it; each test starts from this, not the defaults
+  T._batch_data = BRC.Data.snapshot()
+  T._batch_index = 1
+  begin_test(T._batch[1])
+end
+
+--- Finish the current test and start the next one. Runs from the ready() wrapper, outside of any
+--- BRC hook dispatch, since BRC.reset() replaces the hook tables being iterated.
+function T.batch_advance()
+  if not T._batch_advance then return end
+  T._batch_advance = false
+
+  local cur = T._batch[T._batch_index]
+  if BRC.Config.profile_hooks then
+    BRC.dump_hook_profile(cur.module)
+    BRC.reset_hook_profile()
+  end
+  hide_module(cur)
+  stderr("[BATCH] end " .. cur.module)
+
+  T._batch_index = T._batch_index + 1
+  local next_entry = T._batch[T._batch_index]
+  if not next_entry then
+    crawl.do_commands({"CMD_SAVE_GAME_NOW"})
+    return
+  end
+
+  c_persist.BRC = util.copy_table(T._batch_c_persist)
+  begin_test(next_entry)
+  BRC.reset(nil, T._batch_data)
+  dedupe_autopickup()
+  -- Tests run from ready(), which BRC only dispatches once per turn
+  crawl.do_commands({"CMD_WAIT"})
+end
+
+--- Runs during BRC.init(), after the RC has defined crawl's ready(). Wrap it once so the batch can
+--- advance after BRC.ready() returns.
+function T.init()
+  if not T._batch or T._batch_ready_wrapped then return end
+  T._batch_ready_wrapped = true
+  T._batch_c_persist = util.copy_table(c_persist.BRC or {})
+
+  local crawl_ready = ready
+  ready = function(...)
+    crawl_ready(...)
+    T.batch_advance()
+  end
+end
+
 ---------------------------------------------------------------------------------------------------
 -- Wizard helpers (v2 stubs — not implemented in v1)
 ---------------------------------------------------------------------------------------------------
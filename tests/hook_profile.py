@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Aggregate BRC hook profiles into sorted tables and folded stacks.
+
+Profiles are the "[PROFILE] ..." stderr lines written by BRC.dump_hook_profile() when
+BRC.Config.profile_hooks is on. Collect them with:
+  python3 tests/run.py --profile-hooks /tmp/prof     # one .prof file per crawl session
+
+Any text file works as input (e.g. a saved crawl stderr log); other lines are ignored.
+Lines without a label= field are labeled with their file name. Times are whatever clock the
+"[PROFILE] clock=..." lines name (os.clock(): process CPU time, not wall time).
+
+Usage:
+  python3 tests/hook_profile.py /tmp/prof                        # by (hook, feature)
+  python3 tests/hook_profile.py /tmp/prof --by feature --sort max
+  python3 tests/hook_profile.py /tmp/prof --folded hooks.folded  # for flamegraph.pl
+  python3 tests/hook_profile.py /tmp/prof --per-label --top 0    # every test, every hook
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PROFILE_RE = re.compile(
+    r"^\[PROFILE\] (?:label=(?P<label>\S+) )?hook=(?P<hook>\S+) feature=(?P<feature>\S+) "
+    r"calls=(?P<calls>\d+) total_ms=(?P<total>[\d.]+) max_ms=(?P<max>[\d.]+)"
+)
+CLOCK_RE = re.compile(r"^\[PROFILE\] clock=(?P<clock>.+)$")
+GROUP_FIELDS = {
+    "hook-feature": ("hook", "feature"),
+    "feature": ("feature",),
+    "hook": ("hook",),
+}
+SORT_KEYS = {
+    "total": lambda s: s.total_ms,
+    "calls": lambda s: s.calls,
+    "max": lambda s: s.max_ms,
+    "mean": lambda s: s.mean_us,
+}
+
+
+class Sample(NamedTuple):
+    label: str
+    hook: str
+    feature: str
+    calls: int
+    total_ms: float
+    max_ms: float
+
+
+class Stats(NamedTuple):
+    key: Tuple[str, ...]
+    calls: int
+    total_ms: float
+    max_ms: float
+
+    @property
+    def mean_us(self) -> float:
+        return 1000 * self.total_ms / self.calls if self.calls else 0.0
+
+
+def iter_input_files(paths: List[Path]) -> Iterable[Path]:
+    for path in paths:
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.is_file())
+        elif path.is_file():
+            yield path
+        else:
+            sys.exit(f"ERROR: {path} not found")
+
+
+def parse_clocks(path: Path) -> List[str]:
+    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+    return [m.group("clock") for m in map(CLOCK_RE.match, lines) if m]
+
+
+def parse_samples(path: Path) -> List[Sample]:
+    samples = []
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        m = PROFILE_RE.match(line)
+        if m:
+            samples.append(Sample(
+                label=m.group("label") or path.stem,
+                hook=m.group("hook"),
+                feature=m.group("feature"),
+                calls=int(m.group("calls")),
+                total_ms=float(m.group("total")),
+                max_ms=float(m.group("max")),
+            ))
+    return samples
+
+
+def aggregate(samples: List[Sample], fields: Tuple[str, ...]) -> List[Stats]:
+    totals: Dict[Tuple[str, ...], List[float]] = {}
+    for s in samples:
+        key = tuple(getattr(s, f) for f in fields)
+        entry = totals.setdefault(key, [0, 0.0, 0.0])
+        entry[0] += s.calls
+        entry[1] += s.total_ms
+        entry[2] = max(entry[2], s.max_ms)
+    return [Stats(key, int(c), t, m) for key, (c, t, m) in totals.items()]
+
+
+def format_table(stats: List[Stats], fields: Tuple[str, ...], top: int) -> str:
+    grand_total = sum(s.total_ms for s in stats) or 1.0
+    widths = [max([len(f)] + [len(s.key[i]) for s in stats]) for i, f in enumerate(fields)]
+    header = "  ".join(f.ljust(w) for f, w in zip(fields, widths))
+    lines = [f"{header}  {'calls':>9}  {'total_ms':>11}  {'mean_us':>9}  {'max_ms':>9}  {'%':>6}"]
+    shown = stats[:top] if top > 0 else stats
+    for s in shown:
+        key = "  ".join(k.ljust(w) for k, w in zip(s.key, widths))
+        lines.append(f"{key}  {s.calls:>9}  {s.total_ms:>11.3f}  {s.mean_us:>9.1f}  "
+                     f"{s.max_ms:>9.3f}  {100 * s.total_ms / grand_total:>5.1f}%")
+    if len(shown) < len(stats):
+        lines.append(f"... {len(stats) - len(shown)} more (--top 0 to show all)")
+    return "\n".join(lines)
+
+
+def folded_stacks(samples: List[Sample], per_label: bool) -> List[str]:
+    """flamegraph.pl input: "BRC;<hook>;<feature> <microseconds>", optionally under the label."""
+    fields = ("label", "hook", "feature") if per_label else ("hook", "feature")
+    lines = []
+    for s in sorted(aggregate(samples, fields), key=lambda s: s.key):
+        micros = round(1000 * s.total_ms)
+        if micros > 0:
+            lines.append(f"{';'.join(('BRC',) + s.key)} {micros}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="Profile files or directories")
+    parser.add_argument("--by", choices=GROUP_FIELDS, default="hook-feature",
+                        help="How to group rows (default: hook-feature)")
+    parser.add_argument("--per-label", action="store_true",
+                        help="Keep each label (test or benchmark) separate")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="total", help="Sort key (default: total)")
+    parser.add_argument("--top", type=int, default=30, metavar="N",
+                        help="Rows to show (default: 30, 0 for all)")
+    parser.add_argument("--folded", type=Path, metavar="PATH",
+                        help="Also write folded stacks (flamegraph.pl / speedscope input)")
+    args = parser.parse_args(argv)
+
+    files = list(iter_input_files(args.paths))
+    samples = [s for path in files for s in parse_samples(path)]
+    if not samples:
+        print("No [PROFILE] lines found", file=sys.stderr)
+        return 1
+
+    fields = GROUP_FIELDS[args.by]
+    if args.per_label:
+        fields = ("label",) + fields
+    stats = sorted(aggregate(samples, fields), key=SORT_KEYS[args.sort], reverse=True)
+    labels = {s.label for s in samples}
+    clocks = sorted({clock for path in files for clock in parse_clocks(path)})
+    print(f"{len(samples)} samples from {len(labels)} labels, "
+          f"{sum(s.total_ms for s in stats):.1f} ms in hooks")
+    print(f"Clock: {', '.join(clocks) if clocks else 'not recorded'}\n")
+    print(format_table(stats, fields, args.top))
+
+    if args.folded:
+        args.folded.write_text("\n".join(folded_stacks(samples, args.per_label)) + "\n", encoding="utf-8")
+        print(f"\nWrote folded stacks to {args.folded}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
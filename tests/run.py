@@ -0,0 +1,829 @@
+#!/usr/bin/env python3
+"""Parallel BRC test runner.
+
+Runs tests/test_*.lua against bin/buehler.rc (or, with --standalone, smoke-tests each
+bin/standalone_features/*.rc) using the crawl console binary, one crawl process per test,
+spread across all cores.
+
+Each test gets its own temp dir (RC, logs, HOME and cwd), so runs can't see each other.
+Temp RCs are built exactly like the original shell runner: everything in buehler.rc before
+the final BRC.init() line, then harness.lua, then the test, then the rest of buehler.rc.
+Per-test character overrides come from -- @species / -- @background / -- @weapon headers.
+
+Configuration (CRAWL_BIN, FAKE_PTY_BIN, CRAWL_FLAGS, TIMEOUT_SEC) is read from
+tests/config.sh, so environment overrides work the same as before.
+
+Usage:
+  python3 tests/run.py                       # all tests, all cores
+  python3 tests/run.py test_startup          # one or more tests by name
+  python3 tests/run.py --shard 2/4           # every 4th test, starting with the 2nd
+  python3 tests/run.py --rerun-failed        # only tests that failed last run
+  python3 tests/run.py --json out.json --junit out.xml --slowest 10
+  python3 tests/run.py --standalone          # standalone feature smoke tests
+  python3 tests/run.py --batch               # experimental: many tests per crawl session (see below)
+  python3 tests/run.py --check-batch         # run tests batched and unbatched, compare results
+  python3 tests/run.py --profile-hooks DIR    # save per-hook timings (see tests/hook_profile.py)
+
+Batch mode (--batch) is experimental. It loads up to --batch-size compatible tests into one crawl session, so crawl
+startup and RC parsing are paid once per batch rather than once per test. harness.lua registers
+one test at a time, resets BRC between tests and brackets each test's output with
+"[BATCH] begin/end <module>" lines, which are used to split results back out per test.
+Tests are batched only with others that use the same character flags. A test is run on its own
+if it has a "-- @no-batch" header, or uses wizard mode, key/command injection, or turn counts,
+since those depend on a fresh game. If a batch crashes, the test that was running is reported
+as an error and the tests after it are retried in a new batch. Between tests, c_persist.BRC and
+the BRC.Data persistent variables are restored to their state at session start.
+Batch mode has so far only been checked against a stub crawl binary, not a real crawl build, so
+use the default one-test-per-session mode for results you rely on. --check-batch runs the
+selected tests both ways and fails if any test's status or result lines differ; run it against a
+real crawl build before relying on --batch.
+"""
+
+import argparse
+import json
+import os
+import queue
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent
+BUEHLER_RC = REPO_ROOT / "bin" / "buehler.rc"
+HARNESS_FILE = SCRIPT_DIR / "harness.lua"
+STANDALONE_DIR = REPO_ROOT / "bin" / "standalone_features"
+LAST_RUN_FILE = SCRIPT_DIR / ".last_run.json"
+
+RESULT_RE = re.compile(r"^\[(PASS|FAIL|ERROR)\]")
+BATCH_MARKER_RE = re.compile(r"^\[BATCH\] (begin|end) (\w+)$")
+MODULE_RE = re.compile(r"^(\w+)\.BRC_FEATURE_NAME\s*=", re.MULTILINE)
+# Tests that need a fresh game: wizard mode, injected keys/commands, or absolute turn counts
+BATCH_UNSAFE_RE = re.compile(r"^-- @no-batch\b|T\.wizard_|sendkeys|do_commands|you\.turns\(\)",
+                             re.MULTILINE)
+DEFAULT_BATCH_SIZE = 25
+# Appended to harness.lua by --profile-hooks; harness.lua dumps the profile when each test ends
+PROFILE_HOOKS_LUA = "BRC.Configs.Default.profile_hooks = true\n"
+PROFILE_LINE_PREFIX = "[PROFILE] "
+HEADER_OVERRIDES = {
+    # header tag -> (flag pattern, replacement template); mirrors the sed calls in run.sh
+    "species": (r"-species [^ ]*", "-species {}"),
+    "background": (r"-background [^ ]*", "-background {}"),
+    "weapon": (r"weapon=[^ ]*", "weapon={}"),
+}
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+class Config(NamedTuple):
+    crawl_bin: Path
+    fake_pty_bin: Path
+    crawl_flags: str
+    timeout_sec: float
+
+
+def load_config() -> Config:
+    """Source tests/config.sh in bash so its defaults and env overrides stay the single source."""
+    script = 'REPO_ROOT="$1"; source "$2"; printf "%s\\0" "$CRAWL_BIN" "$FAKE_PTY_BIN" "$CRAWL_FLAGS" "$TIMEOUT_SEC"'
+    out = subprocess.run(
+        ["bash", "-c", script, "_", str(REPO_ROOT), str(SCRIPT_DIR / "config.sh")],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    crawl_bin, fake_pty_bin, crawl_flags, timeout_sec = out.split("\0")[:4]
+    return Config(
+        crawl_bin=(REPO_ROOT / crawl_bin).resolve(),
+        fake_pty_bin=(REPO_ROOT / fake_pty_bin).resolve(),
+        crawl_flags=crawl_flags,
+        timeout_sec=float(timeout_sec),
+    )
+
+
+def check_prerequisites(config: Config) -> None:
+    if not os.access(config.crawl_bin, os.X_OK):
+        sys.exit(f"ERROR: crawl binary not found or not executable at: {config.crawl_bin}\n"
+                 "  Set CRAWL_BIN=/path/to/crawl-console or build crawl first.")
+    if not os.access(config.fake_pty_bin, os.X_OK):
+        sys.exit(f"ERROR: fake_pty not found or not executable at: {config.fake_pty_bin}\n"
+                 "  Build crawl first (fake_pty is built alongside crawl in crawl-ref/source/util/).")
+
+
+def build_rc() -> None:
+    """Regenerate explicit.lua, message-patterns.lua and buehler.rc from current source."""
+    for script in ("generate_explicit_config.py", "compile_message_filters.py", "concat_rc.py"):
+        subprocess.run([sys.executable, str(REPO_ROOT / "build" / script)], check=True,
+                       stdout=subprocess.DEVNULL)
+
+
+# =============================================================================
+# Test cases
+# =============================================================================
+
+class TestCase(NamedTuple):
+    name: str
+    rc_text: str
+    flags: List[str]
+    source: str = ""  # Test file contents (batch mode)
+
+
+class TestResult(NamedTuple):
+    name: str
+    status: str  # "pass", "fail", "error" or "timeout"
+    duration: float
+    exit_code: Optional[int]
+    lines: List[str]  # [PASS]/[FAIL]/[ERROR] lines, or stderr tail when there are none
+
+
+def apply_header_overrides(flags: str, test_text: str) -> str:
+    """Apply -- @species / -- @background / -- @weapon header comments to the crawl flags."""
+    for tag, (pattern, replacement) in HEADER_OVERRIDES.items():
+        match = re.search(rf"^-- @{tag} (.*)$", test_text, re.MULTILINE)
+        if match:
+            flags = re.sub(pattern, replacement.format(match.group(1)), flags, count=1)
+    return flags
+
+
+def split_at_init(rc_text: str) -> Tuple[str, str]:
+    """Split buehler.rc before its last standalone BRC.init() line (the injection point)."""
+    lines = rc_text.splitlines(keepends=True)
+    init_lines = [i for i, line in enumerate(lines) if line.rstrip("\n") == "BRC.init()"]
+    if not init_lines:
+        sys.exit("ERROR: Could not find 'BRC.init()' line in bin/buehler.rc")
+    split = init_lines[-1]
+    return "".join(lines[:split]), "".join(lines[split:])
+
+
+def _ensure_newline(text: str) -> str:
+    return text if not text or text.endswith("\n") else text + "\n"
+
+
+def load_harness(profile_hooks: bool = False) -> str:
+    harness = HARNESS_FILE.read_text(encoding="utf-8")
+    if profile_hooks:
+        harness = _ensure_newline(harness) + PROFILE_HOOKS_LUA
+    return harness
+
+
+def discover_tests(names: List[str], config: Config, profile_hooks: bool = False) -> List[TestCase]:
+    if names:
+        files = []
+        for name in names:
+            path = SCRIPT_DIR / f"{name}.lua"
+            if not path.is_file():
+                sys.exit(f"ERROR: Test file not found: {path}")
+            files.append(path)
+    else:
+        files = sorted(SCRIPT_DIR.glob("test_*.lua"))
+
+    head, tail = split_at_init(BUEHLER_RC.read_text(encoding="utf-8"))
+    harness = load_harness(profile_hooks)
+    cases = []
+    for path in files:
+        test_text = path.read_text(encoding="utf-8")
+        # Same byte layout as `head; cat harness; cat test; tail` in the shell runner
+        rc_text = head + harness + test_text + tail
+        flags = apply_header_overrides(config.crawl_flags, test_text)
+        cases.append(TestCase(path.stem, rc_text, flags.split(), test_text))
+    return cases
+
+
+# -----------------------------------------------------------------------------
+# Standalone smoke tests
+# -----------------------------------------------------------------------------
+
+SMOKE_HEADER = """\
+-- BRC Standalone Smoke Harness
+-- Injected before feature content. Provides _sa_done() for clean exit.
+local _smoke_turn = 0
+local _smoke_done = false
+local function _sa_done()
+  if not _smoke_done then
+    _smoke_done = true
+    crawl.do_commands({"CMD_SAVE_GAME_NOW"})
+  end
+end
+"""
+
+SMOKE_TAIL = """\
+-- Smoke wrappers injected after feature content
+
+-- Wrap ready(): run 3 clean turns then PASS, or catch errors and FAIL.
+-- If the feature has no ready(), _orig_ready is nil and we just count turns.
+local _orig_ready = ready
+local _smoke_last_turn = -1
+function ready(...)
+  if _smoke_done then return end
+  if you.turns() >= 20 then
+    crawl.stderr("[FAIL] {name}: timed out after 20 turns")
+    _sa_done()
+    return
+  end
+  -- One count per game turn (mirrors the standalone feature's own turn guard)
+  if you.turns() <= _smoke_last_turn then return end
+  _smoke_last_turn = you.turns()
+  if _orig_ready then
+    local ok, err = pcall(_orig_ready, ...)
+    if not ok then
+      crawl.stderr("[FAIL] {name}: ready() error: " .. tostring(err))
+      _sa_done()
+      return
+    end
+  end
+  _smoke_turn = _smoke_turn + 1
+  if _smoke_turn >= 3 then
+    crawl.stderr("[PASS] {name}: loaded and ran 3 turns without error")
+    _sa_done()
+  else
+    -- Advance to next turn so ready() fires again (game waits for input otherwise)
+    crawl.do_commands({{"CMD_WAIT"}})
+  end
+end
+
+-- Wrap c_answer_prompt: answer save/quit prompts after _sa_done(), delegate rest to feature.
+local _orig_cap = c_answer_prompt
+function c_answer_prompt(prompt)
+  if _smoke_done then
+    local p = prompt:lower()
+    if p:find("save") or p:find("quit") or p:find("leave") or p:find("exit") then
+      return true
+    end
+  end
+  if _orig_cap then return _orig_cap(prompt) end
+end
+"""
+
+
+def extract_feature_body(rc_path: Path) -> str:
+    """Lua body of a standalone .rc: drop the ## header, the opening { line and the closing } line."""
+    lines = rc_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    try:
+        open_line = next(i for i, line in enumerate(lines) if line.rstrip("\n") == "{")
+    except StopIteration:
+        sys.exit(f"ERROR: no opening {{ found in {rc_path}")
+    return "".join(lines[open_line + 1:-1])
+
+
+def discover_standalone(names: List[str], config: Config) -> List[TestCase]:
+    if not STANDALONE_DIR.is_dir():
+        sys.exit(f"ERROR: {STANDALONE_DIR} not found. "
+                 "Run 'python3 build/create_standalone_features.py' first.")
+    if names:
+        files = []
+        for name in names:
+            path = STANDALONE_DIR / f"{name}.rc"
+            if not path.is_file():
+                sys.exit(f"ERROR: {path} not found")
+            files.append(path)
+    else:
+        files = sorted(STANDALONE_DIR.glob("*.rc"))
+
+    cases = []
+    for path in files:
+        body = _ensure_newline(extract_feature_body(path))
+        rc_text = "{\n" + SMOKE_HEADER + body + SMOKE_TAIL.format(name=path.stem) + "}\n"
+        cases.append(TestCase(path.stem, rc_text, config.crawl_flags.split()))
+    return cases
+
+
+# =============================================================================
+# Execution
+# =============================================================================
+
+def select_shard(cases: List[TestCase], shard: str) -> List[TestCase]:
+    """Keep every n-th test starting at i for --shard i/n (1-based)."""
+    match = re.fullmatch(r"(\d+)/(\d+)", shard)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        sys.exit(f"ERROR: --shard must be i/n with 1 <= i <= n, got {shard!r}")
+    index, count = int(match.group(1)) - 1, int(match.group(2))
+    return cases[index::count]
+
+
+def _isolate_name(flags: List[str], slot: int) -> List[str]:
+    """Give each concurrent crawl its own character name, so save/lock files can't collide."""
+    flags = list(flags)
+    if "-name" in flags:
+        i = flags.index("-name") + 1
+        if i < len(flags):
+            flags[i] = f"{flags[i]}{slot}"
+    return flags
+
+
+def save_profile(stderr_lines: List[str], path: Path) -> None:
+    """Keep the [PROFILE] lines of a crawl session's stderr, for tests/hook_profile.py."""
+    lines = [line for line in stderr_lines if line.startswith(PROFILE_LINE_PREFIX)]
+    if lines:
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def run_case(case: TestCase, config: Config, work_root: Path, slots: Optional["queue.Queue[int]"],
+             profile_dir: Optional[Path] = None) -> TestResult:
+    work_dir = work_root / case.name
+    work_dir.mkdir(parents=True, exist_ok=True)
+    rc_path = work_dir / f"{case.name}.rc"
+    rc_path.write_text(case.rc_text, encoding="utf-8")
+
+    slot = slots.get() if slots else None
+    try:
+        flags = _isolate_name(case.flags, slot) if slot is not None else case.flags
+        result = _run_crawl(case.name, flags, rc_path, config)
+    finally:
+        if slots:
+            slots.put(slot)
+    if profile_dir:
+        stderr_lines = (work_dir / "stderr").read_text(encoding="utf-8", errors="replace").splitlines()
+        save_profile(stderr_lines, profile_dir / f"{case.name}.prof")
+    return result
+
+
+def _run_crawl(name: str, flags: List[str], rc_path: Path, config: Config) -> TestResult:
+    stderr_lines, exit_code, timed_out, duration = run_session(flags, rc_path, config)
+    return classify(name, stderr_lines, exit_code, timed_out, duration)
+
+
+def run_session(flags: List[str], rc_path: Path,
+                config: Config) -> Tuple[List[str], Optional[int], bool, float]:
+    """Run one crawl session with rc_path, in rc_path's directory.
+
+    Returns:
+        (stderr lines, exit code or None on timeout, timed out, seconds)
+    """
+    work_dir = rc_path.parent
+    cmd = [str(config.fake_pty_bin), str(config.crawl_bin), *flags, "-rc", str(rc_path)]
+    env = dict(os.environ, HOME=str(work_dir))
+
+    start = time.perf_counter()
+    with open(work_dir / "stdout", "wb") as out, open(work_dir / "stderr", "wb") as err:
+        # fake_pty provides a PTY for stdin/stdout; stderr (crawl.stderr output) passes through
+        proc = subprocess.Popen(cmd, stdout=out, stderr=err, stdin=subprocess.DEVNULL,
+                                cwd=work_dir, env=env, start_new_session=True)
+        try:
+            exit_code: Optional[int] = proc.wait(timeout=config.timeout_sec)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            exit_code, timed_out = None, True
+    duration = time.perf_counter() - start
+
+    stderr_lines = (work_dir / "stderr").read_text(encoding="utf-8", errors="replace").splitlines()
+    return stderr_lines, exit_code, timed_out, duration
+
+
+def classify(name: str, stderr_lines: List[str], exit_code: Optional[int], timed_out: bool,
+             duration: float) -> TestResult:
+    result_lines = [line for line in stderr_lines if RESULT_RE.match(line)]
+    if not result_lines:
+        # No result lines: crash, hang, or timeout
+        status = "timeout" if timed_out else "error"
+        return TestResult(name, status, duration, exit_code, stderr_lines[-20:])
+    failed = any(not line.startswith("[PASS]") for line in result_lines)
+    return TestResult(name, "fail" if failed else "pass", duration, exit_code, result_lines)
+
+
+def format_result(result: TestResult, timeout_sec: float) -> str:
+    if result.status == "timeout":
+        return f"[TIMEOUT] {result.name}: no result within {timeout_sec:g}s"
+    if result.status == "error":
+        text = f"[ERROR] {result.name}: no result lines (exit code {result.exit_code})"
+        if result.lines:
+            text += "\n  --- stderr ---\n" + "\n".join(f"  {line}" for line in result.lines)
+        return text
+    return "\n".join(f"  {line}" for line in result.lines)
+
+
+def run_all(cases: List[TestCase], config: Config, jobs: int,
+            profile_dir: Optional[Path] = None) -> List[TestResult]:
+    """Run cases on a pool of `jobs` crawl processes; print each result as it finishes."""
+    jobs = max(1, jobs)
+    work_root = Path(tempfile.mkdtemp(prefix="brc-tests-"))
+    results: Dict[str, TestResult] = {}
+    slots: Optional["queue.Queue[int]"] = None
+    if jobs > 1:
+        slots = queue.Queue()
+        for slot in range(jobs):
+            slots.put(slot)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(run_case, case, config, work_root, slots, profile_dir)
+                       for case in cases]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result.name] = result
+                print(format_result(result, config.timeout_sec), flush=True)
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    return [results[case.name] for case in cases]
+
+
+# -----------------------------------------------------------------------------
+# Batch mode
+# -----------------------------------------------------------------------------
+
+class Batch(NamedTuple):
+    cases: List[TestCase]
+    modules: List[str]  # Test module global for each case, same order
+
+
+def batch_module(case: TestCase) -> Optional[str]:
+    """Module name to batch a test under, or None if it must run in its own session."""
+    if BATCH_UNSAFE_RE.search(case.source):
+        return None
+    modules = MODULE_RE.findall(case.source)
+    return modules[0] if len(modules) == 1 else None
+
+
+def plan_batches(cases: List[TestCase], batch_size: int) -> Tuple[List[Batch], List[TestCase]]:
+    """Group batchable tests by crawl flags into batches of at most batch_size.
+
+    Returns:
+        (batches, tests to run individually)
+    """
+    groups: Dict[Tuple[str, ...], List[Tuple[TestCase, str]]] = {}
+    single = []
+    for case in cases:
+        module = batch_module(case)
+        if module is None:
+            single.append(case)
+        else:
+            groups.setdefault(tuple(case.flags), []).append((case, module))
+
+    batches = []
+    for members in groups.values():
+        for i in range(0, len(members), max(1, batch_size)):
+            chunk = members[i:i + batch_size]
+            if len(chunk) == 1:
+                single.append(chunk[0][0])
+            else:
+                batches.append(Batch([c for c, _ in chunk], [m for _, m in chunk]))
+    return batches, single
+
+
+def compose_batch_rc(batch: Batch, head: str, harness: str, tail: str) -> str:
+    """head + harness + each test in its own do-block + batch calls + tail.
+
+    The do ... end keeps each test's locals out of the next test's scope.
+    """
+    parts = [head, harness]
+    for case, module in zip(batch.cases, batch.modules):
+        parts.append(f"do\n{_ensure_newline(case.source)}end\n")
+        parts.append(f'T.batch_add("{module}")\n')
+    parts.append("T.batch_start()\n")
+    parts.append(tail)
+    return "".join(parts)
+
+
+def split_batch_output(batch: Batch, stderr_lines: List[str], marks: Dict[str, List[float]],
+                       exit_code: Optional[int], timed_out: bool) -> Tuple[List[TestResult], Batch]:
+    """Attribute batch stderr to tests using the [BATCH] markers.
+
+    Args:
+        marks: module -> [begin time, end time] (seconds since start, as seen by the runner)
+
+    Returns:
+        (results for tests that started, Batch of tests that never started)
+    """
+    segments: Dict[str, List[str]] = {}
+    current = None
+    for line in stderr_lines:
+        marker = BATCH_MARKER_RE.match(line)
+        if marker:
+            current = marker.group(2) if marker.group(1) == "begin" else None
+            if current:
+                segments.setdefault(current, [])
+        elif current:
+            segments[current].append(line)
+
+    results = []
+    remaining = Batch([], [])
+    for case, module in zip(batch.cases, batch.modules):
+        if module not in segments:
+            remaining.cases.append(case)
+            remaining.modules.append(module)
+            continue
+        times = marks.get(module, [])
+        duration = times[1] - times[0] if len(times) == 2 else 0.0
+        finished = len(times) == 2
+        if finished:
+            # The session was still running when this test ended, so it has no exit code
+            result = classify(case.name, segments[module], None, False, duration)
+        else:
+            # Started but never ended: this test crashed or hung the session
+            result = classify(case.name, segments[module], exit_code, timed_out, duration)
+            if result.status == "pass":
+                result = TestResult(case.name, "error", duration, exit_code,
+                                    result.lines + ["crawl exited before the test finished"])
+        results.append(result)
+    return results, remaining
+
+
+def _run_batch_crawl(batch: Batch, flags: List[str], rc_path: Path,
+                     config: Config) -> Tuple[List[str], Dict[str, List[float]], Optional[int], bool]:
+    """Run one batch session. The timeout applies per test: each begin marker restarts it."""
+    work_dir = rc_path.parent
+    cmd = [str(config.fake_pty_bin), str(config.crawl_bin), *flags, "-rc", str(rc_path)]
+    env = dict(os.environ, HOME=str(work_dir))
+    stderr_path = work_dir / "stderr"
+    marks: Dict[str, List[float]] = {}
+
+    start = time.perf_counter()
+    deadline = start + config.timeout_sec
+    timed_out = False
+    read_pos = 0
+    pending = ""
+    with open(work_dir / "stdout", "wb") as out, open(stderr_path, "wb") as err:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=err, stdin=subprocess.DEVNULL,
+                                cwd=work_dir, env=env, start_new_session=True)
+        while True:
+            exit_code = proc.poll()
+            with open(stderr_path, "rb") as f:
+                f.seek(read_pos)
+                chunk = f.read()
+            read_pos += len(chunk)
+            pending += chunk.decode("utf-8", errors="replace")
+            *complete, pending = pending.split("\n")
+            now = time.perf_counter()
+            for line in complete:
+                marker = BATCH_MARKER_RE.match(line)
+                if marker:
+                    marks.setdefault(marker.group(2), []).append(now - start)
+                    if marker.group(1) == "begin":
+                        deadline = now + config.timeout_sec
+            if exit_code is not None:
+                break
+            if now >= deadline:
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+                exit_code, timed_out = None, True
+                break
+            time.sleep(0.02)
+
+    stderr_lines = stderr_path.read_text(encoding="utf-8", errors="replace").splitlines()
+    return stderr_lines, marks, exit_code, timed_out
+
+
+def run_batch(batch: Batch, head: str, harness: str, tail: str, config: Config, work_root: Path,
+              slots: Optional["queue.Queue[int]"], profile_dir: Optional[Path] = None) -> List[TestResult]:
+    """Run a batch, retrying tests that never started after a crash in a new session."""
+    results: List[TestResult] = []
+    attempt = 0
+    while batch.cases:
+        attempt += 1
+        name = f"batch-{batch.cases[0].name}-{attempt}"
+        work_dir = work_root / name
+        work_dir.mkdir(parents=True, exist_ok=True)
+        rc_path = work_dir / f"{name}.rc"
+        rc_path.write_text(compose_batch_rc(batch, head, harness, tail), encoding="utf-8")
+
+        slot = slots.get() if slots else None
+        try:
+            flags = batch.cases[0].flags
+            flags = _isolate_name(flags, slot) if slot is not None else flags
+            stderr_lines, marks, exit_code, timed_out = _run_batch_crawl(batch, flags, rc_path, config)
+        finally:
+            if slots:
+                slots.put(slot)
+
+        if profile_dir:
+            save_profile(stderr_lines, profile_dir / f"{name}.prof")
+        done, batch = split_batch_output(batch, stderr_lines, marks, exit_code, timed_out)
+        if not done:
+            # Nothing started (e.g. a Lua error while loading the RC): fall back to one per session
+            for case in batch.cases:
+                results.append(run_case(case, config, work_root, slots, profile_dir))
+            break
+        results.extend(done)
+    return results
+
+
+def compare_batched(single: List[TestResult], batched: List[TestResult]) -> List[str]:
+    """Differences between unbatched and batched results for the same tests."""
+    differences = []
+    for a, b in zip(single, batched):
+        if a.status != b.status:
+            differences.append(f"{a.name}: {a.status} unbatched, {b.status} batched")
+        elif a.status in ("pass", "fail") and a.lines != b.lines:
+            differences.append(f"{a.name}: result lines differ\n"
+                               + "\n".join(f"  - {line}" for line in a.lines if line not in b.lines)
+                               + "\n"
+                               + "\n".join(f"  + {line}" for line in b.lines if line not in a.lines))
+    return differences
+
+
+def run_all_batched(cases: List[TestCase], config: Config, jobs: int, batch_size: int,
+                    profile_dir: Optional[Path] = None) -> List[TestResult]:
+    """Like run_all(), but compatible tests share crawl sessions."""
+    jobs = max(1, jobs)
+    batches, single = plan_batches(cases, batch_size)
+    head, tail = split_at_init(BUEHLER_RC.read_text(encoding="utf-8"))
+    harness = _ensure_newline(load_harness(profile_dir is not None))
+    work_root = Path(tempfile.mkdtemp(prefix="brc-tests-"))
+    results: Dict[str, TestResult] = {}
+    slots: Optional["queue.Queue[int]"] = None
+    if jobs > 1:
+        slots = queue.Queue()
+        for slot in range(jobs):
+            slots.put(slot)
+    print(f"Batch mode: {sum(len(b.cases) for b in batches)} tests in {len(batches)} sessions, "
+          f"{len(single)} run individually", flush=True)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # Largest batches first, so a long session doesn't start last
+            futures = [pool.submit(run_batch, batch, head, harness, tail, config, work_root, slots,
+                                   profile_dir)
+                       for batch in sorted(batches, key=lambda b: len(b.cases), reverse=True)]
+            futures += [pool.submit(lambda c: [run_case(c, config, work_root, slots, profile_dir)], case)
+                        for case in single]
+            for future in as_completed(futures):
+                for result in future.result():
+                    results[result.name] = result
+                    print(format_result(result, config.timeout_sec), flush=True)
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    return [results[case.name] for case in cases]
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def write_json(path: Path, suite: str, results: List[TestResult], duration: float) -> None:
+    counts = {status: sum(r.status == status for r in results)
+              for status in ("pass", "fail", "error", "timeout")}
+    report = {
+        "suite": suite,
+        "total": len(results),
+        "passed": counts["pass"],
+        "failed": counts["fail"],
+        "errors": counts["error"] + counts["timeout"],
+        "duration": round(duration, 3),
+        "tests": [
+            {"name": r.name, "status": r.status, "duration": round(r.duration, 3),
+             "exit_code": r.exit_code, "lines": r.lines}
+            for r in results
+        ],
+    }
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def write_junit(path: Path, suite: str, results: List[TestResult], duration: float) -> None:
+    testsuite = ET.Element("testsuite", {
+        "name": suite,
+        "tests": str(len(results)),
+        "failures": str(sum(r.status == "fail" for r in results)),
+        "errors": str(sum(r.status in ("error", "timeout") for r in results)),
+        "time": f"{duration:.3f}",
+    })
+    for r in results:
+        case = ET.SubElement(testsuite, "testcase",
+                             {"classname": suite, "name": r.name, "time": f"{r.duration:.3f}"})
+        if r.status == "fail":
+            failures = [line for line in r.lines if not line.startswith("[PASS]")]
+            ET.SubElement(case, "failure", {"message": failures[0]}).text = "\n".join(r.lines)
+        elif r.status in ("error", "timeout"):
+            message = "timeout" if r.status == "timeout" else f"no result lines (exit code {r.exit_code})"
+            ET.SubElement(case, "error", {"message": message}).text = "\n".join(r.lines)
+    ET.ElementTree(testsuite).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def print_slowest(results: List[TestResult], count: int) -> None:
+    if count <= 0 or not results:
+        return
+    print(f"\nSlowest {min(count, len(results))} tests:")
+    for r in sorted(results, key=lambda r: r.duration, reverse=True)[:count]:
+        print(f"  {r.duration:7.2f}s  {r.name}")
+
+
+def load_last_failed(suite: str) -> Optional[List[str]]:
+    try:
+        last_run = json.loads(LAST_RUN_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return last_run.get(suite, {}).get("failed")
+
+
+def save_last_run(suite: str, results: List[TestResult]) -> None:
+    """Update the failed list: tests run now replace their old status, others keep it."""
+    try:
+        last_run = json.loads(LAST_RUN_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        last_run = {}
+    ran = {r.name for r in results}
+    failed = [name for name in last_run.get(suite, {}).get("failed", []) if name not in ran]
+    failed.extend(r.name for r in results if r.status != "pass")
+    last_run[suite] = {"failed": sorted(failed)}
+    LAST_RUN_FILE.write_text(json.dumps(last_run, indent=2) + "\n", encoding="utf-8")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run BRC tests against the crawl console binary.")
+    parser.add_argument("tests", nargs="*", help="Test names without .lua (default: all test_*.lua)")
+    parser.add_argument("--standalone", action="store_true",
+                        help="Smoke-test bin/standalone_features/*.rc instead")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Concurrent crawl processes (default: all cores)")
+    parser.add_argument("--shard", metavar="I/N", help="Run only shard I of N (1-based)")
+    parser.add_argument("--rerun-failed", action="store_true",
+                        help="Run only the tests that failed on the previous run")
+    parser.add_argument("--slowest", type=int, default=5, metavar="N",
+                        help="Report the N slowest tests (default: 5, 0 to disable)")
+    parser.add_argument("--json", type=Path, metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--junit", type=Path, metavar="PATH", help="Write results as JUnit XML")
+    parser.add_argument("--no-build", action="store_true", help="Don't rebuild buehler.rc first")
+    parser.add_argument("--batch", action="store_true",
+                        help="Experimental: run compatible tests several per crawl session (so "
+                             "far only checked against a stub crawl binary)")
+    parser.add_argument("--check-batch", action="store_true",
+                        help="Run the tests unbatched and with --batch; fail if results differ")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, metavar="N",
+                        help=f"Max tests per batch session (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--profile-hooks", type=Path, metavar="DIR",
+                        help="Turn on BRC hook profiling and save each session's timings in DIR")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    suite = "standalone" if args.standalone else "tests"
+
+    if not args.standalone and not args.no_build:
+        build_rc()
+    config = load_config()
+    check_prerequisites(config)
+
+    names = args.tests
+    if args.rerun_failed:
+        last_failed = load_last_failed(suite)
+        if last_failed is None:
+            print("No previous run recorded; running all tests.")
+        elif not last_failed:
+            print("No failed tests in the previous run.")
+            return 0
+        else:
+            names = [n for n in last_failed if not names or n in names]
+
+    if args.standalone:
+        cases = discover_standalone(names, config)
+    else:
+        cases = discover_tests(names, config, profile_hooks=args.profile_hooks is not None)
+    if args.shard:
+        cases = select_shard(cases, args.shard)
+    if not cases:
+        print("No tests selected", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    profile_dir = args.profile_hooks if not args.standalone else None
+    if profile_dir:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+    if args.check_batch and not args.standalone:
+        print("Unbatched run:", flush=True)
+        results = run_all(cases, config, args.jobs, profile_dir)
+        print("\nBatched run:", flush=True)
+        batched = run_all_batched(cases, config, args.jobs, args.batch_size, profile_dir)
+        differences = compare_batched(results, batched)
+        print("")
+        if differences:
+            print(f"Batch check: {len(differences)} of {len(results)} tests differ when batched")
+            print("\n".join(differences))
+            return 1
+        print(f"Batch check: all {len(results)} tests match")
+    elif args.batch and not args.standalone:
+        print("Note: --batch is experimental (see tests/run.py --help)", flush=True)
+        results = run_all_batched(cases, config, args.jobs, args.batch_size, profile_dir)
+    else:
+        results = run_all(cases, config, args.jobs, profile_dir)
+    duration = time.perf_counter() - start
+
+    save_last_run(suite, results)
+    if args.json:
+        write_json(args.json, suite, results, duration)
+    if args.junit:
+        write_junit(args.junit, suite, results, duration)
+    print_slowest(results, args.slowest)
+
+    passed = sum(r.status == "pass" for r in results)
+    print("")
+    print("────────────────────────────────────────")
+    label = "Standalone smoke" if args.standalone else "Results"
+    print(f"{label}: {passed}/{len(results)} passed ({duration:.1f}s, {args.jobs} jobs)")
+    if passed != len(results):
+        print("FAILED")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
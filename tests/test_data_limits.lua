@@ -0,0 +1,70 @@
+---------------------------------------------------------------------------------------------------
+-- BRC feature test: data-manager limits and compact encoding
+-- Verifies that size-limited persistent variables are trimmed when chk_lua_save runs (lists keep
+-- their newest entries, maps their most recently touched keys), and that the compact encoding
+-- writes what a restore needs. Also covers a save from before the limit: keys with no recorded
+-- age are dropped first, in key order, and keys touched since are kept.
+---------------------------------------------------------------------------------------------------
+
+test_data_limits = {}
+test_data_limits.BRC_FEATURE_NAME = "test-data-limits"
+
+test_data_limits_list = BRC.Data.persist("test_data_limits_list", {}, 3)
+test_data_limits_map = BRC.Data.persist("test_data_limits_map", {}, 3)
+test_data_limits_migrated = BRC.Data.persist("test_data_limits_migrated", {}, 3)
+
+function test_data_limits.ready()
+  if T._done then return end
+
+  T.run("data-limits", function()
+    -- Compact encoding
+    T.eq(BRC.Data.encode({ 1, 2, "a" }), '{1,2,"a",}', "encode-list")
+    T.eq(BRC.Data.encode({ ac = 3 }), "{ac=3,}", "encode-map")
+    T.eq(BRC.Data.encode({ ["end"] = true }), '{["end"]=true,}', "encode-keyword-key")
+    T.eq(BRC.Data.encode({ [5] = "x" }), '{[5]="x",}', "encode-number-key")
+    T.eq(BRC.Data.encode('say "hi"'), '"say \\"hi\\""', "encode-quotes-kept")
+
+    -- Fill past the limits; touch some map keys so they're kept over untouched ones
+    for i = 1, 5 do
+      test_data_limits_list[#test_data_limits_list + 1] = i
+    end
+    for _, k in ipairs({ "a", "b", "c", "d", "e" }) do
+      test_data_limits_map[k] = 1
+    end
+    BRC.Data.touch("test_data_limits_map", "a")
+    BRC.Data.touch("test_data_limits_map", "b")
+
+    -- Migrated save: keys restored without ages, then new keys touched after the upgrade
+    brc_persist_ages.test_data_limits_migrated = nil
+    for _, k in ipairs({ "z", "y", "x" }) do
+      test_data_limits_migrated[k] = 1
+    end
+    for _, k in ipairs({ "a", "b" }) do
+      test_data_limits_migrated[k] = 1
+      BRC.Data.touch("test_data_limits_migrated", k)
+    end
+
+    local saved = BRC.txt.serialize_chk_lua_save()
+
+    T.eq(#test_data_limits_list, 3, "list-trimmed")
+    T.eq(test_data_limits_list[1], 3, "list-keeps-newest")
+    T.eq(test_data_limits_list[3], 5, "list-keeps-last")
+
+    local keys = {}
+    for k, _ in pairs(test_data_limits_map) do keys[#keys + 1] = k end
+    table.sort(keys)
+    T.eq(table.concat(keys, ","), "a,b,e", "map-keeps-touched")
+
+    keys = {}
+    for k, _ in pairs(test_data_limits_migrated) do keys[#keys + 1] = k end
+    table.sort(keys)
+    T.eq(table.concat(keys, ","), "a,b,z", "migrated-untouched-dropped-first")
+    T.true_(brc_persist_ages.test_data_limits_migrated.a ~= nil, "migrated-touched-key-aged")
+
+    T.contains(saved, "_brc_persist_restore_table.test_data_limits_list = {3,4,5,}", "list-saved")
+    T.contains(saved, "_brc_persist_restore_table.brc_persist_ages = ", "ages-saved")
+
+    T.pass("data-limits")
+    T.done()
+  end)
+end
@@ -0,0 +1,45 @@
+---------------------------------------------------------------------------------------------------
+-- BRC feature test: data-manager snapshots
+-- Verifies that BRC.Data.reset(snapshot) puts persistent variables back to their snapshot values
+-- (which run.py --batch uses between tests), and that the snapshot is a copy, not a reference.
+---------------------------------------------------------------------------------------------------
+
+test_data_snapshot = {}
+test_data_snapshot.BRC_FEATURE_NAME = "test-data-snapshot"
+
+test_data_snapshot_table = BRC.Data.persist("test_data_snapshot_table", { a = 1 })
+test_data_snapshot_count = BRC.Data.persist("test_data_snapshot_count", 0)
+
+function test_data_snapshot.ready()
+  if T._done then return end
+
+  T.run("data-snapshot", function()
+    test_data_snapshot_table.b = 2
+    test_data_snapshot_count = 5
+    local snapshot = BRC.Data.snapshot()
+
+    -- Changes after the snapshot must not leak into it
+    test_data_snapshot_table.c = 3
+    test_data_snapshot_count = 9
+    T.eq(snapshot.test_data_snapshot_table.c, nil, "snapshot-is-copy")
+
+    BRC.Data.reset(snapshot)
+    T.eq(test_data_snapshot_table.b, 2, "table-restored")
+    T.eq(test_data_snapshot_table.c, nil, "table-change-dropped")
+    T.eq(test_data_snapshot_count, 5, "value-restored")
+
+    -- Restoring twice from the same snapshot gives the same values
+    test_data_snapshot_table.d = 4
+    BRC.Data.reset(snapshot)
+    T.eq(test_data_snapshot_table.d, nil, "snapshot-reusable")
+
+    -- Without a snapshot, back to the defaults
+    BRC.Data.reset()
+    T.eq(test_data_snapshot_table.b, nil, "defaults-restored")
+    T.eq(test_data_snapshot_table.a, 1, "default-table-value")
+    T.eq(test_data_snapshot_count, 0, "default-value")
+
+    T.pass("data-snapshot")
+    T.done()
+  end)
+end
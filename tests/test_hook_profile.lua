@@ -0,0 +1,37 @@
+---------------------------------------------------------------------------------------------------
+-- BRC core test: hook profiling
+-- Verifies that with BRC.Config.profile_hooks on, feature hooks are timed per (hook, feature)
+-- and reported by BRC.format_hook_profile() and BRC.dump().
+---------------------------------------------------------------------------------------------------
+
+-- @no-batch
+test_hook_profile = {}
+test_hook_profile.BRC_FEATURE_NAME = "test-hook-profile"
+
+-- Hooks are wrapped when features register, so this must be on before BRC.init()
+BRC.Configs.Default.profile_hooks = true
+
+local init_calls = 0
+function test_hook_profile.init()
+  init_calls = init_calls + 1
+end
+
+function test_hook_profile.ready()
+  if T._done then return end
+
+  T.run("hook-profile", function()
+    T.true_(BRC.Config.profile_hooks, "profiling-enabled")
+    T.eq(init_calls, 1, "wrapped-init-ran-once")
+
+    local report = BRC.format_hook_profile()
+    T.contains(report, "init%s+test%-hook%-profile%s+1%s", "init-hook-counted")
+    T.contains(BRC.dump(false, true), "Hook profile:", "profile-in-dump")
+    T.contains(report, "os%.clock%(%) process CPU time", "profile-names-clock")
+
+    BRC.reset_hook_profile()
+    T.false_(BRC.format_hook_profile():find("test%-hook%-profile"), "reset-clears-profile")
+
+    T.pass("hook-profile")
+    T.done()
+  end)
+end
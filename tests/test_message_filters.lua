@@ -0,0 +1,205 @@
+---------------------------------------------------------------------------------------------------
+-- BRC feature test: message filters
+-- Verifies that BRC.opt.combine_patterns() (using the groups from build/compile_message_filters.py)
+-- mutes / force_mores exactly the messages the original pattern lists do. Replays a recorded
+-- message log through each list, once pattern by pattern and once with the combined patterns.
+-- Also compiles each combined regex on its own, since crawl drops a pattern it can't compile.
+---------------------------------------------------------------------------------------------------
+
+test_message_filters = {}
+test_message_filters.BRC_FEATURE_NAME = "test-message-filters"
+
+-- { text, channel } as received by c_message; includes near-misses for the grouped prefixes
+local MESSAGE_LOG = {
+  { "There is an open door here.", "plain" },
+  { "There is a stone staircase leading down here.", "plain" },
+  { "There is a web here.", "plain" },
+  { "There is nothing here.", "plain" },
+  { "You enter the shallow water.", "plain" },
+  { "You enter the deep water.", "plain" },
+  { "You open the door.", "plain" },
+  { "You carefully open the door.", "plain" },
+  { "You disentangle yourself.", "plain" },
+  { "You see here a +0 dagger.", "floor" },
+  { "You see here an orc corpse.", "floor" },
+  { "You now have 3 runes.", "plain" },
+  { "You now have 120 gold pieces.", "plain" },
+  { "You now have no gold.", "plain" },
+  { "A chill wind blows around you.", "plain" },
+  { "A sentinel's mark forms upon you.", "warning" },
+  { "A goblin comes into view.", "monster_warning" },
+  { "You block the kobold's attack.", "plain" },
+  { "You blink.", "plain" },
+  { "You bite the rat.", "plain" },
+  { "You kick the rat.", "plain" },
+  { "You burn the goblin!", "plain" },
+  { "You swap places with your spectral weapon.", "plain" },
+  { "You feel stable.", "recovery" },
+  { "You feel very meek.", "plain" },
+  { "You feel magic returning to you.", "recovery" },
+  { "You feel a sense of dread.", "plain" },
+  { "You feel your power leaking away.", "warning" },
+  { "You feel strangely unstable.", "danger" },
+  { "You feel strangely stable.", "danger" },
+  { "You convulse.", "danger" },
+  { "You convulse.", "plain" },
+  { "You are slowing down.", "warning" },
+  { "You're lethally poisoned!", "danger" },
+  { "You are engulfed in a cloud of miasma.", "plain" },
+  { "You stop descending the stairs.", "plain" },
+  { "You reach to attack the goblin.", "plain" },
+  { "You have a vision of multiple gates.", "plain" },
+  { "You sense an unholy aura.", "plain" },
+  { "You can access your shopping list by pressing '$'.", "tutorial" },
+  { "Your dagger bursts into flame!", "plain" },
+  { "Your dagger stops flaming.", "plain" },
+  { "Your dagger glows with a cold blue light!", "plain" },
+  { "Your dagger is covered in frost.", "plain" },
+  { "Your spectral weapon disappears.", "plain" },
+  { "Your foxfire dissipates.", "plain" },
+  { "Your shadow attacks the orc.", "plain" },
+  { "Your limbs are stiffening.", "warning" },
+  { "Your surroundings suddenly seem different.", "plain" },
+  { "Your magical effects are unraveling.", "warning" },
+  { "You suddenly stop moving!", "warning" },
+  { "The goblin suddenly stops moving!", "plain" },
+  { "Your body shudders with the violent release.", "plain" },
+  { "Your hands tingle.", "plain" },
+  { "Space warps around you for a moment!", "plain" },
+  { "Space bends around you.", "plain" },
+  { "The plant looks sick.", "plain" },
+  { "The walls disappear!", "plain" },
+  { "The air around the orc erupts in flames!", "plain" },
+  { "The orc offers itself to Yredelemnul.", "god" },
+  { "The forest starts to sway and rumble!", "plain" },
+  { "The kobold is heavily wounded.", "monster_damage" },
+  { "The kobold is almost dead.", "monster_damage" },
+  { "The kobold is no longer charmed.", "plain" },
+  { "The kobold is no longer ready.", "plain" },
+  { "Okawaru is honoured by your kill.", "god" },
+  { "A scroll appears in a shower of sparks.", "plain" },
+  { "A wand appears out of thin air!", "plain" },
+  { "Found a gateway to a ziggurat.", "plain" },
+  { "Found the Ecumenical Temple.", "plain" },
+  { "Found a stone staircase leading down.", "plain" },
+  { "Placed new exclusion.", "plain" },
+  { "Pain shudders through your arm!", "plain" },
+  { "Sif Muna resides here.", "plain" },
+  { "You are shrouded in an aura of darkness!", "god" },
+  { "You are shrouded in an aura of darkness!", "plain" },
+  { "You feel the effects of Trog's Hand fading.", "god" },
+  { "You bleed smoke.", "god" },
+  { "Your divine shield starts to fade.", "god" },
+  { "Your divine shield fades away.", "god" },
+  { "Your divine shield fades away.", "plain" },
+  { "Your shadow now tangibly mimics your actions.", "god" },
+  { "Lugonu sends minions to punish you.", "god" },
+  { "Lugonu will now corrupt your weapon.", "god" },
+  { "Jiyva will now unseal the treasures of the Slime Pits.", "god" },
+  { "Jiyva will now cure all your mutations.", "god" },
+  { "The goblin hits you terribly!", "plain" },
+  { "You hear the crackle of electricity.", "sound" },
+  { "You don't have enough magic to cast this spell.", "plain" },
+  { "You have reached level 10!", "intrinsic_gain" },
+}
+
+-- crawl reads a leading "channel:" as a channel filter; a crawl.regex doesn't
+local CHANNELS = {
+  "danger", "god", "warning", "recovery", "plain", "sound", "monster_warning", "monster_damage",
+  "floor", "tutorial", "intrinsic_gain",
+}
+
+--- @return string, string|nil The regex without its channel prefix, and the channel
+local function split_channel(pattern)
+  for _, ch in ipairs(CHANNELS) do
+    local prefix = ch .. ":"
+    if pattern:sub(1, #prefix) == prefix then return pattern:sub(#prefix + 1), ch end
+  end
+  return pattern, nil
+end
+
+local function pattern_matches(pattern, text, channel)
+  local regex, ch = split_channel(pattern)
+  if ch and ch ~= channel then return false end
+  return crawl.regex(regex):matches(text)
+end
+
+local function any_matches(patterns, text, channel)
+  for _, pattern in ipairs(patterns) do
+    if pattern_matches(pattern, text, channel) then return true end
+  end
+  return false
+end
+
+--- Replay MESSAGE_LOG through the original and combined lists; return the number of matches
+local function check_list(name, patterns)
+  local combined = BRC.opt.combine_patterns(patterns)
+  T.true_(#combined <= #patterns, name .. "-not-longer")
+  for i, pattern in ipairs(combined) do
+    local regex = split_channel(pattern)
+    local ok, compiled = pcall(crawl.regex, regex)
+    T.true_(ok and compiled ~= nil, string.format("%s-compiles-%d", name, i))
+  end
+  local matched = 0
+  for i, msg in ipairs(MESSAGE_LOG) do
+    local expected = any_matches(patterns, msg[1], msg[2])
+    T.eq(any_matches(combined, msg[1], msg[2]), expected, string.format("%s-msg-%d", name, i))
+    if expected then matched = matched + 1 end
+  end
+  return matched
+end
+
+function test_message_filters.ready()
+  if T._done then return end
+
+  T.run("message-filters", function()
+    T.true_(BRC.MESSAGE_PATTERN_GROUPS ~= nil, "groups-loaded")
+
+    -- Groups are capped, so a pattern crawl rejects only loses a few mutes
+    local sizes = {}
+    for _, group in pairs(BRC.MESSAGE_PATTERN_GROUPS) do
+      sizes[group[3]] = (sizes[group[3]] or 0) + 1
+    end
+    local largest = 0
+    for _, size in pairs(sizes) do largest = math.max(largest, size) end
+    T.true_(largest <= 8, "group-size-capped")
+
+    local mute_cfg = f_mute_messages.Config.messages
+    T.true_(check_list("explore-only", mute_cfg.explore_only) > 0, "explore-only-matches-log")
+
+    local mutes = {}
+    for i = 1, 3 do
+      util.append(mutes, mute_cfg[i])
+      T.true_(check_list("mute-level-" .. i, mutes) > 0, "mute-level-" .. i .. "-matches-log")
+    end
+    T.true_(#BRC.opt.combine_patterns(mutes) < #mutes, "mutes-combined")
+
+    local fm_patterns = {}
+    for _, entry in ipairs(f_fm_messages.Config.messages) do
+      fm_patterns[#fm_patterns + 1] = entry[2]
+    end
+    T.true_(check_list("fm-messages", fm_patterns) > 0, "fm-messages-matches-log")
+
+    -- dynamic-options removes this by its exact string ("-=") when joining a god
+    local toggled = "Found.*the Ecumenical Temple"
+    T.true_(BRC.MESSAGE_PATTERN_GROUPS[toggled] == nil, "toggled-not-grouped")
+    local registered = {}
+    for _, pattern in ipairs(BRC.opt.combine_patterns(fm_patterns)) do
+      registered[pattern] = true
+    end
+    T.true_(registered[toggled], "toggled-registered")
+    registered[toggled] = nil
+    for pattern in pairs(registered) do
+      T.true_(not pattern:find("Ecumenical", 1, true), "toggled-removed")
+    end
+
+    -- Patterns without a group pass through unchanged
+    local custom = { "You hear a distant splash", "Your .* hums with potential" }
+    local combined = BRC.opt.combine_patterns(custom)
+    T.eq(combined[1], custom[1], "ungrouped-unchanged")
+    T.eq(combined[2], custom[2], "single-group-member-unchanged")
+
+    T.pass("message-filters")
+    T.done()
+  end)
+end
@@ -1,15 +1,16 @@
 ---------------------------------------------------------------------------------------------------
 -- test_pa_data_egos_alerted: Verifies that pa_egos_alerted is updated correctly.
 --
--- pa_egos_alerted is a persistent list that tracks body-armour egos seen via
+-- pa_egos_alerted is a persistent set (ego -> true) that tracks body-armour egos seen via
 -- track_unique_egos(), which is called from f_pickup_alert.do_alert() whenever an
 -- armour item triggers an alert.  get_ego_change_type() uses it to distinguish
 -- NEW ego (not seen before) from DIFF ego (seen before).
 --
--- This test exercises three things:
+-- This test exercises four things:
 --   1. pa_egos_alerted starts as a table (empty at game start, no starting gear has egos).
---   2. Manual insertion into pa_egos_alerted and util.contains work correctly.
---   3. BRC.eq.get_ego() returns a non-nil ego for a ring mail of fire resistance, and
+--   2. f_pa_data.remember_ego / f_pa_data.ego_alerted work correctly.
+--   3. Saves from before the set format (a list of egos) are migrated by f_pa_data.init().
+--   4. BRC.eq.get_ego() returns a non-nil ego for a ring mail of fire resistance, and
 --      the simulate-track_unique_egos pattern correctly adds it to pa_egos_alerted.
 --
 -- Item choice: "ring mail ego:fire_resistance"
@@ -46,36 +47,45 @@ function test_pa_data_egos_alerted.ready()
       --------------------------------------------------------------------------
       -- 1. pa_egos_alerted is a table (empty: starting animal skin has no ego)
       --------------------------------------------------------------------------
-      crawl.stderr("pa_egos_alerted initial count: " .. tostring(#pa_egos_alerted))
+      local initial_count = 0
+      for _ in pairs(pa_egos_alerted) do initial_count = initial_count + 1 end
+      crawl.stderr("pa_egos_alerted initial count: " .. tostring(initial_count))
       T.true_(type(pa_egos_alerted) == "table", "pa-egos-alerted-is-table")
 
       --------------------------------------------------------------------------
-      -- 2. Manual insertion and util.contains
+      -- 2. remember_ego / ego_alerted
       --------------------------------------------------------------------------
       local test_ego = "fire resistance"
 
-      -- Save current list and clear for a clean baseline
-      local saved_egos = {}
-      for i, v in ipairs(pa_egos_alerted) do saved_egos[i] = v end
-      while #pa_egos_alerted > 0 do table.remove(pa_egos_alerted) end
+      -- Save current set and clear for a clean baseline
+      local saved_egos = pa_egos_alerted
+      pa_egos_alerted = {}
 
-      -- Confirm list is empty after clearing
-      T.false_(util.contains(pa_egos_alerted, test_ego), "ego-not-in-empty-list")
-      T.false_(util.contains(pa_egos_alerted, "cold resistance"), "different-ego-not-in-list")
+      -- Confirm set is empty after clearing
+      T.false_(f_pa_data.ego_alerted(test_ego), "ego-not-in-empty-set")
+      T.false_(f_pa_data.ego_alerted("cold resistance"), "different-ego-not-in-set")
 
-      -- Add test_ego manually (mirrors what track_unique_egos does)
-      pa_egos_alerted[#pa_egos_alerted + 1] = test_ego
-      T.true_(util.contains(pa_egos_alerted, test_ego), "ego-added-to-list")
+      -- Add test_ego (what track_unique_egos does)
+      f_pa_data.remember_ego(test_ego)
+      T.true_(f_pa_data.ego_alerted(test_ego), "ego-added-to-set")
 
       -- A different ego remains absent
-      T.false_(util.contains(pa_egos_alerted, "cold resistance"), "different-ego-still-not-in-list")
+      T.false_(f_pa_data.ego_alerted("cold resistance"), "different-ego-still-not-in-set")
+
+      --------------------------------------------------------------------------
+      -- 3. Migration of the old list format
+      --------------------------------------------------------------------------
+      pa_egos_alerted = { "cold resistance", "willpower" }
+      f_pa_data.init()
+      T.true_(f_pa_data.ego_alerted("cold resistance"), "migrated-ego-1")
+      T.true_(f_pa_data.ego_alerted("willpower"), "migrated-ego-2")
+      T.eq(pa_egos_alerted[1], nil, "migrated-no-list-entries")
 
       -- Restore pa_egos_alerted to its pre-test state
-      while #pa_egos_alerted > 0 do table.remove(pa_egos_alerted) end
-      for i, v in ipairs(saved_egos) do pa_egos_alerted[i] = v end
+      pa_egos_alerted = saved_egos
 
       --------------------------------------------------------------------------
-      -- 3. BRC.eq.get_ego on the real ring mail of fire resistance
+      -- 4. BRC.eq.get_ego on the real ring mail of fire resistance
       --------------------------------------------------------------------------
       -- Ring mail is heavier than the starting animal skin (encumb_delta > 0) so
       -- pickup_body_armour returns false — the item stays on the floor.
@@ -97,13 +107,13 @@ function test_pa_data_egos_alerted.ready()
         T.true_(ego ~= nil, "ring-mail-has-ego")
 
         -- Simulate what track_unique_egos does:
-        --   if ego and not util.contains(pa_egos_alerted, ego) ... then add it
-        local was_in_list = util.contains(pa_egos_alerted, ego)
-        crawl.stderr("ego already in pa_egos_alerted before simulate: " .. tostring(was_in_list))
-        if not was_in_list then
-          pa_egos_alerted[#pa_egos_alerted + 1] = ego
+        --   if ego and not f_pa_data.ego_alerted(ego) ... then remember it
+        local was_alerted = f_pa_data.ego_alerted(ego)
+        crawl.stderr("ego already in pa_egos_alerted before simulate: " .. tostring(was_alerted))
+        if not was_alerted then
+          f_pa_data.remember_ego(ego)
         end
-        T.true_(util.contains(pa_egos_alerted, ego), "ego-tracked-after-add")
+        T.true_(f_pa_data.ego_alerted(ego), "ego-tracked-after-add")
       end
 
       T.pass("pa-data-egos-alerted")
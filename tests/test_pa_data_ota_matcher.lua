@@ -0,0 +1,90 @@
+---------------------------------------------------------------------------------------------------
+-- BRC feature test: pa-data one-time-alert matcher
+-- Verifies that f_pa_data.find_OTA keeps matching like a scan of pa_OTA_items after the list
+-- changes: find_OTA caches matches per item name, and the cache must be dropped whenever
+-- pa_OTA_items is edited through remove_OTA or replaced. Spellbook matches are cached too, and
+-- the cache is cleared once it holds too many names.
+--
+-- Phase flow:
+--   "give"   (turn 0): wizard_give buckler + identify -> CMD_WAIT
+--   "verify" (turn 1): find the buckler on the floor, then edit pa_OTA_items and check
+--                      find_OTA after each edit; check spellbooks and the cache cap with
+--                      stand-in items; restore pa_OTA_items
+---------------------------------------------------------------------------------------------------
+
+test_pa_data_ota_matcher = {}
+test_pa_data_ota_matcher.BRC_FEATURE_NAME = "test-pa-data-ota-matcher"
+
+local _phase = "give"
+
+-- Stand-in item with only what find_OTA reads
+local function fake_item(qualname, class, spells)
+  return {
+    name = function() return qualname end,
+    class = function() return class end,
+    spells = spells,
+  }
+end
+
+function test_pa_data_ota_matcher.ready()
+  if T._done then return end
+
+  T.run("pa-data-ota-matcher", function()
+
+    if _phase == "give" then
+      T.wizard_give("buckler")
+      T.wizard_identify_all()
+      _phase = "verify"
+      crawl.do_commands({"CMD_WAIT"})
+
+    elseif _phase == "verify" then
+      local buckler = nil
+      for _, it in ipairs(you.floor_items()) do
+        if it.name("qual"):find("buckler") then buckler = it end
+      end
+      T.true_(buckler ~= nil, "buckler-on-floor")
+      if not buckler then
+        T.done()
+        return
+      end
+
+      local orig_OTA_items = pa_OTA_items
+      local copy = {}
+      for i, v in ipairs(orig_OTA_items) do copy[i] = v end
+      pa_OTA_items = copy
+
+      -- Default list contains "buckler"; repeat lookups hit the cache
+      T.eq(f_pa_data.find_OTA(buckler), "buckler", "found-in-default-list")
+      T.eq(f_pa_data.find_OTA(buckler), "buckler", "found-again-cached")
+
+      -- Removing the entry invalidates the cached match
+      f_pa_data.remove_OTA(buckler)
+      T.eq(f_pa_data.find_OTA(buckler), nil, "not-found-after-remove")
+
+      -- Replacing the list is seen, including a same-length list with a changed entry
+      pa_OTA_items = { "kite shield", "buck.er" }
+      T.eq(f_pa_data.find_OTA(buckler), "buck.er", "found-after-replace")
+      pa_OTA_items = { "kite shield", "tower shield" }
+      T.eq(f_pa_data.find_OTA(buckler), nil, "not-found-in-same-length-list")
+
+      -- Spellbooks match on their spells, and the result is cached like other items
+      local book = fake_item("Book of Fire", "book", { "Fireball" })
+      pa_OTA_items = { "fireball" }
+      T.eq(f_pa_data.find_OTA(book), "fireball", "book-found-by-spell")
+      book.spells = {}
+      T.eq(f_pa_data.find_OTA(book), "fireball", "book-result-cached")
+
+      -- The cache is cleared once it is full, so it doesn't grow all game
+      for i = 1, 300 do
+        f_pa_data.find_OTA(fake_item("scroll " .. i, "scroll"))
+      end
+      T.eq(f_pa_data.find_OTA(book), nil, "cache-cleared-when-full")
+
+      pa_OTA_items = orig_OTA_items
+      T.eq(f_pa_data.find_OTA(buckler), "buckler", "found-after-restore")
+
+      T.pass("pa-data-ota-matcher")
+      T.done()
+    end
+  end)
+end
@@ -0,0 +1,73 @@
+---------------------------------------------------------------------------------------------------
+-- BRC feature test: pa-data remember_alert for a branded artefact weapon
+-- Verifies that remember_alert stores the plain branded key ("mace of flaming") for a branded
+-- artefact, so a plain mace of flaming with the same or lower plus doesn't alert afterwards.
+-- The branded key used to be compared against the plain name's value, which remember_alert had
+-- just set, so it was never stored.
+--
+-- NOTE: it.ego() returns nil for floor items that have not been picked up, so we add a
+-- CMD_PICKUP phase to move the item into inventory before calling remember_alert.
+--
+-- Phase flow:
+--   "give"    (turn 0): wizard-give "mace ego:flaming plus:3 randart", identify, CMD_WAIT → turn 1
+--   "pickup"  (turn 1): CMD_PICKUP to grab the mace → turn 2
+--   "verify"  (turn 2): find the mace in inventory, call remember_alert,
+--                       check pa_items_alerted for the plain branded key
+---------------------------------------------------------------------------------------------------
+
+test_pa_data_remember_alert_branded_artefact = {}
+test_pa_data_remember_alert_branded_artefact.BRC_FEATURE_NAME =
+  "test-pa-data-remember-alert-branded-artefact"
+
+local _phase = "give"
+
+function test_pa_data_remember_alert_branded_artefact.ready()
+  if T._done then return end
+
+  T.run("pa-data-remember-alert-branded-artefact", function()
+    if _phase == "give" then
+      T.wizard_give("mace ego:flaming plus:3 randart")
+      T.wizard_identify_all()
+      _phase = "pickup"
+      crawl.do_commands({"CMD_WAIT"})
+
+    elseif _phase == "pickup" then
+      _phase = "verify"
+      crawl.do_commands({"CMD_PICKUP"})
+
+    elseif _phase == "verify" then
+      local mace = nil
+      for _, it in ipairs(items.inventory()) do
+        if it.is_weapon and it.subtype() == "mace" and it.artefact then
+          mace = it
+          break
+        end
+      end
+      T.true_(mace ~= nil, "artefact-mace-in-inventory")
+      if not mace then T.done() return end
+
+      local verbose_ego = mace.ego(false)
+      crawl.stderr("mace name(db): " .. tostring(mace.name("db")))
+      crawl.stderr("mace ego(false): " .. tostring(verbose_ego))
+      T.true_(verbose_ego ~= nil, "artefact-mace-has-ego")
+      if not verbose_ego then T.done() return end
+
+      local branded_name = mace.name("db") .. " of " .. verbose_ego
+      if BRC.ADJECTIVE_EGOS[verbose_ego] then
+        branded_name = BRC.ADJECTIVE_EGOS[verbose_ego] .. " " .. mace.name("db")
+      end
+      pa_items_alerted[mace.name("db")] = nil
+      pa_items_alerted[branded_name] = nil
+
+      f_pa_data.remember_alert(mace)
+
+      crawl.stderr("pa_items_alerted[" .. branded_name .. "]: "
+        .. tostring(pa_items_alerted[branded_name]))
+      T.eq(pa_items_alerted[branded_name], 3, "branded-key-stored")
+      T.eq(pa_items_alerted[mace.name("db")], 3, "plain-key-stored")
+
+      T.pass("remember-alert-branded-artefact")
+      T.done()
+    end
+  end)
+end